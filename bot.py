@@ -8,6 +8,11 @@ import time
 import signal
 import sys
 import asyncio
+from utils.lazy_import import warm_up
+from utils.startup_profiler import StartupProfiler
+from utils.loop_monitor import LoopMonitor
+from utils.llm_gateway import LLMGateway
+from utils.request_control import ConcurrencyLimiter, SingleFlight
 
 COOKIES_FILE = 'cookies.txt'
 
@@ -19,6 +24,7 @@ load_dotenv()
 
 class Bot(commands.AutoShardedBot):
     def __init__(self) -> None:
+        self.startup_profiler = StartupProfiler()
         intents = discord.Intents.default()
         intents.members = True
         intents.message_content = True
@@ -27,6 +33,11 @@ class Bot(commands.AutoShardedBot):
         super().__init__(intents=intents, sync_commands=True)
         self.start_time = time.time()
         self.logger = setup_logger()
+        self.warmed_up = False
+        self.loop_monitor = LoopMonitor(stall_threshold=float(os.getenv("LOOP_STALL_THRESHOLD_MS", "250")) / 1000)
+        self.llm = LLMGateway()
+        self.single_flight = SingleFlight()
+        self.ai_limiter = ConcurrencyLimiter.from_env()
         
         # Load all cogs
         self.load_extensions()
@@ -36,16 +47,39 @@ class Bot(commands.AutoShardedBot):
         
     def load_extensions(self) -> None:
         """Load all cogs from the cogs directory"""
-        for filename in os.listdir('./cogs'):
-            if filename.endswith('.py'):
-                try:
-                    self.load_extension(f'cogs.{filename[:-3]}')
-                    self.logger.info(f"Loaded extension: {filename}")
-                except Exception as e:
-                    self.logger.error(f"Failed to load extension: {filename}")
-                    self.logger.error(f"Error: {str(e)}")
-                    print(f"Error loading extension: {filename}")
-                    print(f"Error: {str(e)}")
+        with self.startup_profiler.track_construction(commands.Cog):
+            for filename in os.listdir('./cogs'):
+                if filename.endswith('.py'):
+                    try:
+                        with self.startup_profiler.extension(f'cogs.{filename[:-3]}') as timing:
+                            self.load_extension(f'cogs.{filename[:-3]}')
+                        self.logger.info(f"Loaded extension: {filename} ({timing.total:.2f}s)")
+                    except Exception as e:
+                        self.logger.error(f"Failed to load extension: {filename}")
+                        self.logger.error(f"Error: {str(e)}")
+                        print(f"Error loading extension: {filename}")
+                        print(f"Error: {str(e)}")
+        self.logger.info(f"Extension load times:\n{self.startup_profiler.report()}")
+
+    async def sync_commands(self, *args, **kwargs):
+        """Sync application commands, recording how long it takes"""
+        with self.startup_profiler.sync():
+            result = await super().sync_commands(*args, **kwargs)
+        self.logger.info(f"Synced application commands in {self.startup_profiler.syncs[-1]:.2f}s")
+        return result
+
+    async def on_ready(self) -> None:
+        """Import the heavy modules the cogs bound lazily, off the event loop"""
+        self.startup_profiler.mark("ready")
+        self.logger.info(f"Ready after {time.time() - self.start_time:.1f}s")
+        self.loop_monitor.start()
+        if self.warmed_up:
+            return
+        self.warmed_up = True
+        timings = await asyncio.to_thread(warm_up)
+        if timings:
+            summary = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in sorted(timings.items(), key=lambda item: -item[1]))
+            self.logger.info(f"Warmed up lazily imported modules: {summary}")
 
     def setup_signal_handlers(self) -> None:
         """Setup handlers for various termination signals"""
@@ -68,6 +102,8 @@ class Bot(commands.AutoShardedBot):
     async def cleanup(self):
         """Perform cleanup operations before shutdown"""
         self.logger.info("Starting cleanup...")
+        self.loop_monitor.stop()
+        await self.llm.close()
         
         # Cancel all running tasks
         tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
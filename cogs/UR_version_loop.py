@@ -4,16 +4,24 @@ from discord.ext import commands, tasks
 import datetime
 import json
 import logging
-from utils.UR_Version_check import URVersionChecker
+from functools import cached_property
+from utils.lazy_import import lazy_import
 import requests
 
+# Pulls in selenium and webdriver_manager; only needed when a check runs.
+UR_Version_check = lazy_import("utils.UR_Version_check")
+
 class URVersionLoop(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot: commands.Bot = bot
         self.logger = logging.getLogger('bot.py')
-        self.version_checker = URVersionChecker()
         self.check_version.start()
         self.version_file = 'last_version.json'
+
+    @cached_property
+    def version_checker(self):
+        return UR_Version_check.URVersionChecker()
+
     def cog_unload(self):
         self.check_version.cancel()
 
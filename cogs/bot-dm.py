@@ -3,27 +3,41 @@ if __name__ == "__main__":
     exit()
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import logging
 import sqlite3
 from datetime import datetime, timedelta
 import time
-from openai import OpenAI
 import os
-import tiktoken
 import asyncio
+from contextlib import aclosing
+from utils.llm_gateway import DeadlineExceeded
+from utils.token_accounting import TokenAccounting
 
 bot_owner_id = 239809113125552129
 DB_FILE = "user_threads.sqlite"
 ASSISTANT_ID = os.getenv("OPENAI_ASSISTANT_ID", "asst_n2rpn7o0MVIwSMihnPUuV3LI")
 ai_model = os.getenv("OPENAI_TOKEN_COUNT_MODEL", "gpt-4o-mini")
+# Remote deletes of a thread are given up after this many failed attempts.
+MAX_DELETE_ATTEMPTS = 5
 
 class BotDMCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('bot.py')
-        self.client = OpenAI(api_key=os.getenv('OPENAI_TOKEN'))
+        self.tokens = TokenAccounting()
         self.initialize_db()
+        self.sweep_batch = int(os.getenv("DM_THREAD_SWEEP_BATCH", "50"))
+        self.delete_interval = 1 / float(os.getenv("DM_THREAD_DELETES_PER_SECOND", "2"))
+        self.sweep_threads.change_interval(seconds=float(os.getenv("DM_THREAD_SWEEP_INTERVAL", "600")))
+        self.sweep_threads.start()
+
+    def cog_unload(self):
+        self.sweep_threads.cancel()
+
+    async def openai(self, request):
+        """Run an OpenAI request through the bot's shared LLM gateway."""
+        return await self.bot.llm.run("openai", request)
 
     def initialize_db(self):
         conn = sqlite3.connect(DB_FILE)
@@ -35,22 +49,193 @@ class BotDMCog(commands.Cog):
                 expiry TIMESTAMP NOT NULL
             )
         ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_threads_expiry ON user_threads (expiry)')
+        # Threads that are gone locally but still have to be deleted at OpenAI
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS thread_tombstones (
+                thread_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                queued_at TIMESTAMP NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_thread_tombstones_queued_at ON thread_tombstones (queued_at)')
         conn.commit()
         conn.close()
 
-    async def wait_on_run(self, run, thread_id):
-        timekeeper = time.time()
-        while run.status in ["queued", "in_progress"]:
-            run = self.client.beta.threads.runs.retrieve(
+    @staticmethod
+    def bury_thread(cursor, user_id, thread_id):
+        """Moves a thread from user_threads to the tombstones; the sweeper deletes it remotely."""
+        cursor.execute("DELETE FROM user_threads WHERE user_id = ?", (user_id,))
+        cursor.execute("INSERT OR IGNORE INTO thread_tombstones (thread_id, user_id, queued_at) VALUES (?, ?, ?)",
+                       (thread_id, user_id, datetime.now().isoformat()))
+
+    async def delete_remote_thread(self, thread_id):
+        """Deletes a thread at OpenAI; a thread that doesn't exist anymore counts as deleted."""
+        try:
+            await self.openai(lambda client: client.beta.threads.delete(thread_id=thread_id))
+        except Exception as e:
+            if getattr(e, "status_code", None) != 404:
+                raise
+
+    def bury_expired_threads(self):
+        """Moves every expired thread to the tombstones, using the expiry index."""
+        conn = sqlite3.connect(DB_FILE)
+        cursor = conn.cursor()
+        try:
+            # The grace period keeps a thread whose run is still in progress from being swept
+            cutoff = datetime.now() - timedelta(minutes=10)
+            cursor.execute("SELECT user_id, thread_id FROM user_threads WHERE expiry < ?", (cutoff.isoformat(),))
+            expired = cursor.fetchall()
+            for user_id, thread_id in expired:
+                self.bury_thread(cursor, user_id, thread_id)
+            conn.commit()
+            return len(expired)
+        finally:
+            conn.close()
+
+    async def delete_tombstoned_threads(self):
+        """Deletes one batch of tombstoned threads remotely, at most DM_THREAD_DELETES_PER_SECOND."""
+        conn = sqlite3.connect(DB_FILE)
+        cursor = conn.cursor()
+        deleted = failed = 0
+        try:
+            cursor.execute("SELECT thread_id, attempts FROM thread_tombstones ORDER BY queued_at LIMIT ?", (self.sweep_batch,))
+            for thread_id, attempts in cursor.fetchall():
+                try:
+                    await self.delete_remote_thread(thread_id)
+                    cursor.execute("DELETE FROM thread_tombstones WHERE thread_id = ?", (thread_id,))
+                    deleted += 1
+                except Exception as e:
+                    failed += 1
+                    if attempts + 1 >= MAX_DELETE_ATTEMPTS:
+                        self.logger.error(f"Giving up deleting thread {thread_id} after {attempts + 1} attempts: {e}")
+                        cursor.execute("DELETE FROM thread_tombstones WHERE thread_id = ?", (thread_id,))
+                    else:
+                        cursor.execute("UPDATE thread_tombstones SET attempts = attempts + 1, last_error = ? WHERE thread_id = ?",
+                                       (str(e), thread_id))
+                conn.commit()
+                await asyncio.sleep(self.delete_interval)
+            return deleted, failed
+        finally:
+            conn.close()
+
+    def compact_db(self):
+        """VACUUMs the database once at least a quarter of its pages are free."""
+        conn = sqlite3.connect(DB_FILE)
+        try:
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            pages = conn.execute("PRAGMA page_count").fetchone()[0]
+            if pages and free_pages / pages >= 0.25:
+                conn.execute("VACUUM")
+                self.logger.info(f"Compacted {DB_FILE} ({free_pages} of {pages} pages were free)")
+        finally:
+            conn.close()
+
+    async def reconcile_threads(self):
+        """
+        Startup pass that removes rows whose thread no longer exists at OpenAI.
+
+        Expired rows and the tombstones left over from before the restart are handled by the
+        regular sweep that follows.
+        """
+        conn = sqlite3.connect(DB_FILE)
+        cursor = conn.cursor()
+        removed = 0
+        try:
+            cursor.execute("SELECT user_id, thread_id FROM user_threads WHERE expiry >= ?", (datetime.now().isoformat(),))
+            for user_id, thread_id in cursor.fetchall():
+                try:
+                    await self.openai(lambda client: client.beta.threads.retrieve(thread_id=thread_id))
+                except Exception as e:
+                    if getattr(e, "status_code", None) == 404:
+                        cursor.execute("DELETE FROM user_threads WHERE user_id = ? AND thread_id = ?", (user_id, thread_id))
+                        conn.commit()
+                        removed += 1
+                    else:
+                        self.logger.warning(f"Could not check thread {thread_id}: {e}")
+                await asyncio.sleep(self.delete_interval)
+        finally:
+            conn.close()
+        if removed:
+            self.logger.info(f"Removed {removed} rows for threads that no longer exist")
+
+    @tasks.loop(seconds=600)
+    async def sweep_threads(self):
+        try:
+            buried = await asyncio.to_thread(self.bury_expired_threads)
+            deleted, failed = await self.delete_tombstoned_threads()
+            if buried or deleted or failed:
+                self.logger.info(f"Thread sweep: {buried} expired, {deleted} deleted remotely, {failed} failed")
+            await asyncio.to_thread(self.compact_db)
+        except Exception as e:
+            self.logger.error(f"Error in sweep_threads: {e}")
+
+    @sweep_threads.before_loop
+    async def before_sweep_threads(self):
+        await self.bot.wait_until_ready()
+        try:
+            await self.reconcile_threads()
+        except Exception as e:
+            self.logger.error(f"Error in reconcile_threads: {e}")
+
+    async def stream_run(self, thread_id, message_content):
+        """
+        Adds the message and runs the assistant in a single streamed request.
+
+        Without a thread_id a new thread is created as part of the same request. The answer is
+        collected from the run's message delta events, so there is nothing to poll and no
+        separate request to fetch the reply.
+
+        Returns:
+            tuple: (answer, thread id, completed run)
+        """
+        message = {"role": "user", "content": message_content}
+        if thread_id:
+            request = lambda client: client.beta.threads.runs.create(
                 thread_id=thread_id,
-                run_id=run.id,
+                assistant_id=ASSISTANT_ID,
+                additional_messages=[message],
+                stream=True,
             )
-            await asyncio.sleep(0.5)
-            if time.time() - timekeeper > 90.0:  # timeout after 90 seconds
-                raise Exception("Timeout: The operation took longer than expected.")
-        return run
+        else:
+            request = lambda client: client.beta.threads.create_and_run(
+                assistant_id=ASSISTANT_ID,
+                thread={"messages": [message]},
+                stream=True,
+            )
+
+        parts = []
+        run = None
+        # The old polling loop gave up after 90 seconds as well. No retries: if the server accepted
+        # the request before failing, a retry would add the message again or create a second thread.
+        stream = self.bot.llm.stream("openai", request, deadline=time.monotonic() + 90.0, retry=False)
+        async with aclosing(stream):
+            async for event in stream:
+                if event.event == "thread.run.created":
+                    thread_id = event.data.thread_id
+                elif event.event == "thread.message.delta":
+                    for content in event.data.delta.content or []:
+                        if content.type == "text" and content.text and content.text.value:
+                            parts.append(content.text.value)
+                elif event.event == "thread.run.completed":
+                    run = event.data
+                elif event.event in ("thread.run.failed", "thread.run.cancelled", "thread.run.expired",
+                                     "thread.run.incomplete", "thread.run.requires_action"):
+                    error = getattr(event.data, "last_error", None)
+                    raise Exception(f"Run ended with status {event.data.status}" + (f": {error.message}" if error else ""))
+                elif event.event == "error":
+                    raise Exception(f"Run failed: {event.data}")
+        return "".join(parts), thread_id, run
 
     async def manage_user_thread(self, user_id, message_content):
+        """
+        Sends the message to the user's assistant thread.
+
+        Returns:
+            tuple: (answer or error message, completed run or None)
+        """
         current_time = datetime.now()
         conn = sqlite3.connect(DB_FILE)
         cursor = conn.cursor()
@@ -59,65 +244,38 @@ class BotDMCog(commands.Cog):
             # Check if user has an existing thread and if it's expired
             cursor.execute("SELECT thread_id, expiry FROM user_threads WHERE user_id = ?", (user_id,))
             row = cursor.fetchone()
+            thread_id = None
 
             if row:
                 thread_id, expiry = row
                 expiry = datetime.fromisoformat(expiry)
                 if current_time > expiry:
-                    # Delete the old thread
-                    self.client.beta.threads.delete(thread_id=thread_id)
-                    cursor.execute("DELETE FROM user_threads WHERE user_id = ?", (user_id,))
+                    # Start over; the sweeper deletes the old thread remotely
+                    self.bury_thread(cursor, user_id, thread_id)
                     conn.commit()
-                    row = None
-
-            # Create a new thread if user doesn't have one
-            if not row:
-                thread = self.client.beta.threads.create()
-                thread_id = thread.id
-                expiry = current_time + timedelta(hours=12)
-                cursor.execute("INSERT INTO user_threads (user_id, thread_id, expiry) VALUES (?, ?, ?)",
-                               (user_id, thread_id, expiry.isoformat()))
-                conn.commit()
+                    thread_id = None
 
             self.logger.debug(f"thread {thread_id} for user {user_id}")
 
-            # Add the message to the thread
-            self.client.beta.threads.messages.create(
-                thread_id=thread_id,
-                role="user",
-                content=message_content
-            )
-
-            # Create and run the assistant
-            run = self.client.beta.threads.runs.create(
-                thread_id=thread_id,
-                assistant_id=ASSISTANT_ID
-            )
-            
-            self.logger.debug(f"run {run} for thread {thread_id}")
-
-            # Wait for the run to complete
+            # Add the message and run the assistant; creates the thread if the user doesn't have one
             try:
-                run = await self.wait_on_run(run, thread_id)
-            except Exception as e:
-                return f"Your request timed out. Please try again.\n{e}" 
+                response, thread_id, run = await self.stream_run(thread_id, message_content)
+            except DeadlineExceeded as e:
+                return f"Your request timed out. Please try again.\n{e}", None
 
             self.logger.debug(f"run {run} for thread {thread_id} completed")
 
-            # Get the assistant's response
-            messages = self.client.beta.threads.messages.list(thread_id=thread_id, order="desc", limit=1)
-            response = messages.data[0].content[0].text.value
-
-            # Update the expiry time
+            # Store the thread (if it is new) and update the expiry time
             expiry = current_time + timedelta(hours=12)
-            cursor.execute("UPDATE user_threads SET expiry = ? WHERE user_id = ?", (expiry.isoformat(), user_id))
+            cursor.execute("INSERT OR REPLACE INTO user_threads (user_id, thread_id, expiry) VALUES (?, ?, ?)",
+                           (user_id, thread_id, expiry.isoformat()))
             conn.commit()
 
-            return response
+            return response, run
 
         except Exception as e:
             self.logger.error(f"Error in manage_user_thread: {e}")
-            return "An error occurred while processing your request."
+            return "An error occurred while processing your request.", None
 
         finally:
             conn.close()
@@ -126,20 +284,39 @@ class BotDMCog(commands.Cog):
         conn = sqlite3.connect(DB_FILE)
         cursor = conn.cursor()
         try:
-            cursor.execute("DELETE FROM user_threads WHERE user_id = ?", (user_id,))
+            cursor.execute("SELECT thread_id FROM user_threads WHERE user_id = ?", (user_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return
+            self.bury_thread(cursor, user_id, row[0])
             conn.commit()
+            # Delete it remotely right away; if that fails the sweeper retries it
+            try:
+                await self.delete_remote_thread(row[0])
+                cursor.execute("DELETE FROM thread_tombstones WHERE thread_id = ?", (row[0],))
+                conn.commit()
+            except Exception as e:
+                self.logger.warning(f"Could not delete thread {row[0]} yet: {e}")
         except Exception as e:
             self.logger.error(f"Error in delete_user_thread: {e}")
             return "An error occurred while processing your request."
         finally:
             conn.close()
 
-    async def get_token_count(self, text, model):
-        try:
-            enc = tiktoken.encoding_for_model(model)
-        except KeyError:
-            enc = tiktoken.get_encoding("o200k_base")
-        return len(enc.encode(text))
+    @commands.slash_command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="token_usage", description="Show the DM assistant's token usage and cost per user.")
+    @commands.is_owner()
+    async def token_usage(self, ctx):
+        """
+        Owner-only command to display the cumulative token counters.
+        """
+        rows = self.tokens.report()
+        if not rows:
+            await ctx.respond("No token usage recorded yet.", ephemeral=True)
+            return
+        lines = [f"{'user':<20} {'model':<24} {'requests':>8} {'prompt':>10} {'response':>10} {'cost':>9}"]
+        for user_id, model, requests, prompt_tokens, completion_tokens, cost in rows[:20]:
+            lines.append(f"{user_id:<20} {model:<24} {requests:>8} {prompt_tokens:>10} {completion_tokens:>10} ${cost:>8.4f}")
+        await ctx.respond("```\n" + "\n".join(lines) + "\n```", ephemeral=True)
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -155,10 +332,13 @@ class BotDMCog(commands.Cog):
                     user_id = str(message.author.id)
                     user_name = message.author.display_name
                     message_content = f"{user_id}, {user_name}\n{message.content}"
-                    user_message_tokens = await self.get_token_count(message_content, ai_model)
-                    response = await self.manage_user_thread(user_id, message_content)
-                    response_tokens = await self.get_token_count(response, ai_model)
-                    response += f"\n-# prompt: {user_message_tokens} | response: {response_tokens} | total: {user_message_tokens + response_tokens}"
+                    response, run = await self.manage_user_thread(user_id, message_content)
+                    # Completed runs report the real usage (including the thread history); count locally otherwise
+                    model = getattr(run, "model", None) or ai_model
+                    usage = await self.tokens.usage_for(message_content, response, model, getattr(run, "usage", None))
+                    if run is not None:
+                        self.tokens.record(user_id, model, usage)
+                    response += f"\n-# prompt: {usage.prompt_tokens} | response: {usage.completion_tokens} | total: {usage.total_tokens}"
 
                     # Send the assistant's response back to the user in DM
                     await message.channel.send(response)
@@ -36,11 +36,22 @@ class GenericCog(commands.Cog):
         await response_message.edit(content="Updating ping details...")
         edit_latency = (time.perf_counter() - edit_start_time) * 1000  # Convert to ms
 
+        # Event loop lag and the code that blocked it the longest
+        loop_stats = self.bot.loop_monitor.summary()
+        loop_line = ""
+        if loop_stats["samples"]:
+            loop_line = f"\n⏱️ Event loop: p99 `{loop_stats['p99']:.0f}ms`, max `{loop_stats['max']:.0f}ms`"
+            top_sites = self.bot.loop_monitor.top_sites(1)
+            if top_sites:
+                site, count, total = top_sites[0]
+                loop_line += f"\n🐢 Slowest blocker: `{site}` ({count}x, `{total * 1000:.0f}ms` total)"
+
         # Update the message with the final metrics
         await response_message.edit(content=(
             f"<:pencil:1322186625727467550> Edit message: `{edit_latency:.0f}ms`\n"
             f"<:discord:1322186512170876948> Discord: `{discord_latency:.0f}ms`\n"
             f"<:download:1322186564461264940> RestAction: `{rest_latency:.0f}ms`"
+            f"{loop_line}"
         ))
 
     @commands.slash_command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="uptime", description="Returns the bot's uptime")
@@ -77,6 +88,14 @@ class GenericCog(commands.Cog):
         # Add the button row to the embed
         await ctx.respond(embed=embed, view=row, ephemeral=True)
 
+    @commands.slash_command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="startup", description="Show how long the bot took to start.")
+    @commands.is_owner()
+    async def startup(self, ctx):
+        """
+        Owner-only command to display the startup profile.
+        """
+        await ctx.respond(f"```\n{self.bot.startup_profiler.report()}\n```", ephemeral=True)
+
     @commands.slash_command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="shards", description="Display shard information.")
     async def shards(self, ctx):
         """
@@ -2,16 +2,24 @@ if __name__ == "__main__":
     print("This is a cog file and cannot be run directly.")
     exit()
 
+import asyncio
 import io
+from contextlib import aclosing
 import logging
-import re
 import sqlite3
 import discord
-from discord.ext import commands
-from google import genai
-from google.genai import types
+from discord.ext import commands, tasks
 import os
 from enum import Enum
+from utils.lazy_import import lazy_import
+from utils.llm_gateway import DeadlineExceeded, interaction_deadline
+from utils.request_control import QueueFull
+from utils.response_cache import ResponseCache, normalize
+from utils.prompt_store import PromptStore, PromptTemplate
+from utils.text_chunker import iter_chunks, split_message
+from utils.conversation_store import ConversationStore
+
+types = lazy_import("google.genai.types")
 
 class Model(Enum):
     GEMINI_2_0_FLASH = "gemini-2.0-flash"
@@ -20,12 +28,39 @@ class Model(Enum):
     GEMINI_2_0_FLASH_THINKING_EXP_01_21 = "gemini-2.5-flash"
     GEMINI_2_5_PRO = "gemini-2.5-pro"
     GEMINI_2_5_FLASH = "gemini-2.5-flash"
-    
+
+MESSAGE_LIMIT = 1900
+# Beyond this many messages the full answer is sent as an attachment instead.
+MAX_MESSAGES = 6
+
+
+def _close_open_fence(text: str) -> str:
+    """Close a code block that is still being streamed, so the partial message renders properly."""
+    return text + "\n```" if text.count("```") % 2 else text
+
 class GoogleAI(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('bot.py')
-        self.client = genai.Client(api_key=os.getenv("GOOGLE_AI_API_KEY"))
+        self.streaming = os.getenv("GOOGLE_AI_STREAMING", "true").lower() not in ("0", "false", "no")
+        self.stream_edit_interval = float(os.getenv("GOOGLE_AI_STREAM_EDIT_INTERVAL", "1.5"))
+        self.cache = ResponseCache()
+        self.web_cache_ttl = float(os.getenv("AI_CACHE_WEB_TTL", "3600"))
+        self.prompts = PromptStore("cogs/google_ai_sys_prompts")
+        self.conversations = ConversationStore()
+        self.summary_model = os.getenv("GOOGLE_AI_SUMMARY_MODEL", Model.GEMINI_2_0_FLASH_LITE.value)
+        self._summaries = {}  # (user id, channel id) -> running summarization task
+        self.reload_prompts.change_interval(seconds=float(os.getenv("GOOGLE_AI_PROMPT_RELOAD_INTERVAL", "10")))
+        self.reload_prompts.start()
+
+    def cog_unload(self):
+        self.reload_prompts.cancel()
+
+    @tasks.loop(seconds=10)
+    async def reload_prompts(self):
+        changed = await asyncio.to_thread(self.prompts.reload_changed)
+        if changed:
+            self.logger.info(f"Reloaded Google AI system prompts: {', '.join(sorted(changed))}")
 
     googleai = discord.SlashCommandGroup(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="google-ai", description="Google AI API")
 
@@ -34,73 +69,247 @@ class GoogleAI(commands.Cog):
         buf = io.BytesIO(content.encode("utf-8"))
         return discord.File(fp=buf, filename=filename)
 
-    def split_text(self, text: str, max_length: int = 1900) -> list[str]:
+    def _config(self, template: PromptTemplate, ctx, web_search: bool = False):
         """
-        Splits text into segments of a maximum length while preserving code blocks.
+        Builds the request config for a system prompt template.
 
         Args:
-            text (str): The text to split.
-            max_length (int, optional): The maximum length of each segment. Defaults to 2000.
+            template (PromptTemplate): The system prompt template.
+            ctx: The application context, for the user's id.
+            web_search (bool, optional): Whether to enable Google Search. Defaults to False.
 
         Returns:
-            list[str]: A list of segments of the text.
+            types.GenerateContentConfig: The config.
         """
+        tools = [types.Tool(google_search=types.GoogleSearch())] if web_search else []
+        return types.GenerateContentConfig(system_instruction=template.render(userid=ctx.author.id), tools=tools)
 
-        code_block_pattern = re.compile(r'```(.*?)\n(.*?)(?=\n```|\Z)', re.DOTALL)
-        segments = []
+    async def _respond(self, ctx, question: str, model: Model, contents, config, ephemeral: bool,
+                       cache_scope: str = None, follow_up: bool = False):
+        """
+        Generates the answer and sends it as the response to the deferred interaction.
 
-        while len(text) > max_length:
-            match = code_block_pattern.search(text)
-            if match:
-                text = self._handle_code_block(text, match, segments, max_length)
-            else:
-                text = self._handle_text_segment(text, segments, max_length)
+        In streaming mode the deferred response is edited as tokens arrive (at most every
+        stream_edit_interval seconds). Once a message holds MESSAGE_LIMIT characters it is
+        finished at a split_message boundary and the answer continues in a follow-up (which
+        reopens the code block if the cut was inside one). Answers longer than MAX_MESSAGES messages are additionally
+        sent as an attachment at the end.
+
+        With a cache_scope, answers are looked up in and stored to the response cache; the
+        user's id (from the system prompt) is stored as {{userid}}. Identical questions asked
+        while one is being generated wait for that generation and get its answer in one go.
+        Generations are subject to the user's and the model's concurrency limits.
+
+        Args:
+            ctx: The deferred application context.
+            question (str): The user's question, used for the attachment caption.
+            model (Model): The model to use.
+            contents: The request contents.
+            config: The GenerateContentConfig.
+            ephemeral (bool): Whether follow-ups are ephemeral.
+            cache_scope (str, optional): ResponseCache.scope() of the request.
+            follow_up (bool, optional): Whether the question continues the conversation.
+        """
+        user_id = str(ctx.author.id)
+        if cache_scope:
+            hit = self.cache.get(cache_scope, question)
+            if hit:
+                marker = "\n-# cached answer to a similar question" if hit.near else "\n-# cached"
+                content = hit.response.replace("{{userid}}", user_id)
+                await self._send_complete(ctx, question, content + marker, ephemeral)
+                self._remember(ctx, question, content, follow_up)
+                return
+
+        async def generate() -> str:
+            deadline = interaction_deadline(ctx)
+            async with self.bot.ai_limiter.slot(ctx.author.id, model.value, deadline):
+                answer = await self._generate(ctx, question, model, contents, config, ephemeral, deadline)
+            answer = answer.replace(user_id, "{{userid}}")
+            if cache_scope and answer.strip():
+                self.cache.put(cache_scope, question, answer, ttl=self._cache_ttl(config))
+            return answer
 
-        if text:
-            segments.append(text)
+        try:
+            if cache_scope:
+                # A merged request whose leader is turned away or times out generates its own answer
+                answer, shared = await self.bot.single_flight.do(
+                    (cache_scope, normalize(question)), generate, caller_errors=(QueueFull, DeadlineExceeded)
+                )
+            else:
+                answer, shared = await generate(), False
+        except QueueFull as e:
+            await ctx.respond(content=str(e), ephemeral=True)
+            return
+        content = answer.replace("{{userid}}", user_id)
+        if shared:
+            # Another user's request generated (and displayed) the answer; send it to this one too.
+            await self._send_complete(ctx, question, content or "Google AI returned an empty response.", ephemeral)
+        if content.strip():
+            self._remember(ctx, question, content, follow_up)
+
+    async def _generate(self, ctx, question: str, model: Model, contents, config, ephemeral: bool, deadline: float) -> str:
+        """
+        Generates the answer and shows it in the deferred response, streaming it if enabled.
 
-        return segments
+        Returns:
+            str: The answer, empty if Google AI returned nothing.
+        """
+        if not self.streaming:
+            response = await self.bot.llm.run(
+                "gemini",
+                lambda client: client.models.generate_content(model=model.value, contents=contents, config=config),
+                deadline=deadline,
+            )
+            content = (response.text or "").replace("####", "###")
+            await self._send_complete(ctx, question, content or "Google AI returned an empty response.", ephemeral)
+            return content
+
+        raw = ""
+        committed = 0     # characters of the answer that are in finished messages
+        reopen = ""       # fence line the current message starts with, if it continues a code block
+        message = None    # follow-up being filled, None while it is the original response
+        shown = ""        # what that message currently shows
+        needs_new_message = False
+        messages = 1
+        overflow = False
+
+        async def show(content: str):
+            nonlocal message, shown, needs_new_message, messages
+            if needs_new_message:
+                message = await ctx.followup.send(content=content, ephemeral=ephemeral, wait=True)
+                needs_new_message = False
+                messages += 1
+            elif content == shown:
+                return
+            elif message is None:
+                await ctx.edit(content=content)
+            else:
+                await message.edit(content=content)
+            shown = content
+
+        async def flush(final: bool):
+            nonlocal committed, reopen, needs_new_message, shown, overflow
+            text = raw.replace("####", "###")  # for discord compatibility
+            while not overflow:
+                rest = text[committed:]
+                # Drop the blank lines a split leaves behind, but keep indentation, and keep everything
+                # inside a reopened code block.
+                stripped = rest if reopen else rest.lstrip("\n")
+                committed += len(rest) - len(stripped)
+                pending = reopen + stripped
+                if len(pending) <= MESSAGE_LIMIT:
+                    if stripped:
+                        await show(pending if final else _close_open_fence(pending))
+                    return
+                if messages >= MAX_MESSAGES:
+                    overflow = True
+                    return
+                head, consumed, fence = next(iter_chunks(pending, MESSAGE_LIMIT))
+                await show(head)
+                committed += consumed - len(reopen)
+                reopen = fence + "\n" if fence else ""
+                needs_new_message, shown = True, ""
+
+        loop = asyncio.get_running_loop()
+        last_flush = loop.time()
+        stream = self.bot.llm.stream(
+            "gemini",
+            lambda client: client.models.generate_content_stream(model=model.value, contents=contents, config=config),
+            deadline=deadline,
+        )
+        # Closes the response right away if showing the answer fails mid-stream
+        async with aclosing(stream):
+            async for chunk in stream:
+                raw += chunk.text or ""
+                if not overflow and loop.time() - last_flush >= self.stream_edit_interval:
+                    await flush(final=False)
+                    last_flush = loop.time()
+        await flush(final=True)
+
+        if not raw.strip():
+            await ctx.edit(content="Google AI returned an empty response.")
+            return ""
+        if overflow:
+            await ctx.followup.send(
+                content=f"Full response from Google AI for:\n{question}",
+                file=self._file_from_text(raw.replace("####", "###")),
+                ephemeral=ephemeral,
+            )
+        return raw.replace("####", "###")
 
-    def _handle_code_block(self, text, match, segments, max_length):
-        start, end = match.span()
-        if start > 0:
-            segments.append(text[:start].rstrip())
-            text = text[start:]
+    def _contents(self, ctx, question: str, follow_up: bool) -> list:
+        """
+        Builds the request contents: the question, preceded by the conversation so far for a follow-up.
 
-        code_block_content = match.group(0)
-        if len(code_block_content) > max_length:
-            split_code_blocks = self.split_text(code_block_content, max_length)
-            segments.extend(split_code_blocks)
+        Only the newest exchanges that fit the conversation token budget are sent; older ones
+        are represented by the conversation's rolling summary.
+        """
+        contents = []
+        if follow_up:
+            conversation = self.conversations.window(ctx.author.id, ctx.channel_id)
+            if conversation.summary:
+                contents.append(types.Content(role="user", parts=[types.Part.from_text(text=f"Summary of our conversation so far:\n{conversation.summary}")]))
+                contents.append(types.Content(role="model", parts=[types.Part.from_text(text="Got it.")]))
+            for turn in conversation.turns:
+                contents.append(types.Content(role=turn.role, parts=[types.Part.from_text(text=turn.text)]))
+        contents.append(types.Content(role="user", parts=[types.Part.from_text(text=question)]))
+        return contents
+
+    def _remember(self, ctx, question: str, answer: str, follow_up: bool):
+        """Stores the exchange; a question that isn't a follow-up starts a new conversation."""
+        key = (ctx.author.id, ctx.channel_id)
+        if not follow_up:
+            self.conversations.forget(*key)
+        self.conversations.append(*key, question, answer)
+        if key not in self._summaries and self.conversations.overflow(*key):
+            self._summaries[key] = asyncio.create_task(self._summarize(*key))
+            self._summaries[key].add_done_callback(lambda _: self._summaries.pop(key, None))
+
+    async def _summarize(self, user_id: int, channel_id: int):
+        """Folds the turns that no longer fit the token budget into the conversation's rolling summary."""
+        try:
+            turns = self.conversations.overflow(user_id, channel_id)
+            if not turns:
+                return
+            previous = self.conversations.summary(user_id, channel_id)
+            transcript = "\n\n".join(f"{'User' if turn.role == 'user' else 'Assistant'}: {turn.text}" for turn in turns)
+            prompt = (
+                "Update the summary of this conversation between a user and an assistant. Keep the facts, "
+                "decisions, names, numbers and code identifiers the user may refer back to and leave out "
+                "pleasantries. Reply with the summary only, in at most 200 words.\n\n"
+                f"Current summary:\n{previous or '(none)'}\n\nNew messages:\n{transcript}"
+            )
+            response = await self.bot.llm.run(
+                "gemini",
+                lambda client: client.models.generate_content(model=self.summary_model, contents=prompt),
+            )
+            summary = (response.text or "").strip()
+            if summary:
+                self.conversations.compact(user_id, channel_id, summary, turns[-1].id)
+        except Exception as e:
+            self.logger.error(f"Failed to summarize Google AI conversation: {e}")
+
+    def _cache_ttl(self, config) -> float:
+        # Web search answers go stale much sooner than plain model answers.
+        return self.web_cache_ttl if config.tools else self.cache.ttl
+
+    async def _send_complete(self, ctx, question: str, content: str, ephemeral: bool):
+        if len(content) > MESSAGE_LIMIT:
+            chunks = split_message(content)
+            # if there are more than 6 chunks write send the temp file as an attachment instead of sending the chunks
+            if len(chunks) > MAX_MESSAGES:
+                await ctx.respond(
+                    content=f"Response from Google AI for:\n{question}",
+                    file=self._file_from_text(content),
+                    ephemeral=ephemeral,
+                )
+            else:
+                await ctx.respond(content=chunks[0], ephemeral=ephemeral)
+                for chunk in chunks[1:]:
+                    await ctx.followup.send(content=chunk, ephemeral=ephemeral)
         else:
-            segments.append(code_block_content)
-
-        return text[end:].lstrip()
-
-    def _handle_text_segment(self, text, segments, max_length):
-        split_point = self._find_split_point(text, max_length)
-        if split_point is None:
-            split_point = max_length
-
-        segments.append(text[:split_point].rstrip())
-        return text[split_point:].lstrip()
-
-    def _find_split_point(self, text, max_len):
-        min_len = max_len // 2
-        priority_patterns = [
-            r'\n# ',      # Highest priority
-            r'\n## ',     # Next priority
-            r'\n### ',    # Followed by
-            r'\n\d',     # followed by a digit
-            r'\n\n',     # Two newlines
-            r'\n'         # Single newline
-        ]
-        for pattern in priority_patterns:
-            matches = list(re.finditer(pattern, text))
-            for match in reversed(matches):
-                if min_len <= match.start() <= max_len:
-                    return match.start()
-        return None
-    
+            await ctx.respond(content=content, ephemeral=ephemeral)
+
     async def is_user_allowed(self, user):
         # check the allowed_users.sqlite file for the user
         conn = sqlite3.connect('allowed_users.sqlite')
@@ -115,64 +324,22 @@ class GoogleAI(commands.Cog):
     async def ask_google_ai(self, ctx, 
                             question: str = discord.Option(str, name="question", description="The question to ask Google AI", required=True),
                             web_search: bool = discord.Option(bool, name="web_search", description="Whether to enable web search", required=False, default=False, store_true=True),
+                            follow_up: bool = discord.Option(bool, name="follow_up", description="Continue your conversation in this channel", required=False, default=False, store_true=True),
                             ephemeral: bool = discord.Option(bool, name="ephemeral", description="Whether to send the response as an ephemeral message", required=False, default=False, store_true=True)):
         try:
             if not await self.is_user_allowed(ctx.author):
                 await ctx.respond(content="You are not allowed to use this command.", ephemeral=True)
                 return
-            if web_search:
-                # Enable web search for the model
-                tools=[
-                    types.Tool(google_search=types.GoogleSearch())
-                ]
-                with open("cogs/google_ai_sys_prompts/gemini_2_0_flash_websearch.md", "r", encoding='utf-8') as file:
-                    system_prompt = file.read()
-                system_prompt = system_prompt.replace("{{userid}}", str(ctx.author.id))
-                config = types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    tools=tools
-                )
-            else:
-                with open("cogs/google_ai_sys_prompts/gemini_2_0_flash.md", "r", encoding='utf-8') as file:
-                    system_prompt = file.read()
-                system_prompt = system_prompt.replace("{{userid}}", str(ctx.author.id))
-                config = types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    tools=[]
-                )
+            template = self.prompts.get("gemini_2_0_flash_websearch" if web_search else "gemini_2_0_flash")
             
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part.from_text(text=question),
-                    ],
-                ),
-            ]
+            contents = self._contents(ctx, question, follow_up)
             
             await ctx.defer(ephemeral=ephemeral)
 
-            response = self.client.models.generate_content(model=Model.GEMINI_2_0_FLASH.value, 
-                                                    contents=contents, 
-                                                    config=config)
-            content = response.text
-            content = content.replace("####", "###") # for discord compatibility
-
-            if len(content) > 1900:  
-                chunks = self.split_text(content)
-                # if there are more than 6 chunks write send the temp file as an attachment instead of sending the chunks
-                if len(chunks) > 6:
-                    await ctx.respond(
-                        content=f"Response from Google AI for:\n{question}",
-                        file=self._file_from_text(content),
-                        ephemeral=ephemeral,
-                    )
-                else:
-                    await ctx.respond(content=chunks[0], ephemeral=ephemeral)
-                    for chunk in chunks[1:]:
-                        await ctx.followup.send(content=chunk, ephemeral=ephemeral)
-            else:
-                await ctx.respond(content=content, ephemeral=ephemeral)
+            config = self._config(template, ctx, web_search)
+            await self._respond(ctx, question, Model.GEMINI_2_0_FLASH, contents, config, ephemeral,
+                                cache_scope=None if follow_up else ResponseCache.scope(Model.GEMINI_2_0_FLASH.value, template.text, web_search),
+                                follow_up=follow_up)
 
         except Exception as e:
             await ctx.send(f"An error occurred: {e}", ephemeral=True)
@@ -180,48 +347,21 @@ class GoogleAI(commands.Cog):
     @googleai.command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="gemini_2_0_flash_lite", description="Ask Google AI using Gemini 2.0 Flash Lite model")
     async def ask_google_ai_lite(self, ctx, 
                                 question: str = discord.Option(str, name="question", description="The question to ask Google AI", required=True),
+                                follow_up: bool = discord.Option(bool, name="follow_up", description="Continue your conversation in this channel", required=False, default=False, store_true=True),
                                 ephemeral: bool = discord.Option(bool, name="ephemeral", description="Whether to send the response as an ephemeral message", required=False, default=False, store_true=True)):
         try:
             if not await self.is_user_allowed(ctx.author):
                 await ctx.respond(content="You are not allowed to use this command.", ephemeral=True)
                 return
-            with open("cogs/google_ai_sys_prompts/gemini_2_0_flash_lite.md", "r", encoding='utf-8') as file:
-                system_prompt = file.read()
-            system_prompt = system_prompt.replace("{{userid}}", str(ctx.author.id))
-            config = types.GenerateContentConfig(
-                system_instruction=system_prompt
-            )
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part.from_text(text=question),
-                    ],
-                ),
-            ]
+            template = self.prompts.get("gemini_2_0_flash_lite")
+            contents = self._contents(ctx, question, follow_up)
 
             await ctx.defer(ephemeral=ephemeral)
 
-            response = self.client.models.generate_content(model=Model.GEMINI_2_0_FLASH_LITE.value, 
-                                                    contents=contents, 
-                                                    config=config)
-            content = response.text
-            content = content.replace("####", "###") # for discord compatibility
-            
-            if len(content) > 1900:
-                chunks = self.split_text(content)
-                if len(chunks) > 6:
-                    await ctx.respond(
-                        content=f"Response from Google AI for:\n{question}",
-                        file=self._file_from_text(content),
-                        ephemeral=ephemeral,
-                    )
-                else:
-                    await ctx.respond(content=chunks[0], ephemeral=ephemeral)
-                    for chunk in chunks[1:]:
-                        await ctx.followup.send(content=chunk, ephemeral=ephemeral)
-            else:
-                await ctx.respond(content=content, ephemeral=ephemeral)
+            config = self._config(template, ctx)
+            await self._respond(ctx, question, Model.GEMINI_2_0_FLASH_LITE, contents, config, ephemeral,
+                                cache_scope=None if follow_up else ResponseCache.scope(Model.GEMINI_2_0_FLASH_LITE.value, template.text, False),
+                                follow_up=follow_up)
 
         except Exception as e:
             await ctx.send(f"An error occurred: {e}", ephemeral=True)
@@ -229,48 +369,21 @@ class GoogleAI(commands.Cog):
     @googleai.command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="gemini_2_0_flash_thinking", description="Ask Google AI (Gemini 2.5 Flash — reasoning; replaces legacy Flash Thinking experimental)")
     async def ask_google_ai_thinking_exp_01_21(self, ctx, 
                                                 question: str = discord.Option(str, name="question", description="The question to ask Google AI", required=True),
+                                                follow_up: bool = discord.Option(bool, name="follow_up", description="Continue your conversation in this channel", required=False, default=False, store_true=True),
                                                 ephemeral: bool = discord.Option(bool, name="ephemeral", description="Whether to send the response as an ephemeral message", required=False, default=False, store_true=True)):
         try:
             if not await self.is_user_allowed(ctx.author):
                 await ctx.respond(content="You are not allowed to use this command.", ephemeral=True)
                 return
-            with open("cogs/google_ai_sys_prompts/gemini_2_0_flash_thinking_exp_01_21.md", "r", encoding='utf-8') as file:
-                system_prompt = file.read()
-            system_prompt = system_prompt.replace("{{userid}}", str(ctx.author.id))
-            config = types.GenerateContentConfig(
-                system_instruction=system_prompt
-            )
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part.from_text(text=question),
-                    ],  
-                ),
-            ]
+            template = self.prompts.get("gemini_2_0_flash_thinking_exp_01_21")
+            contents = self._contents(ctx, question, follow_up)
 
             await ctx.defer(ephemeral=ephemeral)
 
-            response = self.client.models.generate_content(model=Model.GEMINI_2_0_FLASH_THINKING_EXP_01_21.value, 
-                                                    contents=contents, 
-                                                    config=config)
-            content = response.text 
-            content = content.replace("####", "###") # for discord compatibility
-            
-            if len(content) > 1900:
-                chunks = self.split_text(content)
-                if len(chunks) > 6:
-                    await ctx.respond(
-                        content=f"Response from Google AI for:\n{question}",
-                        file=self._file_from_text(content),
-                        ephemeral=ephemeral,
-                    )
-                else:
-                    await ctx.respond(content=chunks[0], ephemeral=ephemeral)
-                    for chunk in chunks[1:]:
-                        await ctx.followup.send(content=chunk, ephemeral=ephemeral)  
-            else:
-                await ctx.respond(content=content, ephemeral=ephemeral)
+            config = self._config(template, ctx)
+            await self._respond(ctx, question, Model.GEMINI_2_0_FLASH_THINKING_EXP_01_21, contents, config, ephemeral,
+                                cache_scope=None if follow_up else ResponseCache.scope(Model.GEMINI_2_0_FLASH_THINKING_EXP_01_21.value, template.text, False),
+                                follow_up=follow_up)
 
         except Exception as e:
             await ctx.send(f"An error occurred: {e}", ephemeral=True)
@@ -279,61 +392,21 @@ class GoogleAI(commands.Cog):
     async def ask_google_ai_pro_exp_03_25(self, ctx, 
                                     question: str = discord.Option(str, name="question", description="The question to ask Google AI", required=True),
                                     web_search: bool = discord.Option(bool, name="web_search", description="Whether to enable web search", required=False, default=False, store_true=True),
+                                    follow_up: bool = discord.Option(bool, name="follow_up", description="Continue your conversation in this channel", required=False, default=False, store_true=True),
                                     ephemeral: bool = discord.Option(bool, name="ephemeral", description="Whether to send the response as an ephemeral message", required=False, default=False, store_true=True)):
         try:
             if not await self.is_user_allowed(ctx.author):
                 await ctx.respond(content="You are not allowed to use this command.", ephemeral=True)
                 return
-            if web_search:
-                tools=[
-                    types.Tool(google_search=types.GoogleSearch())
-                ]
-                with open("cogs/google_ai_sys_prompts/gemini_2_5_pro_exp_03_25_websearch.md", "r", encoding='utf-8') as file:
-                    system_prompt = file.read()
-                system_prompt = system_prompt.replace("{{userid}}", str(ctx.author.id))
-                config = types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    tools=tools
-                )
-            else:   
-                with open("cogs/google_ai_sys_prompts/gemini_2_5_pro_exp_03_25.md", "r", encoding='utf-8') as file:
-                    system_prompt = file.read()
-                system_prompt = system_prompt.replace("{{userid}}", str(ctx.author.id))
-                config = types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    tools=[]
-                )   
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part.from_text(text=question),
-                    ],  
-                ),
-            ]
+            template = self.prompts.get("gemini_2_5_pro_exp_03_25_websearch" if web_search else "gemini_2_5_pro_exp_03_25")
+            contents = self._contents(ctx, question, follow_up)
 
             await ctx.defer(ephemeral=ephemeral)
 
-            response = self.client.models.generate_content(model=Model.GEMINI_2_5_PRO.value, 
-                                                    contents=contents, 
-                                                    config=config)
-            content = response.text 
-            content = content.replace("####", "###") # for discord compatibility
-            
-            if len(content) > 1900:
-                chunks = self.split_text(content)
-                if len(chunks) > 6:
-                    await ctx.respond(
-                        content=f"Response from Google AI for:\n{question}",
-                        file=self._file_from_text(content),
-                        ephemeral=ephemeral,
-                    )
-                else:
-                    await ctx.respond(content=chunks[0], ephemeral=ephemeral)
-                    for chunk in chunks[1:]:
-                        await ctx.followup.send(content=chunk, ephemeral=ephemeral)
-            else:
-                await ctx.respond(content=content, ephemeral=ephemeral)
+            config = self._config(template, ctx, web_search)
+            await self._respond(ctx, question, Model.GEMINI_2_5_PRO, contents, config, ephemeral,
+                                cache_scope=None if follow_up else ResponseCache.scope(Model.GEMINI_2_5_PRO.value, template.text, web_search),
+                                follow_up=follow_up)
 
         except Exception as e:  
             await ctx.send(f"An error occurred: {e}", ephemeral=True)
@@ -342,65 +415,34 @@ class GoogleAI(commands.Cog):
     async def ask_google_ai_flash_preview_04_17(self, ctx, 
                                     question: str = discord.Option(str, name="question", description="The question to ask Google AI", required=True),
                                     web_search: bool = discord.Option(bool, name="web_search", description="Whether to enable web search", required=False, default=False, store_true=True),
+                                    follow_up: bool = discord.Option(bool, name="follow_up", description="Continue your conversation in this channel", required=False, default=False, store_true=True),
                                     ephemeral: bool = discord.Option(bool, name="ephemeral", description="Whether to send the response as an ephemeral message", required=False, default=False, store_true=True)):
         try:
             if not await self.is_user_allowed(ctx.author):
                 await ctx.respond(content="You are not allowed to use this command.", ephemeral=True)
                 return
-            if web_search:
-                tools=[
-                    types.Tool(google_search=types.GoogleSearch())
-                ]
-                with open("cogs/google_ai_sys_prompts/gemini_2_5_flash_preview_04_17_websearch.md", "r", encoding='utf-8') as file:
-                    system_prompt = file.read()
-                system_prompt = system_prompt.replace("{{userid}}", str(ctx.author.id))
-                config = types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    tools=tools
-                )
-            else:   
-                with open("cogs/google_ai_sys_prompts/gemini_2_5_flash_preview_04_17.md", "r", encoding='utf-8') as file:
-                    system_prompt = file.read()
-                system_prompt = system_prompt.replace("{{userid}}", str(ctx.author.id))
-                config = types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    tools=[]
-                )   
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part.from_text(text=question),
-                    ],  
-                ),
-            ]
+            template = self.prompts.get("gemini_2_5_flash_preview_04_17_websearch" if web_search else "gemini_2_5_flash_preview_04_17")
+            contents = self._contents(ctx, question, follow_up)
 
             await ctx.defer(ephemeral=ephemeral)
 
-            response = self.client.models.generate_content(model=Model.GEMINI_2_5_FLASH.value, 
-                                                    contents=contents, 
-                                                    config=config)
-            content = response.text 
-            content = content.replace("####", "###") # for discord compatibility
-            
-            if len(content) > 1900:
-                chunks = self.split_text(content)
-                if len(chunks) > 6:
-                    await ctx.respond(
-                        content=f"Response from Google AI for:\n{question}",
-                        file=self._file_from_text(content),
-                        ephemeral=ephemeral,
-                    )
-                else:
-                    await ctx.respond(content=chunks[0], ephemeral=ephemeral)
-                    for chunk in chunks[1:]:
-                        await ctx.followup.send(content=chunk, ephemeral=ephemeral)
-            else:
-                await ctx.respond(content=content, ephemeral=ephemeral)
+            config = self._config(template, ctx, web_search)
+            await self._respond(ctx, question, Model.GEMINI_2_5_FLASH, contents, config, ephemeral,
+                                cache_scope=None if follow_up else ResponseCache.scope(Model.GEMINI_2_5_FLASH.value, template.text, web_search),
+                                follow_up=follow_up)
 
         except Exception as e:  
             await ctx.send(f"An error occurred: {e}", ephemeral=True)
 
+    @googleai.command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="forget", description="Forget your conversation with Google AI")
+    async def forget_conversation(self, ctx,
+                                  all_channels: bool = discord.Option(bool, name="all_channels", description="Forget your conversations in every channel, not just this one", required=False, default=False, store_true=True)):
+        deleted = self.conversations.forget(ctx.author.id, None if all_channels else ctx.channel_id)
+        if deleted:
+            await ctx.respond(content="Conversation forgotten." if deleted == 1 else f"Forgot {deleted} conversations.", ephemeral=True)
+        else:
+            await ctx.respond(content="There was no conversation to forget.", ephemeral=True)
+
 
 def setup(bot):
     bot.add_cog(GoogleAI(bot))
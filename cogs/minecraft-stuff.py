@@ -2,78 +2,242 @@ if __name__ == "__main__":
     print("This is a cog file and cannot be run directly.")
     exit()
 
+import asyncio
+from collections import deque
 import logging
 import sqlite3
+import time
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import os
 
-from utils.minecwaft.minecraft import Minecraft 
+from utils.minecwaft.registry import ServerRegistry, ServerHandle
+from utils.minecwaft.log_tail import LogTailer, format_events, summarize_events
+
+# Log events kept while they can't be posted; older ones are dropped beyond this.
+MAX_BUFFERED_LOG_EVENTS = 1000
+
+async def player_autocomplete(ctx: discord.AutocompleteContext):
+    # Answered from the in-memory name index; never waits on RCON.
+    server = ctx.cog.registry.for_guild(ctx.interaction.guild_id)
+    return server.minecraft.players.search(ctx.value or "")
+
 
 class MinecraftStuff(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('bot.py')
-        self.minecraft = Minecraft("116.202.215.54", 25575, "n32DCx#w")
+        self.registry = ServerRegistry()
+        self.sample_status.change_interval(seconds=float(os.getenv("MC_STATUS_INTERVAL", "30")))
+        self.sample_status.start()
+        self.sync_player_state.change_interval(seconds=float(os.getenv("MC_STATE_SYNC_INTERVAL", "300")))
+        self.sync_player_state.start()
+
+        # Live join/leave/chat/death feed from the server log, if configured.
+        self.log_channel_id = int(os.getenv("MC_LOG_CHANNEL_ID", "0"))
+        self.log_tailer = LogTailer(os.getenv("MC_LOG_PATH")) if os.getenv("MC_LOG_PATH") else None
+        self.log_events = deque(maxlen=MAX_BUFFERED_LOG_EVENTS)
+        self.log_max_posts = max(1, int(os.getenv("MC_LOG_MAX_POSTS", "3")))
+        if self.log_tailer is not None and self.log_channel_id:
+            self.tail_log.change_interval(seconds=float(os.getenv("MC_LOG_POLL_INTERVAL", "1")))
+            self.tail_log.start()
+            self.post_log_events.change_interval(seconds=float(os.getenv("MC_LOG_POST_INTERVAL", "10")))
+            self.post_log_events.start()
+
+    def cog_unload(self):
+        self.sample_status.cancel()
+        self.sync_player_state.cancel()
+        self.tail_log.cancel()
+        self.post_log_events.cancel()
+        self.bot.loop.create_task(self.registry.close())
+
+    def _server(self, ctx) -> ServerHandle:
+        return self.registry.for_guild(ctx.guild_id)
+
+    @tasks.loop(seconds=30)
+    async def sample_status(self):
+        # The RCON health check reuses the pooled connection, so it is cheap enough to run with every sample.
+        await asyncio.gather(
+            *(self._sample_server(server) for server in self.registry.list()),
+            self.registry.check_health(),
+        )
+
+    async def _sample_server(self, server: ServerHandle):
+        snapshot = await server.minecraft.status.sample()
+        if snapshot.has_full_player_list:
+            server.minecraft.players.set_online(snapshot.player_sample)
+        else:
+            server.minecraft.players.add_many(snapshot.player_sample)
+
+    @tasks.loop(seconds=300)
+    async def sync_player_state(self):
+        await asyncio.gather(*(self._sync_server_state(server) for server in self.registry.list()))
+
+    @tasks.loop(seconds=1)
+    async def tail_log(self):
+        try:
+            events = await self.log_tailer.poll()
+        except OSError as e:
+            self.logger.warning(f"Could not read Minecraft log {self.log_tailer.path}: {e}")
+            return
+        players = self.registry.default.minecraft.players
+        for event in events:
+            if event.kind in ("join", "leave"):
+                players.mark_online(event.player, event.kind == "join")
+        self.log_events.extend(events)
+
+    @tasks.loop(seconds=10)
+    async def post_log_events(self):
+        # Events are collected every poll but posted in batches, at most
+        # log_max_posts messages per interval; any overflow is only counted.
+        if not self.log_events:
+            return
+        channel = self.bot.get_channel(self.log_channel_id)
+        events = list(self.log_events)
+        self.log_events.clear()
+        if channel is None:
+            self.logger.warning(f"Minecraft log channel {self.log_channel_id} not found, dropped {len(events)} events")
+            return
+        messages = format_events(events)
+        if len(messages) > self.log_max_posts:
+            messages = messages[:self.log_max_posts - 1]
+            shown = sum(message.count("\n") + 1 for message in messages)
+            messages.append(f"…and {len(events) - shown} more events ({summarize_events(events[shown:])})")
+        for content in messages:
+            try:
+                await channel.send(content, allowed_mentions=discord.AllowedMentions.none())
+            except discord.HTTPException as e:
+                self.logger.warning(f"Could not post Minecraft log events: {e}")
+                break
+
+    @post_log_events.before_loop
+    async def before_post_log_events(self):
+        await self.bot.wait_until_ready()
+
+    async def _sync_server_state(self, server: ServerHandle):
+        # Catches whitelist/ban changes made in-game or in the server console.
+        was_hydrated = server.minecraft.state.hydrated
+        async with server:
+            diff = await server.minecraft.rcon.sync_player_state()
+        if was_hydrated and diff:
+            self.logger.info(f"Minecraft player state of {server.name} changed outside the bot: {diff}")
         
     kaeseecke_mc = discord.SlashCommandGroup(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="kaeseecke_mc", description="Minecraft stuff")
         
     @kaeseecke_mc.command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="whitelist", description="Manage the whitelist of the Minecraft server")
-    async def whitelist(self, ctx, action: discord.Option(str, "Action to perform", choices=["add", "remove", "list"]), player: discord.Option(str, "Player name to add/remove", required=False) = None):
+    async def whitelist(self, ctx, action: discord.Option(str, "Action to perform", choices=["add", "remove", "list"]), player: discord.Option(str, "Player name to add/remove", required=False, autocomplete=player_autocomplete) = None):
         self.logger.debug(f'{ctx.author} used the `/kaeseecke_mc whitelist {action} {player}` command')
         await ctx.defer()
         
         if action == "list":
-            with self.minecraft as mc:
-                whitelist = mc.player.whitelist_list()
-                if whitelist:
-                    await ctx.respond(f"Players on the whitelist: {whitelist}")
+            state = self._server(ctx).minecraft.state
+            if state.whitelist_synced_at is not None:
+                players = state.whitelist
+                await ctx.respond(f"Players on the whitelist: {', '.join(players)}" if players else "The whitelist is empty.")
+                return
+            async with self._server(ctx) as mc:
+                whitelist = await mc.player.whitelist_list()
+                if whitelist.players:
+                    await ctx.respond(f"Players on the whitelist: {', '.join(whitelist.players)}")
+                elif whitelist.ok:
+                    await ctx.respond("The whitelist is empty.")
                 else:
-                    await ctx.respond("Failed to get whitelist or whitelist is empty.")
+                    await ctx.respond(f"Failed to get whitelist: {whitelist.raw}")
         elif action in ["add", "remove"]:
             if not player:
                 await ctx.respond(f"Please provide a player name to {action}.")
                 return
-            with self.minecraft as mc:
+            async with self._server(ctx) as mc:
                 if action == "add":
-                    response = mc.player.whitelist_add(player)
+                    response = await mc.player.whitelist_add(player)
                 elif action == "remove":
-                    response = mc.player.whitelist_remove(player)
-                if response:
+                    response = await mc.player.whitelist_remove(player)
+                if response.changed:
                     await ctx.respond(f"Successfully {action}ed {player} {'to' if action == 'add' else 'from'} the whitelist.")
+                elif response.ok:
+                    await ctx.respond(f"Nothing changed: {response.raw}")
                 else:
-                    await ctx.respond(f"Failed to {action} {player} {'to' if action == 'add' else 'from'} the whitelist.")
+                    await ctx.respond(f"Failed to {action} {player} {'to' if action == 'add' else 'from'} the whitelist: {response.raw}")
 
     @kaeseecke_mc.command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="player", description="Player on the Minecraft server")
     async def player(self, ctx, 
                      option: discord.Option(str, "Option to get information about", choices=["list", "kick", "ban", "unban"], required=True),
-                     player: discord.Option(str, "Player name to get information about") = None):
+                     player: discord.Option(str, "Player name to get information about", autocomplete=player_autocomplete) = None):
         self.logger.debug(f'{ctx.author} used the `/kaeseecke_mc player {option} {player}` command')
         await ctx.defer()
         if option == "list":
-            with self.minecraft as mc:
-                players = mc.player.list_players()
-                await ctx.respond(f"Players on the Minecraft server: {players}")
+            snapshot = self._server(ctx).minecraft.status.snapshot
+            if snapshot is not None and snapshot.has_full_player_list:
+                names = ", ".join(sorted(snapshot.player_sample, key=str.lower))
+                await ctx.respond(
+                    f"Players on the Minecraft server: There are {snapshot.players_online} of a max of "
+                    f"{snapshot.players_max} players online: {names}"
+                )
+                return
+            async with self._server(ctx) as mc:
+                players = await mc.player.list_players()
+                if players.ok:
+                    await ctx.respond(
+                        f"Players on the Minecraft server: There are {players.online} of a max of "
+                        f"{players.max} players online: {', '.join(players.players)}"
+                    )
+                else:
+                    await ctx.respond(f"Failed to list players: {players.raw}")
                 return
         if not player:
             await ctx.respond(f"Please provide a player name to {option}.")
             return
         if option == "kick":
-            with self.minecraft as mc:
-                mc.player.kick(player)
-                await ctx.respond(f"Successfully kicked {player} from the server.")
+            async with self._server(ctx) as mc:
+                result = await mc.player.kick(player)
+                if result.changed:
+                    await ctx.respond(f"Successfully kicked {player} from the server.")
+                else:
+                    await ctx.respond(f"Failed to kick {player}: {result.raw}")
                 return
         elif option == "ban":
-            with self.minecraft as mc:
-                mc.player.ban(player)
-                await ctx.respond(f"Successfully banned {player} from the server.")
-                return 
+            async with self._server(ctx) as mc:
+                result = await mc.player.ban(player)
+                if result.changed:
+                    await ctx.respond(f"Successfully banned {player} from the server.")
+                else:
+                    await ctx.respond(f"Failed to ban {player}: {result.raw}")
+                return
         elif option == "unban":
-            with self.minecraft as mc:
-                mc.player.unban(player)
-                await ctx.respond(f"Successfully unbanned {player} from the server.")
+            async with self._server(ctx) as mc:
+                result = await mc.player.pardon(player)
+                if result.changed:
+                    await ctx.respond(f"Successfully unbanned {player} from the server.")
+                else:
+                    await ctx.respond(f"Failed to unban {player}: {result.raw}")
                 return
             
+    @kaeseecke_mc.command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="status", description="Status of the Minecraft server")
+    async def status(self, ctx):
+        self.logger.debug(f'{ctx.author} used the `/kaeseecke_mc status` command')
+        server = self._server(ctx)
+        snapshot = server.minecraft.status.snapshot
+        if snapshot is None:
+            await ctx.respond("The server status hasn't been sampled yet, try again in a moment.")
+            return
+        if not snapshot.online:
+            await ctx.respond(f"The Minecraft server is offline ({snapshot.error}), checked <t:{int(snapshot.sampled_at)}:R>.")
+            return
+
+        embed = discord.Embed(title=f"Minecraft server status: {server.name}", description=snapshot.description or None, color=discord.Color.green())
+        embed.add_field(name="Players", value=f"{snapshot.players_online}/{snapshot.players_max}")
+        embed.add_field(name="Version", value=snapshot.version)
+        embed.add_field(name="Latency", value=f"{snapshot.latency:.0f}ms")
+        trend = server.minecraft.status.history.summary(since=time.time() - 24 * 3600)
+        if trend["samples"]:
+            embed.add_field(
+                name="Last 24h",
+                value=f"Peak {trend['players_peak']} players, avg {trend['players_avg']:.1f}, up {trend['uptime']:.0%}",
+                inline=False
+            )
+        embed.set_footer(text=f"Sampled {time.strftime('%H:%M:%S', time.localtime(snapshot.sampled_at))}")
+        await ctx.respond(embed=embed)
+
     @kaeseecke_mc.command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="game", description="Game commands on the Minecraft server")
     async def game(self, ctx, 
                   option: discord.Option(str, "Option to get information about", choices=["gamemode", "gamerule", "spawnpoint", "trigger"], required=True),
@@ -87,16 +251,16 @@ class MinecraftStuff(commands.Cog):
             if not target:
                 await ctx.respond(f"Please provide a target to set the gamemode for.")
                 return
-            with self.minecraft as mc:
-                mc.game.gamemode(target, mode)
+            async with self._server(ctx) as mc:
+                await mc.game.gamemode(target, mode)
                 await ctx.respond(f"Successfully set {target}'s gamemode to {mode}.")
                 return
         elif option == "gamerule":
             if not rule:
                 await ctx.respond(f"Please provide a rule to set.")
                 return
-            with self.minecraft as mc:
-                mc.game.gamerule(rule, value)
+            async with self._server(ctx) as mc:
+                await mc.game.gamerule(rule, value)
                 await ctx.respond(f"Successfully set {rule} to {value}.")
                 return
         elif option == "spawnpoint":
@@ -107,19 +271,50 @@ class MinecraftStuff(commands.Cog):
             if not x or not y or not z:
                 await ctx.respond(f"Please provide valid coordinates (x,y,z).")
                 return
-            with self.minecraft as mc:
-                mc.game.spawnpoint(target, x, y, z)
+            async with self._server(ctx) as mc:
+                await mc.game.spawnpoint(target, x, y, z)
                 await ctx.respond(f"Successfully set {target}'s spawnpoint to {x}, {y}, {z}.")
                 return
         elif option == "trigger":
             if not target:
                 await ctx.respond(f"Please provide a target to trigger.")
                 return
-            with self.minecraft as mc:
-                mc.game.trigger(target, value)
+            async with self._server(ctx) as mc:
+                await mc.game.trigger(target, value)
                 await ctx.respond(f"Successfully triggered {target}.")
                 return
 
+    @kaeseecke_mc.command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="server", description="Choose which Minecraft server this guild uses")
+    async def server(self, ctx,
+                     option: discord.Option(str, "What to do", choices=["list", "bind", "unbind"], required=True),
+                     name: discord.Option(str, "Name of the server to bind to", required=False) = None):
+        self.logger.debug(f'{ctx.author} used the `/kaeseecke_mc server {option} {name}` command')
+        if option == "list":
+            current = self._server(ctx)
+            lines = []
+            for server in self.registry.list():
+                health = {True: "online", False: "unreachable", None: "not checked yet"}[server.healthy]
+                marker = " (this guild)" if server is current else ""
+                lines.append(f"- `{server.name}`{marker}: {health}")
+            await ctx.respond("Minecraft servers:\n" + "\n".join(lines))
+            return
+        if ctx.guild is None:
+            await ctx.respond("Servers can only be bound inside a guild.", ephemeral=True)
+            return
+        if not (ctx.author.guild_permissions.manage_guild or await self.bot.is_owner(ctx.author)):
+            await ctx.respond("You need the Manage Server permission to change the Minecraft server.", ephemeral=True)
+            return
+        if option == "bind":
+            try:
+                self.registry.bind_guild(ctx.guild.id, name or "")
+            except KeyError:
+                await ctx.respond(f"Unknown server `{name}`. Use `/kaeseecke_mc server list` to see the available servers.", ephemeral=True)
+                return
+            await ctx.respond(f"This guild now uses the Minecraft server `{name}`.")
+        elif option == "unbind":
+            self.registry.unbind_guild(ctx.guild.id)
+            await ctx.respond(f"This guild now uses the default Minecraft server `{self.registry.default_name}`.")
+
 
 def setup(bot):
     bot.add_cog(MinecraftStuff(bot))
\ No newline at end of file
@@ -6,11 +6,13 @@ import io
 import discord
 from discord.ext import commands
 import logging
-from openai import OpenAI
 import os
 import enum
-import re
 import sqlite3
+from utils.llm_gateway import DeadlineExceeded, interaction_deadline
+from utils.request_control import QueueFull
+from utils.response_cache import ResponseCache, normalize
+from utils.text_chunker import split_message
 
 class PplxAiModels(enum.Enum):
     SONAR = "sonar"
@@ -23,6 +25,8 @@ class PPLXAICog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('bot.py')
+        self.cache = ResponseCache()
+        self.web_cache_ttl = float(os.getenv("AI_CACHE_WEB_TTL", "3600"))
         
     pplxai = discord.SlashCommandGroup(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="pplx-ai", description="Perplexity AI API")
 
@@ -31,73 +35,6 @@ class PPLXAICog(commands.Cog):
         buf = io.BytesIO(content.encode("utf-8"))
         return discord.File(fp=buf, filename=filename)
     
-    def split_text(self, text: str, max_length: int = 1900) -> list[str]:
-        """
-        Splits text into segments of a maximum length while preserving code blocks.
-
-        Args:
-            text (str): The text to split.
-            max_length (int, optional): The maximum length of each segment. Defaults to 2000.
-
-        Returns:
-            list[str]: A list of segments of the text.
-        """
-
-        code_block_pattern = re.compile(r'```(.*?)\n(.*?)(?=\n```|\Z)', re.DOTALL)
-        segments = []
-
-        while len(text) > max_length:
-            match = code_block_pattern.search(text)
-            if match:
-                text = self._handle_code_block(text, match, segments, max_length)
-            else:
-                text = self._handle_text_segment(text, segments, max_length)
-
-        if text:
-            segments.append(text)
-
-        return segments
-
-    def _handle_code_block(self, text, match, segments, max_length):
-        start, end = match.span()
-        if start > 0:
-            segments.append(text[:start].rstrip())
-            text = text[start:]
-
-        code_block_content = match.group(0)
-        if len(code_block_content) > max_length:
-            split_code_blocks = self.split_text(code_block_content, max_length)
-            segments.extend(split_code_blocks)
-        else:
-            segments.append(code_block_content)
-
-        return text[end:].lstrip()
-
-    def _handle_text_segment(self, text, segments, max_length):
-        split_point = self._find_split_point(text, max_length)
-        if split_point is None:
-            split_point = max_length
-
-        segments.append(text[:split_point].rstrip())
-        return text[split_point:].lstrip()
-
-    def _find_split_point(self, text, max_len):
-        min_len = max_len // 2
-        priority_patterns = [
-            r'\n# ',      # Highest priority
-            r'\n## ',     # Next priority
-            r'\n### ',    # Followed by
-            r'\n\d',     # followed by a digit
-            r'\n\n',     # Two newlines
-            r'\n'         # Single newline
-        ]
-        for pattern in priority_patterns:
-            matches = list(re.finditer(pattern, text))
-            for match in reversed(matches):
-                if min_len <= match.start() <= max_len:
-                    return match.start()
-        return None
-
     async def is_user_allowed(self, user):
         # check the allowed_users.sqlite file for the user
         conn = sqlite3.connect('allowed_users.sqlite')
@@ -109,6 +46,26 @@ class PPLXAICog(commands.Cog):
         return False
         
 
+    async def generate(self, ctx, model: str, messages: list, prompt: str, cache_scope: str) -> str:
+        """
+        Gets an answer from PPLX AI (within the user's and the model's concurrency limits) and caches it
+        """
+        deadline = interaction_deadline(ctx)
+        async with self.bot.ai_limiter.slot(ctx.author.id, model, deadline):
+            response = await self.bot.llm.run(
+                "perplexity",
+                lambda client: client.chat.completions.create(model=model, messages=messages),
+                deadline=deadline,
+            )
+        citations = getattr(response, "citations", None) or []
+        content = response.choices[0].message.content
+        content = content.replace("####", "###") # for discord compatibility
+
+        for index, citation in enumerate(citations):
+            content = content.replace(f"[{index}]", f"[[{index}]](<{citation}>)")
+        self.cache.put(cache_scope, prompt, content, ttl=self.web_cache_ttl)
+        return content
+
     @pplxai.command(integration_types={discord.IntegrationType.guild_install, discord.IntegrationType.user_install}, name="ask", description="Ask Perplexity AI something", dm_permission=True)
     async def ask_pplx_ai(self, ctx: discord.ApplicationContext,
                                 prompt: str = discord.Option(name="prompt", description="The prompt to send to PPLX AI", required=True),
@@ -131,32 +88,35 @@ class PPLXAICog(commands.Cog):
                 await ctx.respond("Error: PPLX_TOKEN environment variable is not set.", ephemeral=True)
                 return
 
-            pplxai = OpenAI(api_key=os.getenv('PPLX_TOKEN'), base_url="https://api.perplexity.ai")
-            response = pplxai.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are an artificial intelligence assistant and you need to "
-                            "engage in a helpful, detailed, polite conversation with a user."
-                        ),
-                    },
-                    {   
-                        "role": "user",
-                        "content": prompt,
-                    },
-                ]
-            )
-            citations = getattr(response, "citations", None) or []
-            content = response.choices[0].message.content
-            content = content.replace("####", "###") # for discord compatibility
-
-            for index, citation in enumerate(citations):
-                content = content.replace(f"[{index}]", f"[[{index}]](<{citation}>)")
+            messages = [
+                {
+                    "role": "system",
+                    "content": (
+                        "You are an artificial intelligence assistant and you need to "
+                        "engage in a helpful, detailed, polite conversation with a user."
+                    ),
+                },
+                {   
+                    "role": "user",
+                    "content": prompt,
+                },
+            ]
+            # Sonar models always search the web, so their answers are cached with the shorter web TTL
+            cache_scope = ResponseCache.scope(model, messages[0]["content"], tools=True)
+            hit = self.cache.get(cache_scope, prompt)
+            if hit:
+                content = hit.response + ("\n-# cached answer to a similar question" if hit.near else "\n-# cached")
+            else:
+                # Identical questions asked while this one is generating wait for its answer; if the
+                # other user's request is turned away or times out, this one is generated on its own.
+                content, _ = await self.bot.single_flight.do(
+                    (cache_scope, normalize(prompt)),
+                    lambda: self.generate(ctx, model, messages, prompt, cache_scope),
+                    caller_errors=(QueueFull, DeadlineExceeded),
+                )
 
             if len(content) > 1900:  
-                chunks = self.split_text(content)
+                chunks = split_message(content)
                 if len(chunks) > 6:
                     await ctx.respond(
                         content=f"Response from PPLX AI for:\n{prompt}",
@@ -169,6 +129,8 @@ class PPLXAICog(commands.Cog):
             else:
                 await ctx.respond(content=content)
 
+        except QueueFull as e:
+            await ctx.respond(content=str(e), ephemeral=True)
         except Exception as e:
             self.logger.error(f"Error in ask_pplx_ai command: {str(e)}")
             error_message = "An error occurred while processing your request. Please try again later."
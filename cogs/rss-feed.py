@@ -1,13 +1,15 @@
 import discord
 from discord import default_permissions, Option, TextChannel, IntegrationType, SlashCommandGroup
 from discord.ext import commands, tasks
-import feedparser
 import sqlite3
 import logging
 import hashlib
 from urllib.parse import urlparse
 import requests
-from bs4 import BeautifulSoup
+from utils.lazy_import import lazy_import
+
+feedparser = lazy_import("feedparser")
+bs4 = lazy_import("bs4")
 
 class RSSFeed(commands.Cog):
     def __init__(self, bot):
@@ -302,7 +304,7 @@ class RSSFeed(commands.Cog):
             # Fetch the article page
             response = requests.get(article_url)
             response.raise_for_status()  # Raise an error if the request failed
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = bs4.BeautifulSoup(response.content, 'html.parser')
 
             # Find the <meta> tag with property="og:title"
             meta_tag = soup.find('meta', {'property': 'og:title'})
@@ -2,13 +2,99 @@ import discord
 from discord.ext import commands, tasks
 import sqlite3
 from datetime import datetime, timezone
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 import asyncio
-from utils.youtube_helpers import YouTubeRateLimiter, YouTubeCache, safe_api_call
+from utils.youtube_helpers import YouTubeRateLimiter, YouTubeCache, YouTubeQuotaExceeded, safe_api_call
+from utils.ttl_cache import BoundedTTLCache
+from utils.notification_fanout import NotificationFanout, Delivery
 import os
 import logging
 from typing import Optional
+from functools import cached_property
+from utils.lazy_import import lazy_import
+
+discovery = lazy_import("googleapiclient.discovery")
+errors = lazy_import("googleapiclient.errors")
+
+def _migrate_v1(db):
+    """Original single-table layout (also the starting point for fresh databases)."""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS youtube_subscriptions (
+            guild_id INTEGER,
+            youtube_channel_id TEXT,
+            discord_channel_id INTEGER,
+            last_video_id TEXT,
+            notification_count INTEGER DEFAULT 0,
+            ping_role_id INTEGER
+        )
+    ''')
+    try:
+        db.execute('ALTER TABLE youtube_subscriptions ADD COLUMN last_video_published_at TEXT')
+    except sqlite3.OperationalError:
+        pass
+
+
+def _migrate_v2(db):
+    """Split per-channel video state from per-guild subscriptions and add keys/indexes."""
+    db.execute('''
+        CREATE TABLE youtube_channels (
+            youtube_channel_id TEXT PRIMARY KEY,
+            last_video_id TEXT,
+            last_video_published_at TEXT
+        )
+    ''')
+    # Bare columns next to MAX() come from the row holding the maximum, so each
+    # channel keeps the newest video any of its subscriptions had seen.
+    db.execute('''
+        INSERT INTO youtube_channels (youtube_channel_id, last_video_id, last_video_published_at)
+        SELECT youtube_channel_id, last_video_id, NULLIF(MAX(COALESCE(last_video_published_at, '')), '')
+        FROM youtube_subscriptions
+        WHERE youtube_channel_id IS NOT NULL
+        GROUP BY youtube_channel_id
+    ''')
+    db.execute('ALTER TABLE youtube_subscriptions RENAME TO youtube_subscriptions_v1')
+    db.execute('''
+        CREATE TABLE youtube_subscriptions (
+            guild_id INTEGER NOT NULL,
+            youtube_channel_id TEXT NOT NULL REFERENCES youtube_channels(youtube_channel_id),
+            discord_channel_id INTEGER,
+            ping_role_id INTEGER,
+            notification_count INTEGER NOT NULL DEFAULT 0,
+            last_notified_video_id TEXT,
+            PRIMARY KEY (guild_id, youtube_channel_id)
+        )
+    ''')
+    # The old table had no key, so duplicate (guild, channel) rows are merged.
+    db.execute('''
+        INSERT INTO youtube_subscriptions
+            (guild_id, youtube_channel_id, discord_channel_id, ping_role_id, notification_count, last_notified_video_id)
+        SELECT guild_id, youtube_channel_id, discord_channel_id, ping_role_id, COALESCE(notification_count, 0), last_video_id
+        FROM youtube_subscriptions_v1
+        WHERE guild_id IS NOT NULL AND youtube_channel_id IS NOT NULL
+        ON CONFLICT(guild_id, youtube_channel_id) DO UPDATE SET
+            discord_channel_id = excluded.discord_channel_id,
+            ping_role_id = excluded.ping_role_id,
+            notification_count = notification_count + excluded.notification_count,
+            last_notified_video_id = COALESCE(excluded.last_notified_video_id, last_notified_video_id)
+    ''')
+    db.execute('DROP TABLE youtube_subscriptions_v1')
+    # Lookups by guild_id are served by the primary key.
+    db.execute('CREATE INDEX idx_youtube_subscriptions_channel ON youtube_subscriptions (youtube_channel_id)')
+
+
+SCHEMA_MIGRATIONS = [_migrate_v1, _migrate_v2]
+
+
+def _parse_published_at(raw: Optional[str]) -> Optional[datetime]:
+    if not raw:
+        return None
+    try:
+        published_at = datetime.fromisoformat(raw.replace('Z', '+00:00') if raw.endswith('Z') else raw)
+    except ValueError:
+        return None
+    if published_at.tzinfo is None:
+        published_at = published_at.replace(tzinfo=timezone.utc)
+    return published_at
+
 
 class YouTubeNotifications(commands.Cog):
     def __init__(self, bot):
@@ -17,33 +103,40 @@ class YouTubeNotifications(commands.Cog):
         self.db = sqlite3.connect('youtube_notifications.sqlite')
         self.cursor = self.db.cursor()
         self.create_tables()
-        self._uploads_playlist_cache = {}
-        self.youtube = build('youtube', 'v3', developerKey=os.getenv('YOUTUBE_DATA_API_KEY'))
+        # Uploads playlist ids never change, so they only need a size bound.
+        self._uploads_playlist_cache = BoundedTTLCache(maxsize=1024, ttl=None)
         self.rate_limiter = YouTubeRateLimiter()
-        self.cache = YouTubeCache()
+        # Channel titles may be served up to a day stale while they refresh.
+        self.cache = YouTubeCache(stale_duration=86400)
+        self.cache.load_subscribers(self.db)
+        self.fanout = NotificationFanout(bot)
         self.check_new_videos.start()
 
     yt_commands=discord.SlashCommandGroup("yt", "YouTube notifications commands")
 
+    @cached_property
+    def youtube(self):
+        # Built on first use: importing googleapiclient and building the
+        # discovery client is the slowest part of loading this cog.
+        return discovery.build('youtube', 'v3', developerKey=os.getenv('YOUTUBE_DATA_API_KEY'))
+
     def create_tables(self):
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS youtube_subscriptions (
-                guild_id INTEGER,
-                youtube_channel_id TEXT,
-                discord_channel_id INTEGER,
-                last_video_id TEXT,
-                notification_count INTEGER DEFAULT 0,
-                ping_role_id INTEGER
-            )
-        ''')
-        self.db.commit()
-        try:
-            self.cursor.execute(
-                'ALTER TABLE youtube_subscriptions ADD COLUMN last_video_published_at TEXT'
-            )
-            self.db.commit()
-        except sqlite3.OperationalError:
-            pass
+        """Bring youtube_notifications.sqlite up to the latest schema version.
+
+        The version lives in ``PRAGMA user_version``; each migration runs in its
+        own transaction and bumps it by one.
+        """
+        version = self.db.execute('PRAGMA user_version').fetchone()[0]
+        for target, migrate in enumerate(SCHEMA_MIGRATIONS[version:], start=version + 1):
+            self.db.execute('BEGIN')
+            try:
+                migrate(self.db)
+                self.db.execute(f'PRAGMA user_version = {target}')
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            self.logger.info(f"Migrated youtube_notifications.sqlite to schema v{target}")
 
     def _get_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
         cached = self._uploads_playlist_cache.get(channel_id)
@@ -64,13 +157,28 @@ class YouTubeNotifications(commands.Cog):
         )
         if not uploads:
             return None
-        self._uploads_playlist_cache[channel_id] = uploads
+        self._uploads_playlist_cache.set(channel_id, uploads)
         return uploads
 
-    async def fetch_latest_video(self, channel_id, use_cache: bool = True):
+    async def _get_channel_title(self, channel_id: str) -> str:
+        async def load():
+            await self.rate_limiter.acquire('channels.list')
+            response = self.youtube.channels().list(
+                part='snippet',
+                id=channel_id
+            ).execute()
+            return response['items'][0]['snippet']['title']
+
+        return await self.cache.get_or_load(f"channel_title_{channel_id}", load)
+
+    async def fetch_latest_video(self, channel_id, use_cache: bool = True, reservation=None):
         """
         Latest upload via the channel uploads playlist (stable ordering).
         Search API order=date is unreliable (Shorts vs long-form, reordering).
+
+        Quota is charged to ``reservation`` when given, otherwise directly to the
+        rate limiter. With a reservation, running out of quota raises
+        YouTubeQuotaExceeded so the caller can stop its remaining calls.
         """
         cache_key = f"latest_video_{channel_id}"
         if use_cache:
@@ -78,14 +186,16 @@ class YouTubeNotifications(commands.Cog):
             if cached_result:
                 return cached_result
 
-        await self.rate_limiter.wait_if_needed()
+        quota = reservation or self.rate_limiter
 
         try:
+            if channel_id not in self._uploads_playlist_cache:
+                await quota.acquire('channels.list')
             uploads_playlist_id = self._get_uploads_playlist_id(channel_id)
             if not uploads_playlist_id:
                 return None
 
-            await self.rate_limiter.wait_if_needed()
+            await quota.acquire('playlistItems.list')
             pl_request = self.youtube.playlistItems().list(
                 part='snippet,contentDetails',
                 playlistId=uploads_playlist_id,
@@ -104,7 +214,7 @@ class YouTubeNotifications(commands.Cog):
             if not video_id:
                 return None
 
-            await self.rate_limiter.wait_if_needed()
+            await quota.acquire('videos.list')
             video_request = self.youtube.videos().list(
                 part='snippet,player',
                 id=video_id
@@ -123,16 +233,7 @@ class YouTubeNotifications(commands.Cog):
                     break
 
             published_raw = video_data.get('publishedAt') or ''
-            if published_raw.endswith('Z'):
-                published_iso = published_raw.replace('Z', '+00:00')
-            else:
-                published_iso = published_raw
-            try:
-                published_at = datetime.fromisoformat(published_iso)
-                if published_at.tzinfo is None:
-                    published_at = published_at.replace(tzinfo=timezone.utc)
-            except ValueError:
-                published_at = None
+            published_at = _parse_published_at(published_raw)
 
             video_info = {
                 'id': video_id,
@@ -148,11 +249,17 @@ class YouTubeNotifications(commands.Cog):
                 self.cache.set(cache_key, video_info)
             return video_info
 
+        except YouTubeQuotaExceeded as e:
+            quota.mark_exhausted()
+            self.logger.warning(f"Skipping latest video fetch for {channel_id}: {str(e)}")
+            if reservation is not None:
+                raise
+            return None
         except Exception as e:
             self.bot.logger.error(f"Error fetching latest video: {str(e)}")
             return None
 
-    def get_channel_id_from_url(self, url):
+    async def get_channel_id_from_url(self, url):
         try:
             # Extract channel identifier from URL
             if 'youtube.com/' in url:
@@ -163,6 +270,7 @@ class YouTubeNotifications(commands.Cog):
 
             # Try username first
             try:
+                await self.rate_limiter.acquire('channels.list')
                 request = self.youtube.channels().list(
                     part='id',
                     forUsername=identifier
@@ -171,11 +279,12 @@ class YouTubeNotifications(commands.Cog):
                 
                 if response.get('items'):
                     return response['items'][0]['id']
-            except HttpError:
+            except errors.HttpError:
                 pass
 
             # Try channel ID
             try:
+                await self.rate_limiter.acquire('channels.list')
                 request = self.youtube.channels().list(
                     part='id',
                     id=identifier
@@ -184,11 +293,12 @@ class YouTubeNotifications(commands.Cog):
                 
                 if response.get('items'):
                     return response['items'][0]['id']
-            except HttpError:
+            except errors.HttpError:
                 pass
 
             # Try handle
             try:
+                await self.rate_limiter.acquire('channels.list')
                 request = self.youtube.channels().list(
                     part='id',
                     forHandle=identifier
@@ -197,12 +307,12 @@ class YouTubeNotifications(commands.Cog):
                 
                 if response.get('items'):
                     return response['items'][0]['id']
-            except HttpError:
+            except errors.HttpError:
                 pass
 
             return None
             
-        except HttpError as e:
+        except errors.HttpError as e:
             if e.resp.status == 403:
                 raise Exception("YouTube API quota exceeded")
             raise Exception(f"YouTube API error: {str(e)}")
@@ -216,26 +326,37 @@ class YouTubeNotifications(commands.Cog):
         ping_role: discord.Role = discord.Option(discord.Role, "Role to ping for notifications", required=False)
     ):
         try:
-            channel_id = self.get_channel_id_from_url(yt_channel)
+            channel_id = await self.get_channel_id_from_url(yt_channel)
             if not channel_id:
                 await ctx.respond("Invalid YouTube channel URL!")
                 return
 
             latest_video = await self.fetch_latest_video(channel_id)
             
-            self.cursor.execute('''
-                INSERT INTO youtube_subscriptions 
-                (guild_id, youtube_channel_id, discord_channel_id, last_video_id, ping_role_id, last_video_published_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                ctx.guild.id,
-                channel_id,
-                dc_channel.id,
-                latest_video['id'] if latest_video else None,
-                ping_role.id if ping_role else None,
-                (latest_video.get('published_at_iso') or '') if latest_video else None,
-            ))
-            self.db.commit()
+            with self.db:
+                self.db.execute('''
+                    INSERT INTO youtube_channels (youtube_channel_id, last_video_id, last_video_published_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(youtube_channel_id) DO NOTHING
+                ''', (
+                    channel_id,
+                    latest_video['id'] if latest_video else None,
+                    (latest_video.get('published_at_iso') or '') if latest_video else None,
+                ))
+                self.db.execute('''
+                    INSERT INTO youtube_subscriptions
+                    (guild_id, youtube_channel_id, discord_channel_id, ping_role_id, last_notified_video_id)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(guild_id, youtube_channel_id) DO UPDATE SET
+                        discord_channel_id = excluded.discord_channel_id,
+                        ping_role_id = excluded.ping_role_id
+                ''', (
+                    ctx.guild.id,
+                    channel_id,
+                    dc_channel.id,
+                    ping_role.id if ping_role else None,
+                    latest_video['id'] if latest_video else None,
+                ))
             
             self.cache.add_channel_subscriber(channel_id, ctx.guild.id)
             
@@ -262,24 +383,26 @@ class YouTubeNotifications(commands.Cog):
         options = []
         for channel in channels:
             try:
-                response = self.youtube.channels().list(
-                    part='snippet',
-                    id=channel[0]
-                ).execute()
-                channel_name = response['items'][0]['snippet']['title']
+                channel_name = await self._get_channel_title(channel[0])
                 options.append(discord.SelectOption(label=channel_name, value=channel[0]))
-            except HttpError:
+            except (errors.HttpError, YouTubeQuotaExceeded):
                 options.append(discord.SelectOption(label=channel[0], value=channel[0]))
 
         select = discord.ui.Select(placeholder="Choose a channel to unsubscribe", options=options)
         
         async def select_callback(interaction):
             channel_id = select.values[0]
-            self.cursor.execute('''
-                DELETE FROM youtube_subscriptions 
-                WHERE guild_id = ? AND youtube_channel_id = ?
-            ''', (ctx.guild.id, channel_id))
-            self.db.commit()
+            with self.db:
+                self.db.execute('''
+                    DELETE FROM youtube_subscriptions
+                    WHERE guild_id = ? AND youtube_channel_id = ?
+                ''', (ctx.guild.id, channel_id))
+                self.db.execute('''
+                    DELETE FROM youtube_channels
+                    WHERE youtube_channel_id = ? AND NOT EXISTS (
+                        SELECT 1 FROM youtube_subscriptions WHERE youtube_channel_id = ?
+                    )
+                ''', (channel_id, channel_id))
             
             self.cache.remove_channel_subscriber(channel_id, ctx.guild.id)
             await interaction.response.send_message("Successfully unsubscribed!")
@@ -306,18 +429,14 @@ class YouTubeNotifications(commands.Cog):
         
         for yt_id, dc_id in subscriptions:
             try:
-                response = self.youtube.channels().list(
-                    part='snippet',
-                    id=yt_id
-                ).execute()
-                channel_name = response['items'][0]['snippet']['title']
+                channel_name = await self._get_channel_title(yt_id)
                 dc_channel = self.bot.get_channel(dc_id)
                 embed.add_field(
                     name=channel_name,
                     value=f"Notifications in: {dc_channel.mention}",
                     inline=False
                 )
-            except HttpError:
+            except (errors.HttpError, YouTubeQuotaExceeded):
                 continue
 
         await ctx.respond(embed=embed)
@@ -339,17 +458,13 @@ class YouTubeNotifications(commands.Cog):
         
         for yt_id, count in stats:
             try:
-                response = self.youtube.channels().list(
-                    part='snippet',
-                    id=yt_id
-                ).execute()
-                channel_name = response['items'][0]['snippet']['title']
+                channel_name = await self._get_channel_title(yt_id)
                 embed.add_field(
                     name=channel_name,
                     value=f"Notifications sent: {count}",
                     inline=False
                 )
-            except HttpError:
+            except (errors.HttpError, YouTubeQuotaExceeded):
                 continue
 
         await ctx.respond(embed=embed)
@@ -361,7 +476,7 @@ class YouTubeNotifications(commands.Cog):
         yt_channel: str = discord.Option(str, "YouTube channel URL", required=True)
     ):
         try:
-            channel_id = self.get_channel_id_from_url(yt_channel)
+            channel_id = await self.get_channel_id_from_url(yt_channel)
             if not channel_id:
                 await ctx.respond("Invalid YouTube channel URL!")
                 return
@@ -381,62 +496,117 @@ class YouTubeNotifications(commands.Cog):
 
     @tasks.loop(minutes=5)
     async def check_new_videos(self):
-        self.cursor.execute('SELECT DISTINCT youtube_channel_id FROM youtube_subscriptions')
-        unique_channels = self.cursor.fetchall()
+        self.cursor.execute('''
+            SELECT youtube_channel_id, last_video_id, last_video_published_at
+            FROM youtube_channels c
+            WHERE EXISTS (SELECT 1 FROM youtube_subscriptions s WHERE s.youtube_channel_id = c.youtube_channel_id)
+        ''')
+        channels = self.cursor.fetchall()
+        if not channels:
+            return
 
-        for (channel_id,) in unique_channels:
-            try:
-                video_info = await self.fetch_latest_video(channel_id, use_cache=False)
-                if not video_info:
-                    continue
+        # Polling is low priority: reserve the whole cycle up front (playlistItems +
+        # videos per channel, plus channels.list for uncached uploads playlists) and
+        # skip the cycle rather than eat into quota kept back for commands.
+        units = sum(
+            2 if channel_id in self._uploads_playlist_cache else 3
+            for channel_id, _, _ in channels
+        )
+        try:
+            reservation = await self.rate_limiter.reserve(units, low_priority=True, wait=False)
+        except YouTubeQuotaExceeded as e:
+            self.logger.warning(f"Deferring YouTube poll: {str(e)}")
+            return
 
-                self.cursor.execute('''
-                    SELECT guild_id, discord_channel_id, last_video_id, ping_role_id, last_video_published_at
-                    FROM youtube_subscriptions 
-                    WHERE youtube_channel_id = ?
-                ''', (channel_id,))
-                subscriptions = self.cursor.fetchall()
+        subscriptions = {}
+        self.cursor.execute('''
+            SELECT youtube_channel_id, guild_id, discord_channel_id, ping_role_id, last_notified_video_id
+            FROM youtube_subscriptions
+        ''')
+        for channel_id, guild_id, discord_channel_id, ping_role_id, last_notified in self.cursor.fetchall():
+            subscriptions.setdefault(channel_id, []).append((guild_id, discord_channel_id, ping_role_id, last_notified))
 
-                for row in subscriptions:
-                    guild_id, discord_channel_id, last_video_id, ping_role_id, last_pub_db = row
-                    if video_info['id'] == last_video_id:
-                        continue
-                    if last_pub_db and video_info.get('published_at'):
-                        try:
-                            last_dt = datetime.fromisoformat(
-                                last_pub_db.replace('Z', '+00:00')
-                                if last_pub_db.endswith('Z')
-                                else last_pub_db
-                            )
-                            if last_dt.tzinfo is None:
-                                last_dt = last_dt.replace(tzinfo=timezone.utc)
-                            if video_info['published_at'] <= last_dt:
-                                continue
-                        except ValueError:
-                            pass
-
-                    channel = self.bot.get_channel(discord_channel_id)
-                    if not channel:
+        # channel id -> (video id, published at) of a new upload, applied once every subscription got it
+        new_videos = {}
+        fanouts = []
+        try:
+            async with reservation:
+                await self._check_channels(channels, subscriptions, reservation, new_videos, fanouts)
+        finally:
+            deliveries = []
+            undelivered = set()
+            outcomes = await asyncio.gather(*(task for _, task in fanouts), return_exceptions=True)
+            for ((channel_id, video_id), _), results in zip(fanouts, outcomes):
+                if isinstance(results, BaseException):
+                    self.logger.error(f"Error sending YouTube notifications: {str(results)}")
+                    undelivered.add(channel_id)
+                    continue
+                for result in results:
+                    guild_id, _, _ = result.delivery.key
+                    if result.ok:
+                        deliveries.append((video_id, guild_id, channel_id))
                         continue
+                    # Permanent failures (deleted channel, missing access) won't succeed on a retry,
+                    # so they don't hold the channel back.
+                    if result.transient:
+                        undelivered.add(channel_id)
+                    self.logger.warning(
+                        f"YouTube notification for {channel_id} to guild {guild_id} failed: {result.error}"
+                    )
+            # A channel only moves on to its new video once no subscription is left with a transient
+            # failure; those are retried next cycle, while last_notified_video_id keeps the others
+            # from repeats.
+            channel_updates = [
+                (video_id, published_at, channel_id)
+                for channel_id, (video_id, published_at) in new_videos.items()
+                if channel_id not in undelivered
+            ]
+
+            # One transaction per poll cycle, committed even if the cycle was cut short.
+            with self.db:
+                self.db.executemany('''
+                    UPDATE youtube_channels SET last_video_id = ?, last_video_published_at = ?
+                    WHERE youtube_channel_id = ?
+                ''', channel_updates)
+                self.db.executemany('''
+                    UPDATE youtube_subscriptions SET
+                        last_notified_video_id = ?,
+                        notification_count = notification_count + 1
+                    WHERE guild_id = ? AND youtube_channel_id = ?
+                ''', deliveries)
+
+        self.logger.debug(f"YouTube cache stats: {self.cache.stats()}")
+
+    async def _check_channels(self, channels, subscriptions, reservation, new_videos, fanouts):
+        """Look for new uploads; each one is fanned out in the background while
+        the remaining channels are checked. Subscriptions that were already
+        notified of the upload (in an earlier, partly failed cycle) are skipped."""
+        for channel_id, last_video_id, last_pub_db in channels:
+            try:
+                video_info = await self.fetch_latest_video(channel_id, use_cache=False, reservation=reservation)
+                if not video_info or video_info['id'] == last_video_id:
+                    continue
+                last_dt = _parse_published_at(last_pub_db)
+                if last_dt and video_info.get('published_at') and video_info['published_at'] <= last_dt:
+                    continue
 
-                    video_url = f"https://www.youtube.com/watch?v={video_info['id']}"
+                video_url = f"https://www.youtube.com/watch?v={video_info['id']}"
+                batch = []
+                for guild_id, discord_channel_id, ping_role_id, last_notified in subscriptions.get(channel_id, []):
+                    if last_notified == video_info['id']:
+                        continue
                     message_content = f"### {video_info['title']}\n{video_url}"
 
                     if ping_role_id:
                         message_content = f"||<@&{ping_role_id}>||\n{message_content}"
 
-                    await channel.send(content=message_content)
-
-                    pub_iso = video_info.get('published_at_iso') or ''
-                    self.cursor.execute('''
-                        UPDATE youtube_subscriptions SET
-                            last_video_id = ?,
-                            last_video_published_at = ?,
-                            notification_count = notification_count + 1
-                        WHERE guild_id = ? AND youtube_channel_id = ?
-                    ''', (video_info['id'], pub_iso, guild_id, channel_id))
-                    self.db.commit()
+                    batch.append(Delivery(discord_channel_id, message_content, (guild_id, channel_id, video_info['id'])))
+                fanouts.append(((channel_id, video_info['id']), asyncio.create_task(self.fanout.dispatch(batch))))
+                new_videos[channel_id] = (video_info['id'], video_info.get('published_at_iso') or '')
 
+            except YouTubeQuotaExceeded as e:
+                self.logger.warning(f"Stopping YouTube poll early: {str(e)}")
+                break
             except Exception as e:
                 self.logger.error(f"Error checking videos: {str(e)}")
                 continue
@@ -449,6 +619,16 @@ class YouTubeNotifications(commands.Cog):
 
     def cog_unload(self):
         self.check_new_videos.cancel()
+        # A cancelled poll still commits its results on the way out, so the database
+        # is closed only once the loop's task has finished.
+        task = self.check_new_videos.get_task()
+        if task is not None and not task.done():
+            task.add_done_callback(lambda _: self._close())
+        else:
+            self._close()
+
+    def _close(self):
+        self.rate_limiter.close()
         self.db.close()
 
 def setup(bot):
@@ -13,13 +13,15 @@ import os
 import tempfile
 import re
 import sys
-import importlib
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
-import yt_dlp as youtube_dl
-import spotipy
-from pydub import AudioSegment
 import base64
 import sqlite3
+from utils.lazy_import import lazy_import, reload_module
+
+# Heavy dependencies are imported on first use (or by the post-ready warm-up).
+youtube_dl = lazy_import("yt_dlp")
+spotipy = lazy_import("spotipy")
+pydub = lazy_import("pydub")
 
 COOKIES_FILE = 'cookies.txt'
 
@@ -60,7 +62,7 @@ async def _upgrade_ytdlp_and_reload(logger: logging.Logger) -> bool:
                 out = (stdout or b"").decode(errors="replace").strip()
                 logger.error(f"pip upgrade yt-dlp failed (exit {proc.returncode}): {err or out}")
                 return False
-            importlib.reload(youtube_dl)
+            reload_module(youtube_dl)
             try:
                 ver = youtube_dl.version.__version__
             except Exception:
@@ -560,7 +562,7 @@ class YoutubeDLPCog(commands.Cog):
                 return
 
             # Step 2: Send the message with the uploaded file
-            audio = AudioSegment.from_ogg(str(filepath))
+            audio = pydub.AudioSegment.from_ogg(str(filepath))
             duration_secs = round(len(audio) / 1000.0, 2)
 
             samples = audio.get_array_of_samples()
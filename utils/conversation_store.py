@@ -0,0 +1,259 @@
+"""Multi-turn conversation memory for the AI commands.
+
+A conversation belongs to one user in one channel. Every exchange is stored,
+so a later command can continue it. Follow-ups don't send the whole history:
+``window()`` returns the newest turns that fit the token budget, plus a
+rolling summary of everything older. Once turns fall out of the window,
+``overflow()`` hands them to the caller to be folded into the summary and
+``compact()`` replaces them with it, so the store stays small no matter how
+long a conversation runs. Conversations that have been idle for longer than
+``idle_timeout`` start over.
+
+Example:
+    ```python
+    store = ConversationStore()
+    conversation = store.window(user_id, channel_id)
+    ...  # send conversation.summary + conversation.turns + the new question
+    store.append(user_id, channel_id, question, answer)
+    ```
+"""
+
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field, replace
+from typing import List, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+TRUNCATED = "\n[...]"
+
+
+@dataclass(frozen=True)
+class Turn:
+    """One message of a conversation.
+
+    Attributes:
+        id: Row id, increasing over the conversation
+        role: "user" or "model"
+        text: The message
+        tokens: Estimated tokens of the message
+    """
+    id: int
+    role: str
+    text: str
+    tokens: int
+
+
+@dataclass
+class Conversation:
+    """What to send along with a follow-up question.
+
+    Attributes:
+        summary: Summary of the turns that no longer fit the budget, empty if there are none
+        turns: The newest turns that fit the budget, oldest first
+    """
+    summary: str = ""
+    turns: List[Turn] = field(default_factory=list)
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.summary) + sum(turn.tokens for turn in self.turns)
+
+
+def _truncate(turn: Turn, tokens: int) -> Turn:
+    """The turn, its text cut to about ``tokens`` tokens (keeping the beginning)."""
+    if turn.tokens <= tokens:
+        return turn
+    text = turn.text[:max(0, (tokens - 1) * 4 - len(TRUNCATED))].rstrip() + TRUNCATED
+    return replace(turn, text=text, tokens=estimate_tokens(text))
+
+
+class ConversationStore:
+    """SQLite-backed conversations keyed by (user, channel)."""
+
+    def __init__(self, db_path: str = 'ai_conversations.sqlite', budget: Optional[int] = None,
+                 idle_timeout: Optional[float] = None):
+        """Initialize the store.
+
+        Args:
+            db_path: SQLite database file
+            budget: Tokens of context sent with a follow-up (AI_CONVERSATION_TOKENS, default 4000)
+            idle_timeout: Seconds after which an idle conversation starts over
+                (AI_CONVERSATION_IDLE_TIMEOUT, default 6 hours)
+        """
+        self.budget = budget if budget is not None else int(os.getenv("AI_CONVERSATION_TOKENS", "4000"))
+        self.idle_timeout = idle_timeout if idle_timeout is not None else float(os.getenv("AI_CONVERSATION_IDLE_TIMEOUT", "21600"))
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_tables()
+        self.purge_idle()
+
+    def _create_tables(self):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS conversations (
+                user_id INTEGER NOT NULL,
+                channel_id INTEGER NOT NULL,
+                summary TEXT NOT NULL DEFAULT '',
+                updated REAL NOT NULL,
+                PRIMARY KEY (user_id, channel_id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS conversation_turns (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                channel_id INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                text TEXT NOT NULL,
+                tokens INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversation_turns_key ON conversation_turns (user_id, channel_id, id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversations_updated ON conversations (updated)')
+        self.conn.commit()
+
+    def _summary(self, user_id: int, channel_id: int) -> Optional[str]:
+        row = self.conn.execute(
+            'SELECT summary, updated FROM conversations WHERE user_id = ? AND channel_id = ?',
+            (user_id, channel_id),
+        ).fetchone()
+        if row is None:
+            return None
+        if time.time() - row[1] > self.idle_timeout:
+            self.forget(user_id, channel_id)
+            return None
+        return row[0]
+
+    def _turns(self, user_id: int, channel_id: int) -> List[Turn]:
+        rows = self.conn.execute(
+            'SELECT id, role, text, tokens FROM conversation_turns WHERE user_id = ? AND channel_id = ? ORDER BY id',
+            (user_id, channel_id),
+        ).fetchall()
+        return [Turn(*row) for row in rows]
+
+    def _split(self, user_id: int, channel_id: int):
+        summary = self._summary(user_id, channel_id)
+        if summary is None:
+            return "", [], []
+        turns = self._turns(user_id, channel_id)
+        remaining = self.budget - estimate_tokens(summary)
+        start = len(turns)
+        # Newest turns first; whole exchanges only, so the window never starts with a model answer.
+        while start >= 2 and turns[start - 2].tokens + turns[start - 1].tokens <= remaining:
+            remaining -= turns[start - 2].tokens + turns[start - 1].tokens
+            start -= 2
+        if start == len(turns) and start >= 2:
+            # The newest exchange alone is over budget. A follow-up still needs it, so it is cut
+            # down to fit (but gets at least a quarter of the budget) instead of being summarized.
+            return summary, turns[:start - 2], self._truncate_exchange(turns[-2], turns[-1], max(remaining, self.budget // 4))
+        return summary, turns[:start], turns[start:]
+
+    @staticmethod
+    def _truncate_exchange(question: Turn, answer: Turn, budget: int) -> List[Turn]:
+        # The question keeps up to half the budget, or more if the answer is short.
+        question_budget = max(budget // 2, budget - answer.tokens)
+        question = _truncate(question, question_budget)
+        return [question, _truncate(answer, budget - question.tokens)]
+
+    def window(self, user_id: int, channel_id: int) -> Conversation:
+        """The context to send with a follow-up.
+
+        Args:
+            user_id: Discord user id
+            channel_id: Discord channel id
+
+        Returns:
+            Conversation: The summary and the newest turns within the budget (empty for a new conversation).
+                The newest exchange is always included, truncated if it alone exceeds the budget.
+        """
+        summary, _, window = self._split(user_id, channel_id)
+        return Conversation(summary, window)
+
+    def overflow(self, user_id: int, channel_id: int) -> List[Turn]:
+        """Turns that no longer fit the budget and should be folded into the summary.
+
+        Returns:
+            List[Turn]: The turns, oldest first
+        """
+        return self._split(user_id, channel_id)[1]
+
+    def summary(self, user_id: int, channel_id: int) -> str:
+        return self._summary(user_id, channel_id) or ""
+
+    def append(self, user_id: int, channel_id: int, question: str, answer: str):
+        """Store an exchange."""
+        now = time.time()
+        if self._summary(user_id, channel_id) is None:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO conversations (user_id, channel_id, summary, updated) VALUES (?, ?, \'\', ?)',
+                (user_id, channel_id, now),
+            )
+        else:
+            self.conn.execute(
+                'UPDATE conversations SET updated = ? WHERE user_id = ? AND channel_id = ?',
+                (now, user_id, channel_id),
+            )
+        self.conn.executemany(
+            'INSERT INTO conversation_turns (user_id, channel_id, role, text, tokens) VALUES (?, ?, ?, ?, ?)',
+            [(user_id, channel_id, "user", question, estimate_tokens(question)),
+             (user_id, channel_id, "model", answer, estimate_tokens(answer))],
+        )
+        self.conn.commit()
+
+    def compact(self, user_id: int, channel_id: int, summary: str, through_id: int):
+        """Replace the summary and drop the turns it now covers.
+
+        Args:
+            user_id: Discord user id
+            channel_id: Discord channel id
+            summary: The new rolling summary
+            through_id: Id of the newest turn included in the summary
+        """
+        self.conn.execute(
+            'UPDATE conversations SET summary = ? WHERE user_id = ? AND channel_id = ?',
+            (summary, user_id, channel_id),
+        )
+        self.conn.execute(
+            'DELETE FROM conversation_turns WHERE user_id = ? AND channel_id = ? AND id <= ?',
+            (user_id, channel_id, through_id),
+        )
+        self.conn.commit()
+
+    def forget(self, user_id: int, channel_id: Optional[int] = None) -> int:
+        """Delete a user's conversation in one channel, or all of them.
+
+        Returns:
+            int: Number of conversations deleted
+        """
+        if channel_id is None:
+            where, params = 'user_id = ?', (user_id,)
+        else:
+            where, params = 'user_id = ? AND channel_id = ?', (user_id, channel_id)
+        self.conn.execute(f'DELETE FROM conversation_turns WHERE {where}', params)
+        deleted = self.conn.execute(f'DELETE FROM conversations WHERE {where}', params).rowcount
+        self.conn.commit()
+        return deleted
+
+    def purge_idle(self) -> int:
+        """Delete conversations that have been idle for longer than the timeout.
+
+        Returns:
+            int: Number of conversations deleted
+        """
+        cutoff = time.time() - self.idle_timeout
+        self.conn.execute(
+            'DELETE FROM conversation_turns WHERE (user_id, channel_id) IN '
+            '(SELECT user_id, channel_id FROM conversations WHERE updated < ?)',
+            (cutoff,),
+        )
+        deleted = self.conn.execute('DELETE FROM conversations WHERE updated < ?', (cutoff,)).rowcount
+        self.conn.commit()
+        return deleted
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,122 @@
+"""Deferred imports for heavy third-party modules.
+
+Cogs bind their heavy dependencies with ``lazy_import`` instead of a plain
+``import``, so loading the extensions (and registering their slash commands)
+no longer pays for yt_dlp, google-genai, openai, selenium and friends before
+the gateway connects. The real module is imported on first attribute access,
+or ahead of time by ``warm_up`` in a worker thread once the bot is ready.
+
+Example:
+    ```python
+    yt_dlp = lazy_import("yt_dlp")
+
+    with yt_dlp.YoutubeDL(opts) as ydl:  # yt_dlp is imported here
+        ...
+    ```
+"""
+
+import importlib
+import logging
+import threading
+import time
+from types import ModuleType
+from typing import Dict, List, Optional
+
+_registry: Dict[str, 'LazyModule'] = {}
+_registry_lock = threading.Lock()
+
+
+class LazyModule(ModuleType):
+    """Stand-in for a module that imports it on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_import_seconds'] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is not None:
+            return module
+        with self.__dict__['_lazy_lock']:
+            module = self.__dict__['_lazy_module']
+            if module is None:
+                start = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                self.__dict__['_lazy_import_seconds'] = time.perf_counter() - start
+                self.__dict__['_lazy_module'] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__['_lazy_module'] is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Get a lazy proxy for a module; the same proxy is returned for the same name.
+
+    Args:
+        name: Absolute module name, e.g. "google.genai.types"
+
+    Returns:
+        LazyModule: Proxy that imports the module on first use
+    """
+    with _registry_lock:
+        module = _registry.get(name)
+        if module is None:
+            module = _registry[name] = LazyModule(name)
+        return module
+
+
+def reload_module(module: LazyModule) -> ModuleType:
+    """importlib.reload() for a lazily bound module (importing it first if needed).
+
+    Args:
+        module: Proxy returned by lazy_import
+
+    Returns:
+        ModuleType: The reloaded module
+    """
+    reloaded = importlib.reload(module._load())
+    module.__dict__['_lazy_module'] = reloaded
+    return reloaded
+
+
+def pending() -> List[str]:
+    """Names of lazily bound modules that haven't been imported yet."""
+    with _registry_lock:
+        return [name for name, module in _registry.items() if not module.loaded]
+
+
+def warm_up(names: Optional[List[str]] = None) -> Dict[str, float]:
+    """Import lazily bound modules now. Blocking; run it in a thread.
+
+    Args:
+        names: Modules to import, defaults to every pending one
+
+    Returns:
+        Dict[str, float]: Import time in seconds per module that got imported
+    """
+    logger = logging.getLogger('bot.py')
+    timings = {}
+    for name in names if names is not None else pending():
+        module = lazy_import(name)
+        if module.loaded:
+            continue
+        try:
+            module._load()
+            timings[name] = module.__dict__['_lazy_import_seconds']
+        except Exception as e:
+            logger.error(f"Failed to warm up module {name}: {e}")
+    return timings
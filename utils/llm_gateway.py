@@ -0,0 +1,307 @@
+"""Shared async access to the LLM providers used by the AI cogs.
+
+The bot owns one ``LLMGateway`` (``bot.llm``). It keeps a single async client
+per provider, so HTTP connections are pooled and kept alive between commands
+instead of being set up for every request. Every call goes through the gateway,
+which adds:
+
+- a concurrency limit per provider, so a burst of commands queues up instead
+  of tripping the provider's rate limits,
+- a timeout per attempt, and retries with exponential backoff and full jitter
+  for rate limits, 5xx responses, timeouts and connection errors,
+- an optional deadline (see ``interaction_deadline``), after which the request
+  is cancelled because Discord no longer accepts the answer anyway.
+
+Example:
+    ```python
+    response = await bot.llm.run(
+        "perplexity",
+        lambda client: client.chat.completions.create(model="sonar", messages=messages),
+        deadline=interaction_deadline(ctx),
+    )
+    ```
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+from utils.lazy_import import lazy_import
+
+openai = lazy_import("openai")
+httpx = lazy_import("httpx")
+genai = lazy_import("google.genai")
+genai_types = lazy_import("google.genai.types")
+
+T = TypeVar("T")
+
+# Interaction tokens (responses, edits and follow-ups) are valid for 15 minutes.
+INTERACTION_LIFETIME = 15 * 60
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request couldn't finish before its deadline."""
+
+
+@dataclass
+class Provider:
+    """Settings for one provider.
+
+    Attributes:
+        name: "openai", "perplexity" or "gemini"
+        concurrency: Maximum requests in flight at the same time
+        timeout: Seconds per attempt (for streams: maximum wait for the next chunk)
+        max_retries: Retries after the first attempt for transient errors
+    """
+    name: str
+    concurrency: int
+    timeout: float
+    max_retries: int
+
+    @classmethod
+    def from_env(cls, name: str, concurrency: int, timeout: float) -> 'Provider':
+        prefix = f"LLM_{name.upper()}"
+        return cls(
+            name=name,
+            concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+            timeout=float(os.getenv(f"{prefix}_TIMEOUT", str(timeout))),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+        )
+
+
+def interaction_deadline(ctx, margin: float = 5.0) -> float:
+    """Deadline (on the time.monotonic() clock) after which an interaction can't be answered anymore.
+
+    Args:
+        ctx: Application context of the command
+        margin: Seconds to keep for sending the answer
+
+    Returns:
+        float: The deadline
+    """
+    age = (datetime.now(timezone.utc) - ctx.interaction.created_at).total_seconds()
+    return time.monotonic() + INTERACTION_LIFETIME - age - margin
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    if isinstance(status, int):
+        return status in (408, 409, 429) or status >= 500
+    # openai.APIConnectionError / APITimeoutError and httpx transport errors carry no status
+    return type(exc).__name__ in ("APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout", "RemoteProtocolError")
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMGateway:
+    """Pooled async clients plus concurrency limits, timeouts and retries for every provider."""
+
+    def __init__(self):
+        self.logger = logging.getLogger('bot.py')
+        self.providers: Dict[str, Provider] = {
+            "openai": Provider.from_env("openai", concurrency=4, timeout=60),
+            "perplexity": Provider.from_env("perplexity", concurrency=4, timeout=300),
+            "gemini": Provider.from_env("gemini", concurrency=4, timeout=120),
+        }
+        self._semaphores = {name: asyncio.Semaphore(p.concurrency) for name, p in self.providers.items()}
+        self._clients: Dict[str, Any] = {}
+        self.backoff_base = 1.0
+        self.backoff_cap = 20.0
+
+    def _http_client(self, provider: Provider):
+        # Keep idle connections around between commands; the default expiry (5s) is far shorter than the gaps.
+        return openai.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_connections=provider.concurrency * 2,
+                                max_keepalive_connections=provider.concurrency,
+                                keepalive_expiry=120),
+        )
+
+    def client(self, name: str):
+        """The shared async client for a provider, created on first use.
+
+        Args:
+            name: Provider name
+
+        Returns:
+            openai.AsyncOpenAI for "openai"/"perplexity", the genai client's ``aio`` namespace for "gemini"
+        """
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        provider = self.providers[name]
+        if name == "openai":
+            client = openai.AsyncOpenAI(api_key=os.getenv('OPENAI_TOKEN'), max_retries=0,
+                                        timeout=provider.timeout, http_client=self._http_client(provider))
+        elif name == "perplexity":
+            client = openai.AsyncOpenAI(api_key=os.getenv('PPLX_TOKEN'), base_url="https://api.perplexity.ai",
+                                        max_retries=0, timeout=provider.timeout, http_client=self._http_client(provider))
+        elif name == "gemini":
+            client = genai.Client(
+                api_key=os.getenv("GOOGLE_AI_API_KEY"),
+                http_options=genai_types.HttpOptions(timeout=int(provider.timeout * 1000)),
+            ).aio
+        else:
+            raise KeyError(f"Unknown LLM provider: {name}")
+        self._clients[name] = client
+        return client
+
+    def _remaining(self, deadline: Optional[float]) -> Optional[float]:
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded("The request ran past the interaction's deadline.")
+        return remaining
+
+    def _limit(self, provider: Provider, deadline: Optional[float]) -> float:
+        remaining = self._remaining(deadline)
+        return provider.timeout if remaining is None else min(provider.timeout, remaining)
+
+    def _check_deadline(self, exc: BaseException, deadline: Optional[float]):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise DeadlineExceeded("The request ran past the interaction's deadline.") from exc
+
+    async def _acquire(self, name: str, deadline: Optional[float]):
+        try:
+            await asyncio.wait_for(self._semaphores[name].acquire(), self._remaining(deadline))
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Timed out waiting for a free {name} slot.") from None
+
+    async def _backoff(self, provider: Provider, attempt: int, exc: BaseException, deadline: Optional[float]):
+        self._check_deadline(exc, deadline)
+        delay = _retry_after(exc)
+        if delay is None:
+            delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            raise exc
+        self.logger.warning(f"{provider.name} request failed ({type(exc).__name__}: {exc}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    async def run(self, name: str, request: Callable[[Any], Awaitable[T]], deadline: Optional[float] = None) -> T:
+        """Make one request through the gateway.
+
+        Args:
+            name: Provider name
+            request: Called with the provider's client, returns the request's awaitable. It may be
+                called again for a retry, so it must not have side effects of its own.
+            deadline: time.monotonic() value after which the request is cancelled
+
+        Returns:
+            Whatever the request returns
+
+        Raises:
+            DeadlineExceeded: If the deadline passed before the request finished
+        """
+        provider = self.providers[name]
+        client = self.client(name)
+        await self._acquire(name, deadline)
+        try:
+            for attempt in range(provider.max_retries + 1):
+                try:
+                    return await asyncio.wait_for(request(client), self._limit(provider, deadline))
+                except Exception as e:
+                    if attempt == provider.max_retries or not _is_retryable(e):
+                        self._check_deadline(e, deadline)
+                        raise
+                    await self._backoff(provider, attempt, e, deadline)
+        finally:
+            self._semaphores[name].release()
+
+    async def stream(self, name: str, request: Callable[[Any], Awaitable[AsyncIterator[T]]],
+                     deadline: Optional[float] = None, retry: bool = True) -> AsyncIterator[T]:
+        """Make a streaming request through the gateway.
+
+        Opening the stream is retried like ``run``; once the first chunk has arrived the
+        stream is not restarted. The provider slot and the HTTP response are held until the
+        stream is exhausted or closed, so consumers that may stop early should iterate it
+        inside ``contextlib.aclosing``.
+
+        Args:
+            name: Provider name
+            request: Called with the provider's client, returns an awaitable that resolves to an async iterator
+            deadline: time.monotonic() value after which the stream is cancelled
+            retry: Whether opening the stream may be retried. Pass False for requests that change
+                state at the provider (e.g. adding a message), where a retry could apply it twice.
+
+        Yields:
+            The stream's chunks
+        """
+        provider = self.providers[name]
+        client = self.client(name)
+        stream = None
+        max_retries = provider.max_retries if retry else 0
+        await self._acquire(name, deadline)
+        try:
+            for attempt in range(max_retries + 1):
+                try:
+                    stream = await asyncio.wait_for(request(client), self._limit(provider, deadline))
+                    iterator = stream.__aiter__()
+                    first = await asyncio.wait_for(iterator.__anext__(), self._limit(provider, deadline))
+                    break
+                except StopAsyncIteration:
+                    return
+                except Exception as e:
+                    # Release the failed attempt's HTTP response before opening a new one.
+                    await self._close_stream(name, stream)
+                    stream = None
+                    if attempt == max_retries or not _is_retryable(e):
+                        self._check_deadline(e, deadline)
+                        raise
+                    await self._backoff(provider, attempt, e, deadline)
+            yield first
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(iterator.__anext__(), self._limit(provider, deadline))
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError as e:
+                    self._check_deadline(e, deadline)
+                    raise
+                yield chunk
+        finally:
+            # Also reached when the caller stops early; an exhausted stream closes without effect.
+            await self._close_stream(name, stream)
+            self._semaphores[name].release()
+
+    async def _close_stream(self, name: str, stream):
+        if stream is None:
+            return
+        # Async generators (Gemini) have aclose(), openai's AsyncStream has an async close().
+        close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+        if close is None:
+            return
+        try:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            self.logger.debug(f"Error closing {name} stream: {e}")
+
+    async def close(self):
+        """Close the pooled HTTP connections."""
+        for name, client in self._clients.items():
+            close = getattr(client, "close", None) or getattr(client, "aclose", None)
+            if close is None:
+                continue
+            try:
+                await close()
+            except Exception as e:
+                self.logger.error(f"Error closing {name} client: {e}")
+        self._clients.clear()
@@ -0,0 +1,161 @@
+"""Event loop health: scheduling lag sampling and blocking-call detection.
+
+A sampler task sleeps for a fixed interval and measures how late it wakes up,
+which is the time the loop spent running other callbacks. A watchdog thread
+checks the sampler's heartbeat; when the loop hasn't come back for longer
+than the stall threshold it captures the loop thread's current stack with
+``sys._current_frames()``, so the blocking call is caught while it is still
+running. Stalls are attributed to the innermost frame inside ``cogs/`` (the
+cog and command that made the blocking call), falling back to ``utils/`` and
+then to the innermost frame.
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ATTRIBUTION_DIRS = (os.path.join(_ROOT, 'cogs') + os.sep, os.path.join(_ROOT, 'utils') + os.sep)
+
+
+@dataclass
+class Stall:
+    """One period the event loop was blocked for longer than the threshold.
+
+    Attributes:
+        started: Unix timestamp of the last heartbeat before the stall
+        duration: Seconds the loop was blocked (updated once it recovers)
+        site: "cogs/file.py:function" the stall is attributed to
+        stack: Formatted stack of the loop thread when the stall was detected
+    """
+    started: float
+    duration: float
+    site: str
+    stack: List[str] = field(default_factory=list)
+
+
+def _attribute(frames: List[traceback.FrameSummary]) -> str:
+    for prefix in _ATTRIBUTION_DIRS:
+        for frame in reversed(frames):
+            if frame.filename.startswith(prefix) and not frame.filename.endswith('loop_monitor.py'):
+                return f"{os.path.relpath(frame.filename, _ROOT)}:{frame.name}"
+    if frames:
+        frame = frames[-1]
+        return f"{os.path.basename(frame.filename)}:{frame.name}"
+    return "unknown"
+
+
+class LoopMonitor:
+    """Samples event loop lag and reports blocking calls."""
+
+    def __init__(self, interval: float = 0.25, stall_threshold: float = 0.25,
+                 window: int = 2400, max_stalls: int = 100):
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between lag samples
+            stall_threshold: Seconds the loop may be blocked before the stack is captured
+            window: Number of lag samples to keep for the statistics (2400 = 10 minutes)
+            max_stalls: Number of recent stalls to keep
+        """
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.logger = logging.getLogger('bot.py')
+        self.lags: Deque[float] = deque(maxlen=window)
+        self.stalls: Deque[Stall] = deque(maxlen=max_stalls)
+        self.sites: Dict[str, Tuple[int, float]] = {}  # site -> (count, total seconds)
+        self._heartbeat = time.monotonic()
+        self._heartbeat_wall = time.time()
+        self._loop_thread_id: Optional[int] = None
+        self._current_stall: Optional[Stall] = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start sampling; must be called from the event loop's thread."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        # A fresh event per watchdog: one left over from before a stop() still sees its own
+        # event set and exits, instead of being revived next to the new one.
+        self._stop = threading.Event()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, args=(self._stop,), name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - before - self.interval)
+            self.lags.append(lag)
+            with self._lock:
+                self._heartbeat = time.monotonic()
+                self._heartbeat_wall = time.time()
+                stall, self._current_stall = self._current_stall, None
+            if stall is not None:
+                stall.duration = lag
+                count, total = self.sites.get(stall.site, (0, 0.0))
+                self.sites[stall.site] = (count + 1, total + lag)
+                self.logger.warning(
+                    f"Event loop was blocked for {lag * 1000:.0f}ms by {stall.site}:\n" + "".join(stall.stack)
+                )
+
+    def _watch(self, stop: threading.Event):
+        while not stop.wait(self.stall_threshold / 2):
+            with self._lock:
+                if stop.is_set():
+                    return
+                blocked_for = time.monotonic() - self._heartbeat - self.interval
+                if blocked_for < self.stall_threshold or self._current_stall is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                frames = traceback.extract_stack(frame)
+                stall = Stall(self._heartbeat_wall, blocked_for, _attribute(frames), traceback.format_list(frames[-8:]))
+                self._current_stall = stall
+                self.stalls.append(stall)
+
+    def summary(self) -> Dict[str, float]:
+        """Lag statistics over the sample window, in milliseconds."""
+        if not self.lags:
+            return {"samples": 0}
+        lags = sorted(self.lags)
+        return {
+            "samples": len(lags),
+            "p50": statistics.median(lags) * 1000,
+            "p99": lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000,
+            "max": lags[-1] * 1000,
+        }
+
+    def top_sites(self, limit: int = 3) -> List[Tuple[str, int, float]]:
+        """Sites that blocked the loop the longest in total.
+
+        Returns:
+            List of (site, stall count, total seconds blocked)
+        """
+        ranked = sorted(self.sites.items(), key=lambda item: item[1][1], reverse=True)
+        return [(site, count, total) for site, (count, total) in ranked[:limit]]
@@ -0,0 +1,401 @@
+"""Native asyncio implementation of the Minecraft RCON protocol.
+
+A packet on the wire is ``<length:int32><request_id:int32><type:int32><payload>\\0\\0``
+(little endian). Responses longer than 4096 bytes arrive split across several
+packets with the same request id and no end marker, so every command is
+followed by a sentinel packet of an unknown type: the server answers requests
+in order, so once the sentinel's reply arrives every fragment of the command's
+response has been received.
+
+The vanilla server drops the connection when a single read contains more than
+one packet (MC-72390), so requests on a connection are strictly sequential:
+every packet goes out in its own write, and the sentinel is only sent once the
+first fragment of the command's response has arrived, i.e. after the server
+has read the command.
+
+Example:
+    ```python
+    pool = RconPool("localhost", 25575, "password")
+    print(await pool.execute("list"))
+    await pool.close()
+    ```
+"""
+
+import asyncio
+import itertools
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+
+PACKET_RESPONSE = 0
+PACKET_COMMAND = 2
+PACKET_LOGIN = 3
+
+_HEADER = struct.Struct('<iii')
+
+
+class RconError(Exception):
+    """Base class for RCON failures."""
+
+
+class RconAuthError(RconError):
+    """The server rejected the RCON password."""
+
+
+class RconSendError(RconError, ConnectionError):
+    """A request couldn't be written to the connection, so the server never received it."""
+
+
+class RconTimeout(RconError, ConnectionError):
+    """A command was sent but its response didn't arrive in time; it may still have run."""
+
+
+def _encode_packet(request_id: int, packet_type: int, payload: str) -> bytes:
+    body = payload.encode('utf-8') + b'\x00\x00'
+    return _HEADER.pack(_HEADER.size - 4 + len(body), request_id, packet_type) + body
+
+
+class _Request:
+    """Response fragments of one request, plus futures for its first fragment and its completion."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.parts: List[bytes] = []
+        self.first = loop.create_future()
+        self.done = loop.create_future()
+
+    def fail(self, error: Exception):
+        for future in (self.first, self.done):
+            if not future.done():
+                future.set_exception(error)
+                # Retrieve it here, so an unawaited future doesn't log "exception was never retrieved".
+                future.exception()
+
+
+class RconConnection:
+    """A single authenticated RCON connection.
+
+    Requests are sent one at a time; concurrent callers wait their turn. A
+    background reader task collects the response fragments.
+    """
+
+    def __init__(self, host: str, port: int, password: str, timeout: float = 5.0):
+        """Initialize the connection settings.
+
+        Args:
+            host: Server host name or IP address
+            port: RCON port
+            password: RCON password
+            timeout: Seconds to wait for connect, login and each response
+        """
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.last_used = time.monotonic()
+        self._ids = itertools.cycle(range(1, 2 ** 31 - 1))
+        self._pending: Dict[int, _Request] = {}
+        self._sentinels: Dict[int, int] = {}
+        self._lock = asyncio.Lock()
+        self._users = 0
+        self._reader_task: Optional[asyncio.Task] = None
+        self._closed = True
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def in_flight(self) -> int:
+        """Requests running or waiting for their turn on this connection."""
+        return self._users
+
+    async def _read_packet(self) -> Tuple[int, int, bytes]:
+        (length,) = struct.unpack('<i', await self.reader.readexactly(4))
+        data = await self.reader.readexactly(length)
+        request_id, packet_type = struct.unpack_from('<ii', data)
+        return request_id, packet_type, data[8:-2]
+
+    async def connect(self):
+        """Open the socket and authenticate.
+
+        Raises:
+            RconAuthError: If the password is rejected
+            OSError: If the server can't be reached
+        """
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        login_id = next(self._ids)
+        self.writer.write(_encode_packet(login_id, PACKET_LOGIN, self.password))
+        await self.writer.drain()
+        request_id, _, _ = await asyncio.wait_for(self._read_packet(), self.timeout)
+        if request_id == -1:
+            self.writer.close()
+            raise RconAuthError("RCON authentication failed: wrong password")
+        self._closed = False
+        self.last_used = time.monotonic()
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self):
+        error: Exception = ConnectionError("RCON connection closed")
+        try:
+            while True:
+                request_id, _, payload = await self._read_packet()
+                request = self._pending.get(request_id)
+                if request is not None:
+                    request.parts.append(payload)
+                    if not request.first.done():
+                        request.first.set_result(None)
+                    continue
+                command_id = self._sentinels.pop(request_id, None)
+                if command_id is None:
+                    continue
+                request = self._pending.pop(command_id, None)
+                if request is not None and not request.done.done():
+                    request.done.set_result(b''.join(request.parts).decode('utf-8', errors='replace'))
+        except asyncio.CancelledError:
+            raise
+        except (asyncio.IncompleteReadError, OSError) as e:
+            error = ConnectionError(f"RCON connection lost: {e}")
+        finally:
+            self._fail_pending(error)
+            await self.close()
+
+    def _fail_pending(self, error: Exception):
+        for request in self._pending.values():
+            request.fail(error)
+        self._pending.clear()
+        self._sentinels.clear()
+
+    async def _send(self, request_id: int, packet_type: int, payload: str):
+        if self._closed:
+            raise RconSendError("RCON connection is closed")
+        try:
+            self.writer.write(_encode_packet(request_id, packet_type, payload))
+            await self.writer.drain()
+        except OSError as e:
+            await self.close()
+            raise RconSendError(f"RCON write failed: {e}") from e
+
+    async def _wait(self, future: asyncio.Future, what: str):
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            # The stream may now be out of step with our bookkeeping; start over.
+            await self.close()
+            raise RconTimeout(f"RCON timed out waiting for the response to: {what}") from None
+
+    async def _execute(self, command: str, packet_type: int) -> str:
+        command_id = next(self._ids)
+        request = _Request(asyncio.get_running_loop())
+        self._pending[command_id] = request
+        try:
+            await self._send(command_id, packet_type, command)
+            if packet_type != PACKET_COMMAND:
+                # Non-command packets are answered with exactly one packet; no sentinel needed.
+                await self._wait(request.first, command or "ping")
+                return b''.join(request.parts).decode('utf-8', errors='replace')
+            # Only send the sentinel once the server has read the command (see the module docstring).
+            await self._wait(request.first, command)
+            sentinel_id = next(self._ids)
+            self._sentinels[sentinel_id] = command_id
+            try:
+                await self._send(sentinel_id, PACKET_RESPONSE, '')
+            except RconSendError as e:
+                # The command itself already went out, so this must not look retryable.
+                raise ConnectionError(f"RCON connection lost after sending: {command}") from e
+            return await self._wait(request.done, command)
+        finally:
+            self._pending.pop(command_id, None)
+            self._sentinels = {s: c for s, c in self._sentinels.items() if c != command_id}
+
+    async def execute(self, command: str, packet_type: int = PACKET_COMMAND) -> str:
+        """Send a command and wait for its complete response.
+
+        Args:
+            command: Command to run, without a leading slash
+            packet_type: Packet type to send; PACKET_RESPONSE makes a cheap no-op
+
+        Returns:
+            The full (reassembled) response text
+        """
+        return (await self.execute_many([command], packet_type))[0]
+
+    async def execute_many(self, commands: List[str], packet_type: int = PACKET_COMMAND) -> List[str]:
+        """Run several commands back to back, without other requests on this connection in between.
+
+        Args:
+            commands: Commands to run, without leading slashes
+            packet_type: Packet type to send for every command
+
+        Returns:
+            The responses, in the same order as ``commands``
+        """
+        self._users += 1
+        try:
+            async with self._lock:
+                responses = []
+                for command in commands:
+                    self.last_used = time.monotonic()
+                    responses.append(await self._execute(command, packet_type))
+                return responses
+        finally:
+            self._users -= 1
+            self.last_used = time.monotonic()
+
+    async def ping(self):
+        """Round-trip a no-op packet to keep the connection alive."""
+        await self.execute('', packet_type=PACKET_RESPONSE)
+
+    async def close(self):
+        if self._closed and self.writer is None:
+            return
+        self._closed = True
+        if self._reader_task is not None and self._reader_task is not asyncio.current_task():
+            self._reader_task.cancel()
+        self._fail_pending(ConnectionError("RCON connection closed"))
+        if self.writer is not None:
+            writer, self.writer = self.writer, None
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (OSError, asyncio.CancelledError):
+                pass
+
+
+class RconPool:
+    """A small pool of persistent, authenticated RCON connections.
+
+    Connections are opened lazily, reused across commands, kept alive with
+    periodic no-op packets and transparently re-established when they drop.
+    """
+
+    def __init__(self, host: str, port: int, password: str, size: int = 2, timeout: float = 5.0,
+                 keepalive_interval: float = 60.0, max_retries: int = 3):
+        """Initialize the pool.
+
+        Args:
+            host: Server host name or IP address
+            port: RCON port
+            password: RCON password
+            size: Maximum number of open connections
+            timeout: Per-connection connect/response timeout in seconds
+            keepalive_interval: Seconds of idleness before a connection is pinged
+            max_retries: Connection attempts before giving up
+        """
+        self.host = host
+        self.port = port
+        self.password = password
+        self.size = size
+        self.timeout = timeout
+        self.keepalive_interval = keepalive_interval
+        self.max_retries = max_retries
+        self._connections: List[RconConnection] = []
+        self._lock = asyncio.Lock()
+        self._keepalive_task: Optional[asyncio.Task] = None
+
+    async def _open(self) -> RconConnection:
+        last_error: Exception = ConnectionError("RCON connection failed")
+        for attempt in range(self.max_retries):
+            connection = RconConnection(self.host, self.port, self.password, self.timeout)
+            try:
+                await connection.connect()
+                return connection
+            except RconAuthError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                last_error = e
+            if attempt < self.max_retries - 1:
+                await asyncio.sleep(1)
+        raise ConnectionError(f"Could not connect to {self.host}:{self.port}: {last_error}")
+
+    async def _acquire(self) -> RconConnection:
+        async with self._lock:
+            self._connections = [c for c in self._connections if not c.closed]
+            idle = [c for c in self._connections if c.in_flight == 0]
+            if idle:
+                return idle[0]
+            if len(self._connections) < self.size:
+                connection = await self._open()
+                self._connections.append(connection)
+                if self._keepalive_task is None or self._keepalive_task.done():
+                    self._keepalive_task = asyncio.create_task(self._keepalive())
+                return connection
+            return min(self._connections, key=lambda c: c.in_flight)
+
+    async def execute(self, command: str) -> str:
+        """Run a command on a pooled connection, reconnecting once if it dropped.
+
+        The command is only sent again if it never reached the server (a stale
+        connection or a failed write). Once it has been written, a timeout or a
+        dropped connection is raised instead, since the command may have run.
+
+        Args:
+            command: Command to run, without a leading slash
+
+        Returns:
+            The server response
+
+        Raises:
+            RconTimeout: If the command was sent but its response didn't arrive in time
+            ConnectionError: If the server couldn't be reached, or the connection dropped after the command was sent
+        """
+        for attempt in range(2):
+            connection = await self._acquire()
+            try:
+                return await connection.execute(command)
+            except RconSendError:
+                await connection.close()
+                if attempt:
+                    raise
+            except ConnectionError:
+                await connection.close()
+                raise
+        raise ConnectionError("unreachable")
+
+    async def execute_many(self, commands: List[str]) -> List[str]:
+        """Run several commands back to back over one pooled connection.
+
+        Unlike execute(), a failed batch is not retried, since some of its
+        commands may already have run.
+
+        Args:
+            commands: Commands to run, without leading slashes
+
+        Returns:
+            The responses, in the same order as ``commands``
+        """
+        connection = await self._acquire()
+        try:
+            return await connection.execute_many(commands)
+        except ConnectionError:
+            await connection.close()
+            raise
+
+    async def warm(self):
+        """Make sure at least one authenticated connection is open."""
+        await self._acquire()
+
+    async def _keepalive(self):
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            now = time.monotonic()
+            for connection in list(self._connections):
+                if connection.closed or connection.in_flight:
+                    continue
+                if now - connection.last_used >= self.keepalive_interval:
+                    try:
+                        await connection.ping()
+                    except (ConnectionError, OSError):
+                        await connection.close()
+
+    async def close(self):
+        """Close every connection and stop the keepalive task."""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        connections, self._connections = self._connections, []
+        for connection in connections:
+            await connection.close()
@@ -0,0 +1,119 @@
+"""Batched execution of Minecraft RCON commands.
+
+A batch exposes the same typed command categories as ``Minecraft``, but each
+call only queues its command and returns a future. Running the batch sends
+the queued commands one after another over one held RCON connection, so an
+admin macro runs without other commands interleaved and needs a single
+connection checkout instead of one per command.
+
+Example:
+    ```python
+    async with mc.batch() as batch:
+        batch.world.worldborder_center(0, 0)
+        batch.world.worldborder_set(2000)
+        batch.world.weather("clear")
+        batch.game.gamerule("doDaylightCycle", False)
+    print(batch.responses)
+    ```
+"""
+
+import asyncio
+from typing import List, Tuple
+from .minecraft import Minecraft
+from .minecraft_rcon import MinecraftRCON
+
+
+class CommandQueue:
+    """Stands in for MinecraftRCON while a batch is being built."""
+
+    def __init__(self, rcon: MinecraftRCON):
+        """Initialize the queue.
+
+        Args:
+            rcon: Connection the queued commands are eventually sent over
+        """
+        self.target = rcon
+        self.status_sampler = rcon.status_sampler
+        self.player_state = rcon.player_state
+        self.player_names = rcon.player_names
+        self.pending: List[Tuple[str, asyncio.Future]] = []
+
+    def send_command(self, command: str) -> asyncio.Future:
+        """Queue a command.
+
+        Args:
+            command: Command to queue
+
+        Returns:
+            Future resolving to the server response once the batch has run
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((command, future))
+        return future
+
+    async def flush(self) -> List[str]:
+        """Send all queued commands back to back and resolve their futures.
+
+        Returns:
+            The server responses in queue order
+        """
+        pending, self.pending = self.pending, []
+        responses = await self.target.send_commands([command for command, _ in pending])
+        for (_, future), response in zip(pending, responses):
+            if not future.done():
+                future.set_result(response)
+        return responses
+
+    def cancel(self):
+        """Drop all queued commands without sending them."""
+        for _, future in self.pending:
+            future.cancel()
+        self.pending = []
+
+    async def connect(self) -> bool:
+        return await self.target.connect()
+
+    async def disconnect(self):
+        """No-op: the batch doesn't own the connection pool."""
+
+
+class CommandBatch(Minecraft):
+    """Queue typed command calls and send them back to back over one RCON session.
+
+    Attributes:
+        rcon (CommandQueue): Queue collecting the commands of this batch
+        responses (List[str]): Responses of every command run so far, in order
+    """
+
+    def __init__(self, rcon: MinecraftRCON):
+        """Initialize the batch.
+
+        Args:
+            rcon: Connection to send the batch over
+        """
+        self._bind(CommandQueue(rcon))
+        self.responses: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.rcon.pending)
+
+    async def run(self) -> List[str]:
+        """Send the queued commands.
+
+        Returns:
+            The responses of the commands sent by this call, in queue order
+        """
+        responses = await self.rcon.flush()
+        self.responses.extend(responses)
+        return responses
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Run the batch, or discard it if the block raised."""
+        if exc_type is None:
+            await self.run()
+        else:
+            self.rcon.cancel()
+
+    def batch(self) -> 'CommandBatch':
+        """Nested batches keep queueing onto this one."""
+        return self
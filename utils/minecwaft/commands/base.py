@@ -1,22 +1,54 @@
 """Base command handler for Minecraft RCON commands."""
 
-from typing import Optional, Any
+import asyncio
+from typing import Awaitable, Callable, Optional, Any, TypeVar
 from ...minecwaft.minecraft_rcon import MinecraftRCON
 
+T = TypeVar('T')
+
+
+async def _parse_when_done(response: Awaitable[str], parser: Callable[[str], T]) -> T:
+    return parser(await response)
+
+
+def _chain_future(future: asyncio.Future, parser: Callable[[str], T]) -> asyncio.Future:
+    """Future resolving to the parsed result of ``future`` (used for batched commands)."""
+    parsed = future.get_loop().create_future()
+
+    def done(source: asyncio.Future):
+        if parsed.done():
+            return
+        if source.cancelled():
+            parsed.cancel()
+        elif source.exception() is not None:
+            parsed.set_exception(source.exception())
+        else:
+            parsed.set_result(parser(source.result()))
+
+    future.add_done_callback(done)
+    return parsed
+
 class BaseCommand:
     def __init__(self, rcon: MinecraftRCON):
         self.rcon = rcon
 
-    def execute(self, command: str) -> str:
+    def execute(self, command: str, parser: Optional[Callable[[str], T]] = None) -> Awaitable[Any]:
         """Execute a raw command through RCON.
         
         Args:
             command: The command to execute
+            parser: Optional function from .parsers turning the response into a typed result
             
         Returns:
-            The command response from the server
+            Awaitable resolving to the command response from the server,
+            or to the parsed result if a parser was given
         """
-        return self.rcon.send_command(command)
+        response = self.rcon.send_command(command)
+        if parser is None:
+            return response
+        if isinstance(response, asyncio.Future):
+            return _chain_future(response, parser)
+        return _parse_when_done(response, parser)
 
     def _format_target(self, target: Optional[str]) -> str:
         """Format target argument if provided.
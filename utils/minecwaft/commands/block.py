@@ -1,11 +1,11 @@
 """Block management commands for Minecraft RCON."""
 
-from typing import Optional, Literal, Union
+from typing import Awaitable, Optional, Literal, Union
 from .base import BaseCommand
 
 class BlockCommands(BaseCommand):
     def setblock(self, x: float, y: float, z: float, block: str, 
-                mode: Literal['destroy', 'keep', 'replace'] = 'replace') -> str:
+                mode: Literal['destroy', 'keep', 'replace'] = 'replace') -> Awaitable[str]:
         """Set a block at position.
         
         Args:
@@ -21,7 +21,7 @@ class BlockCommands(BaseCommand):
              x2: float, y2: float, z2: float,
              block: str,
              mode: Literal['replace', 'keep', 'outline', 'hollow', 'destroy'] = 'replace',
-             replace_block: Optional[str] = None) -> str:
+             replace_block: Optional[str] = None) -> Awaitable[str]:
         """Fill a region with blocks.
         
         Args:
@@ -41,7 +41,7 @@ class BlockCommands(BaseCommand):
               x: float, y: float, z: float,
               mode: Literal['normal', 'force', 'move'] = 'normal',
               mask_mode: Literal['replace', 'masked', 'filtered'] = 'replace',
-              filter_block: Optional[str] = None) -> str:
+              filter_block: Optional[str] = None) -> Awaitable[str]:
         """Clone a region of blocks.
         
         Args:
@@ -61,7 +61,7 @@ class BlockCommands(BaseCommand):
     def fillbiome(self, x1: float, y1: float, z1: float,
                  x2: float, y2: float, z2: float,
                  biome: str,
-                 replace: bool = False) -> str:
+                 replace: bool = False) -> Awaitable[str]:
         """Fill a region with a biome.
         
         Args:
@@ -77,7 +77,7 @@ class BlockCommands(BaseCommand):
 
     def forceload_add(self, x1: float, z1: float, 
                      x2: Optional[float] = None, 
-                     z2: Optional[float] = None) -> str:
+                     z2: Optional[float] = None) -> Awaitable[str]:
         """Force chunks to stay loaded.
         
         Args:
@@ -91,7 +91,7 @@ class BlockCommands(BaseCommand):
 
     def forceload_remove(self, x1: float, z1: float,
                         x2: Optional[float] = None,
-                        z2: Optional[float] = None) -> str:
+                        z2: Optional[float] = None) -> Awaitable[str]:
         """Allow chunks to unload.
         
         Args:
@@ -103,11 +103,11 @@ class BlockCommands(BaseCommand):
             command += f" {x2} {z2}"
         return self.execute(command)
 
-    def forceload_remove_all(self) -> str:
+    def forceload_remove_all(self) -> Awaitable[str]:
         """Allow all chunks to unload."""
         return self.execute("forceload remove all")
 
-    def forceload_query(self, x: Optional[float] = None, z: Optional[float] = None) -> str:
+    def forceload_query(self, x: Optional[float] = None, z: Optional[float] = None) -> Awaitable[str]:
         """Query forced chunks.
         
         Args:
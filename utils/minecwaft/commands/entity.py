@@ -1,10 +1,11 @@
 """Entity management commands for Minecraft RCON."""
 
-from typing import Optional, Union, Literal
+from typing import Awaitable, Optional, Union, Literal
 from .base import BaseCommand
+from ..parsers import DataResult, parse_data_get
 
 class EntityCommands(BaseCommand):
-    def kill(self, target: Optional[str] = None) -> str:
+    def kill(self, target: Optional[str] = None) -> Awaitable[str]:
         """Kill entities.
         
         Args:
@@ -17,7 +18,7 @@ class EntityCommands(BaseCommand):
 
     def summon(self, entity: str, x: Optional[float] = None, 
                y: Optional[float] = None, z: Optional[float] = None, 
-               nbt: Optional[str] = None) -> str:
+               nbt: Optional[str] = None) -> Awaitable[str]:
         """Summon an entity.
         
         Args:
@@ -34,7 +35,7 @@ class EntityCommands(BaseCommand):
             command += f" {nbt}"
         return self.execute(command)
 
-    def tp(self, target: str, destination: Union[str, tuple[float, float, float]]) -> str:
+    def tp(self, target: str, destination: Union[str, tuple[float, float, float]]) -> Awaitable[str]:
         """Teleport entities.
         
         Args:
@@ -49,14 +50,14 @@ class EntityCommands(BaseCommand):
             command += f" {destination}"
         return self.execute(command)
 
-    def teleport(self, target: str, destination: Union[str, tuple[float, float, float]]) -> str:
+    def teleport(self, target: str, destination: Union[str, tuple[float, float, float]]) -> Awaitable[str]:
         """Alias for tp command."""
         return self.tp(target, destination)
 
     def effect_give(self, target: str, effect: str, 
                    duration: Optional[int] = None,
                    amplifier: Optional[int] = None,
-                   hide_particles: bool = False) -> str:
+                   hide_particles: bool = False) -> Awaitable[str]:
         """Give an effect to entities.
         
         Args:
@@ -75,7 +76,7 @@ class EntityCommands(BaseCommand):
                     command += " true"
         return self.execute(command)
 
-    def effect_clear(self, target: str, effect: Optional[str] = None) -> str:
+    def effect_clear(self, target: str, effect: Optional[str] = None) -> Awaitable[str]:
         """Clear effects from entities.
         
         Args:
@@ -88,7 +89,7 @@ class EntityCommands(BaseCommand):
         return self.execute(command)
 
     def attribute(self, target: str, attribute: str, 
-                 operation: Literal['get', 'base', 'modifier']) -> str:
+                 operation: Literal['get', 'base', 'modifier']) -> Awaitable[str]:
         """Get or modify entity attributes.
         
         Args:
@@ -98,7 +99,7 @@ class EntityCommands(BaseCommand):
         """
         return self.execute(f"attribute {target} {attribute} {operation}")
 
-    def damage(self, target: str, amount: float, damage_type: Optional[str] = None) -> str:
+    def damage(self, target: str, amount: float, damage_type: Optional[str] = None) -> Awaitable[str]:
         """Damage entities.
         
         Args:
@@ -111,7 +112,7 @@ class EntityCommands(BaseCommand):
             command += f" {damage_type}"
         return self.execute(command)
 
-    def ride(self, target: str, vehicle: Optional[str] = None) -> str:
+    def ride(self, target: str, vehicle: Optional[str] = None) -> Awaitable[str]:
         """Make entities ride or dismount.
         
         Args:
@@ -122,7 +123,7 @@ class EntityCommands(BaseCommand):
             return self.execute(f"ride {target} mount {vehicle}")
         return self.execute(f"ride {target} dismount")
 
-    def tag_add(self, target: str, tag: str) -> str:
+    def tag_add(self, target: str, tag: str) -> Awaitable[str]:
         """Add a tag to entities.
         
         Args:
@@ -131,7 +132,7 @@ class EntityCommands(BaseCommand):
         """
         return self.execute(f"tag {target} add {tag}")
 
-    def tag_remove(self, target: str, tag: str) -> str:
+    def tag_remove(self, target: str, tag: str) -> Awaitable[str]:
         """Remove a tag from entities.
         
         Args:
@@ -140,10 +141,25 @@ class EntityCommands(BaseCommand):
         """
         return self.execute(f"tag {target} remove {tag}")
 
-    def tag_list(self, target: str) -> str:
+    def tag_list(self, target: str) -> Awaitable[str]:
         """List tags on entities.
         
         Args:
             target: Target selector
         """
-        return self.execute(f"tag {target} list")
\ No newline at end of file
+        return self.execute(f"tag {target} list")
+
+    def data_get(self, target: str, path: Optional[str] = None, scale: Optional[float] = None) -> Awaitable[DataResult]:
+        """Read NBT data of an entity.
+        
+        Args:
+            target: Single-entity selector or player
+            path: Optional NBT path, e.g. "Health" or "Inventory[0]"
+            scale: Optional scale for numeric values (requires path)
+        """
+        command = f"data get entity {target}"
+        if path:
+            command += f" {path}"
+            if scale is not None:
+                command += f" {scale}"
+        return self.execute(command, parse_data_get)
\ No newline at end of file
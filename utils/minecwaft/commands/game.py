@@ -1,11 +1,12 @@
 """Game mechanics commands for Minecraft RCON."""
 
-from typing import Optional, Union, Literal
+from typing import Awaitable, Optional, Union, Literal
 from .base import BaseCommand
+from ..parsers import ObjectiveList, Score, ScoreList, parse_objectives, parse_score, parse_score_list
 
 class GameCommands(BaseCommand):
     def gamemode(self, mode: Literal['survival', 'creative', 'adventure', 'spectator'], 
-                target: Optional[str] = None) -> str:
+                target: Optional[str] = None) -> Awaitable[str]:
         """Change game mode for a player.
         
         Args:
@@ -15,7 +16,7 @@ class GameCommands(BaseCommand):
         command = f"gamemode {mode}{self._format_target(target)}"
         return self.execute(command)
 
-    def gamerule(self, rule: str, value: Optional[Union[bool, int]] = None) -> str:
+    def gamerule(self, rule: str, value: Optional[Union[bool, int]] = None) -> Awaitable[str]:
         """Get or set a game rule.
         
         Args:
@@ -30,7 +31,7 @@ class GameCommands(BaseCommand):
                 command += f" {value}"
         return self.execute(command)
 
-    def experience_add(self, target: str, amount: int, type: Literal['points', 'levels'] = 'points') -> str:
+    def experience_add(self, target: str, amount: int, type: Literal['points', 'levels'] = 'points') -> Awaitable[str]:
         """Add experience to a player.
         
         Args:
@@ -40,7 +41,7 @@ class GameCommands(BaseCommand):
         """
         return self.execute(f"experience add {target} {amount} {type}")
 
-    def experience_set(self, target: str, amount: int, type: Literal['points', 'levels'] = 'points') -> str:
+    def experience_set(self, target: str, amount: int, type: Literal['points', 'levels'] = 'points') -> Awaitable[str]:
         """Set experience for a player.
         
         Args:
@@ -50,7 +51,7 @@ class GameCommands(BaseCommand):
         """
         return self.execute(f"experience set {target} {amount} {type}")
 
-    def experience_query(self, target: str, type: Literal['points', 'levels']) -> str:
+    def experience_query(self, target: str, type: Literal['points', 'levels']) -> Awaitable[str]:
         """Query experience of a player.
         
         Args:
@@ -59,7 +60,7 @@ class GameCommands(BaseCommand):
         """
         return self.execute(f"experience query {target} {type}")
 
-    def defaultgamemode(self, mode: Literal['survival', 'creative', 'adventure', 'spectator']) -> str:
+    def defaultgamemode(self, mode: Literal['survival', 'creative', 'adventure', 'spectator']) -> Awaitable[str]:
         """Set the default game mode.
         
         Args:
@@ -70,7 +71,7 @@ class GameCommands(BaseCommand):
     def spawnpoint(self, target: Optional[str] = None, 
                   x: Optional[float] = None,
                   y: Optional[float] = None,
-                  z: Optional[float] = None) -> str:
+                  z: Optional[float] = None) -> Awaitable[str]:
         """Set spawn point for a player.
         
         Args:
@@ -84,7 +85,7 @@ class GameCommands(BaseCommand):
             command += f" {self._format_pos(x, y, z)}"
         return self.execute(command)
 
-    def trigger(self, objective: str, mode: Literal['add', 'set'] = 'add', value: int = 1) -> str:
+    def trigger(self, objective: str, mode: Literal['add', 'set'] = 'add', value: int = 1) -> Awaitable[str]:
         """Trigger an objective.
         
         Args:
@@ -94,7 +95,7 @@ class GameCommands(BaseCommand):
         """
         return self.execute(f"trigger {objective} {mode} {value}")
 
-    def scoreboard_objectives_add(self, name: str, criteria: str, display_name: Optional[str] = None) -> str:
+    def scoreboard_objectives_add(self, name: str, criteria: str, display_name: Optional[str] = None) -> Awaitable[str]:
         """Add a scoreboard objective.
         
         Args:
@@ -107,7 +108,7 @@ class GameCommands(BaseCommand):
             command += f" {display_name}"
         return self.execute(command)
 
-    def scoreboard_objectives_remove(self, name: str) -> str:
+    def scoreboard_objectives_remove(self, name: str) -> Awaitable[str]:
         """Remove a scoreboard objective.
         
         Args:
@@ -115,11 +116,11 @@ class GameCommands(BaseCommand):
         """
         return self.execute(f"scoreboard objectives remove {name}")
 
-    def scoreboard_objectives_list(self) -> str:
+    def scoreboard_objectives_list(self) -> Awaitable[ObjectiveList]:
         """List all scoreboard objectives."""
-        return self.execute("scoreboard objectives list")
+        return self.execute("scoreboard objectives list", parse_objectives)
 
-    def scoreboard_players_set(self, target: str, objective: str, score: int) -> str:
+    def scoreboard_players_set(self, target: str, objective: str, score: int) -> Awaitable[str]:
         """Set score for a player/target.
         
         Args:
@@ -129,7 +130,7 @@ class GameCommands(BaseCommand):
         """
         return self.execute(f"scoreboard players set {target} {objective} {score}")
 
-    def scoreboard_players_add(self, target: str, objective: str, score: int) -> str:
+    def scoreboard_players_add(self, target: str, objective: str, score: int) -> Awaitable[str]:
         """Add to score for a player/target.
         
         Args:
@@ -139,7 +140,7 @@ class GameCommands(BaseCommand):
         """
         return self.execute(f"scoreboard players add {target} {objective} {score}")
 
-    def scoreboard_players_remove(self, target: str, objective: str, score: int) -> str:
+    def scoreboard_players_remove(self, target: str, objective: str, score: int) -> Awaitable[str]:
         """Remove from score for a player/target.
         
         Args:
@@ -149,7 +150,7 @@ class GameCommands(BaseCommand):
         """
         return self.execute(f"scoreboard players remove {target} {objective} {score}")
 
-    def scoreboard_players_reset(self, target: str, objective: Optional[str] = None) -> str:
+    def scoreboard_players_reset(self, target: str, objective: Optional[str] = None) -> Awaitable[str]:
         """Reset score(s) for a player/target.
         
         Args:
@@ -159,4 +160,22 @@ class GameCommands(BaseCommand):
         command = f"scoreboard players reset {target}"
         if objective:
             command += f" {objective}"
-        return self.execute(command)
\ No newline at end of file
+        return self.execute(command)
+
+    def scoreboard_players_get(self, target: str, objective: str) -> Awaitable[Score]:
+        """Get the score of a single player/target.
+        
+        Args:
+            target: Player or single-entity selector
+            objective: Objective name
+        """
+        return self.execute(f"scoreboard players get {target} {objective}", parse_score)
+
+    def scoreboard_players_list(self, target: Optional[str] = None) -> Awaitable[ScoreList]:
+        """List tracked entities, or all scores of one target.
+        
+        Args:
+            target: Optional target selector or player
+        """
+        command = f"scoreboard players list{self._format_target(target)}"
+        return self.execute(command, parse_score_list)
\ No newline at end of file
@@ -1,10 +1,10 @@
 """Inventory management commands for Minecraft RCON."""
 
-from typing import Optional, Union
+from typing import Awaitable, Optional, Union
 from .base import BaseCommand
 
 class InventoryCommands(BaseCommand):
-    def give(self, target: str, item: str, count: Optional[int] = None) -> str:
+    def give(self, target: str, item: str, count: Optional[int] = None) -> Awaitable[str]:
         """Give items to players.
         
         Args:
@@ -19,7 +19,7 @@ class InventoryCommands(BaseCommand):
 
     def clear(self, target: Optional[str] = None, 
              item: Optional[str] = None,
-             max_count: Optional[int] = None) -> str:
+             max_count: Optional[int] = None) -> Awaitable[str]:
         """Clear items from inventory.
         
         Args:
@@ -37,7 +37,7 @@ class InventoryCommands(BaseCommand):
         return self.execute(command)
 
     def item_replace(self, target: str, slot: str, 
-                    item: str, count: Optional[int] = None) -> str:
+                    item: str, count: Optional[int] = None) -> Awaitable[str]:
         """Replace items in slots.
         
         Args:
@@ -51,7 +51,7 @@ class InventoryCommands(BaseCommand):
             command += f" {count}"
         return self.execute(command)
 
-    def item_modify(self, target: str, slot: str, modifier: str) -> str:
+    def item_modify(self, target: str, slot: str, modifier: str) -> Awaitable[str]:
         """Modify items in slots.
         
         Args:
@@ -61,7 +61,7 @@ class InventoryCommands(BaseCommand):
         """
         return self.execute(f"item modify {target} {slot} {modifier}")
 
-    def enchant(self, target: str, enchantment: str, level: Optional[int] = None) -> str:
+    def enchant(self, target: str, enchantment: str, level: Optional[int] = None) -> Awaitable[str]:
         """Enchant items.
         
         Args:
@@ -75,7 +75,7 @@ class InventoryCommands(BaseCommand):
         return self.execute(command)
 
     def loot_spawn(self, x: float, y: float, z: float, 
-                  source: str, params: str) -> str:
+                  source: str, params: str) -> Awaitable[str]:
         """Spawn loot in world.
         
         Args:
@@ -87,7 +87,7 @@ class InventoryCommands(BaseCommand):
         """
         return self.execute(f"loot spawn {self._format_pos(x, y, z)} {source} {params}")
 
-    def loot_give(self, target: str, source: str, params: str) -> str:
+    def loot_give(self, target: str, source: str, params: str) -> Awaitable[str]:
         """Give loot to players.
         
         Args:
@@ -98,7 +98,7 @@ class InventoryCommands(BaseCommand):
         return self.execute(f"loot give {target} {source} {params}")
 
     def loot_insert(self, x: float, y: float, z: float,
-                   source: str, params: str) -> str:
+                   source: str, params: str) -> Awaitable[str]:
         """Insert loot into container.
         
         Args:
@@ -112,7 +112,7 @@ class InventoryCommands(BaseCommand):
 
     def loot_replace(self, target: str, slot: str,
                     source: str, params: str,
-                    count: Optional[int] = None) -> str:
+                    count: Optional[int] = None) -> Awaitable[str]:
         """Replace slot contents with loot.
         
         Args:
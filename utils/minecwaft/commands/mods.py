@@ -1,15 +1,15 @@
 """Mod-specific commands for Minecraft RCON."""
 
-from typing import Optional, Union, Literal
+from typing import Awaitable, Optional, Union, Literal
 from .base import BaseCommand
 
 class ModCommands(BaseCommand):
     # FTB Commands
-    def ftb_ultimine(self) -> str:
+    def ftb_ultimine(self) -> Awaitable[str]:
         """Toggle FTB Ultimine."""
         return self.execute("ftbultimine")
 
-    def ftb_gamemode(self, mode: Literal['survival', 'creative', 'adventure', 'spectator']) -> str:
+    def ftb_gamemode(self, mode: Literal['survival', 'creative', 'adventure', 'spectator']) -> Awaitable[str]:
         """Change gamemode using FTB Library.
         
         Args:
@@ -17,20 +17,20 @@ class ModCommands(BaseCommand):
         """
         return self.execute(f"ftblibrary gamemode {mode}")
 
-    def ftb_chunks_claim(self) -> str:
+    def ftb_chunks_claim(self) -> Awaitable[str]:
         """Claim the current chunk."""
         return self.execute("ftbchunks claim")
 
-    def ftb_chunks_unclaim(self) -> str:
+    def ftb_chunks_unclaim(self) -> Awaitable[str]:
         """Unclaim the current chunk."""
         return self.execute("ftbchunks unclaim")
 
-    def ftb_quests_open(self) -> str:
+    def ftb_quests_open(self) -> Awaitable[str]:
         """Open FTB Quests book."""
         return self.execute("ftbquests open_book")
 
     # Create Mod Commands
-    def create_train(self, command: str) -> str:
+    def create_train(self, command: str) -> Awaitable[str]:
         """Execute Create mod train command.
         
         Args:
@@ -38,7 +38,7 @@ class ModCommands(BaseCommand):
         """
         return self.execute(f"create train {command}")
 
-    def create_scroll(self, spell: str, level: int) -> str:
+    def create_scroll(self, spell: str, level: int) -> Awaitable[str]:
         """Create a spell scroll.
         
         Args:
@@ -48,22 +48,22 @@ class ModCommands(BaseCommand):
         return self.execute(f"createScroll {spell} {level}")
 
     # Mekanism Commands
-    def mek_debug(self) -> str:
+    def mek_debug(self) -> Awaitable[str]:
         """Toggle Mekanism debug mode."""
         return self.execute("mek debug")
 
     # Applied Energistics 2 Commands
-    def ae2_chunklogger(self) -> str:
+    def ae2_chunklogger(self) -> Awaitable[str]:
         """Toggle AE2 chunk logging."""
         return self.execute("ae2 chunklogger")
 
     # Sophisticated Backpacks Commands
-    def sbp_list(self) -> str:
+    def sbp_list(self) -> Awaitable[str]:
         """List sophisticated backpacks."""
         return self.execute("sbp list")
 
     # Curios Commands
-    def curios_list(self, target: str) -> str:
+    def curios_list(self, target: str) -> Awaitable[str]:
         """List curios slots.
         
         Args:
@@ -72,7 +72,7 @@ class ModCommands(BaseCommand):
         return self.execute(f"curios list {target}")
 
     # Compact Machines Commands
-    def compact_machines_tp(self, room: int) -> str:
+    def compact_machines_tp(self, room: int) -> Awaitable[str]:
         """Teleport to compact machine room.
         
         Args:
@@ -81,21 +81,21 @@ class ModCommands(BaseCommand):
         return self.execute(f"compactmachines tp {room}")
 
     # KubeJS Commands
-    def kubejs_reload(self) -> str:
+    def kubejs_reload(self) -> Awaitable[str]:
         """Reload KubeJS scripts."""
         return self.execute("kubejs reload")
 
-    def kubejs_errors(self) -> str:
+    def kubejs_errors(self) -> Awaitable[str]:
         """Show KubeJS errors."""
         return self.execute("kubejs errors")
 
     # Supplementaries Commands
-    def supplementaries_globe(self) -> str:
+    def supplementaries_globe(self) -> Awaitable[str]:
         """Open the globe GUI."""
         return self.execute("supplementaries globe")
 
     # Minecolonies Commands
-    def minecolonies_colony_info(self, id: Optional[int] = None) -> str:
+    def minecolonies_colony_info(self, id: Optional[int] = None) -> Awaitable[str]:
         """Show colony information.
         
         Args:
@@ -106,7 +106,7 @@ class ModCommands(BaseCommand):
             command += f" {id}"
         return self.execute(command)
 
-    def minecolonies_citizens_info(self, id: Optional[int] = None) -> str:
+    def minecolonies_citizens_info(self, id: Optional[int] = None) -> Awaitable[str]:
         """Show citizens information.
         
         Args:
@@ -118,7 +118,7 @@ class ModCommands(BaseCommand):
         return self.execute(command)
 
     # Common utility mod commands
-    def home(self, name: Optional[str] = None) -> str:
+    def home(self, name: Optional[str] = None) -> Awaitable[str]:
         """Teleport to home.
         
         Args:
@@ -129,7 +129,7 @@ class ModCommands(BaseCommand):
             command += f" {name}"
         return self.execute(command)
 
-    def sethome(self, name: Optional[str] = None) -> str:
+    def sethome(self, name: Optional[str] = None) -> Awaitable[str]:
         """Set home location.
         
         Args:
@@ -140,7 +140,7 @@ class ModCommands(BaseCommand):
             command += f" {name}"
         return self.execute(command)
 
-    def warp(self, name: str) -> str:
+    def warp(self, name: str) -> Awaitable[str]:
         """Teleport to warp point.
         
         Args:
@@ -148,7 +148,7 @@ class ModCommands(BaseCommand):
         """
         return self.execute(f"warp {name}")
 
-    def setwarp(self, name: str) -> str:
+    def setwarp(self, name: str) -> Awaitable[str]:
         """Set warp point.
         
         Args:
@@ -156,7 +156,7 @@ class ModCommands(BaseCommand):
         """
         return self.execute(f"setwarp {name}")
 
-    def tpa(self, target: str) -> str:
+    def tpa(self, target: str) -> Awaitable[str]:
         """Request teleport to player.
         
         Args:
@@ -164,10 +164,10 @@ class ModCommands(BaseCommand):
         """
         return self.execute(f"tpa {target}")
 
-    def back(self) -> str:
+    def back(self) -> Awaitable[str]:
         """Teleport to previous location."""
         return self.execute("back")
 
-    def spawn(self) -> str:
+    def spawn(self) -> Awaitable[str]:
         """Teleport to spawn point."""
         return self.execute("spawn")
\ No newline at end of file
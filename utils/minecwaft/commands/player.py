@@ -1,10 +1,11 @@
 """Player management commands for Minecraft RCON."""
 
-from typing import Optional
+from typing import Awaitable, Optional
 from .base import BaseCommand
+from ..parsers import PlayerChange, PlayerList, WhitelistEntries, parse_player_list, parse_whitelist, player_change_parser
 
 class PlayerCommands(BaseCommand):
-    def ban(self, player: str, reason: Optional[str] = None) -> str:
+    def ban(self, player: str, reason: Optional[str] = None) -> Awaitable[PlayerChange]:
         """Ban a player from the server.
         
         Args:
@@ -14,9 +15,9 @@ class PlayerCommands(BaseCommand):
         command = f"ban {player}"
         if reason:
             command += f" {reason}"
-        return self.execute(command)
+        return self.execute(command, player_change_parser("ban", player))
 
-    def ban_ip(self, ip: str, reason: Optional[str] = None) -> str:
+    def ban_ip(self, ip: str, reason: Optional[str] = None) -> Awaitable[str]:
         """Ban an IP address from the server.
         
         Args:
@@ -28,15 +29,15 @@ class PlayerCommands(BaseCommand):
             command += f" {reason}"
         return self.execute(command)
 
-    def pardon(self, player: str) -> str:
+    def pardon(self, player: str) -> Awaitable[PlayerChange]:
         """Unban a player from the server.
         
         Args:
             player: Player name or UUID
         """
-        return self.execute(f"pardon {player}")
+        return self.execute(f"pardon {player}", player_change_parser("pardon", player))
 
-    def pardon_ip(self, ip: str) -> str:
+    def pardon_ip(self, ip: str) -> Awaitable[str]:
         """Unban an IP address from the server.
         
         Args:
@@ -44,23 +45,23 @@ class PlayerCommands(BaseCommand):
         """
         return self.execute(f"pardon-ip {ip}")
 
-    def op(self, player: str) -> str:
+    def op(self, player: str) -> Awaitable[PlayerChange]:
         """Give operator status to a player.
         
         Args:
             player: Player name or UUID
         """
-        return self.execute(f"op {player}")
+        return self.execute(f"op {player}", player_change_parser("op", player))
 
-    def deop(self, player: str) -> str:
+    def deop(self, player: str) -> Awaitable[PlayerChange]:
         """Remove operator status from a player.
         
         Args:
             player: Player name or UUID
         """
-        return self.execute(f"deop {player}")
+        return self.execute(f"deop {player}", player_change_parser("deop", player))
 
-    def kick(self, player: str, reason: Optional[str] = None) -> str:
+    def kick(self, player: str, reason: Optional[str] = None) -> Awaitable[PlayerChange]:
         """Kick a player from the server.
         
         Args:
@@ -70,41 +71,41 @@ class PlayerCommands(BaseCommand):
         command = f"kick {player}"
         if reason:
             command += f" {reason}"
-        return self.execute(command)
+        return self.execute(command, player_change_parser("kick", player))
 
-    def whitelist_add(self, player: str) -> str:
+    def whitelist_add(self, player: str) -> Awaitable[PlayerChange]:
         """Add a player to the whitelist.
         
         Args:
             player: Player name or UUID
         """
-        return self.execute(f"whitelist add {player}")
+        return self.execute(f"whitelist add {player}", player_change_parser("whitelist add", player))
 
-    def whitelist_remove(self, player: str) -> str:
+    def whitelist_remove(self, player: str) -> Awaitable[PlayerChange]:
         """Remove a player from the whitelist.
         
         Args:
             player: Player name or UUID
         """
-        return self.execute(f"whitelist remove {player}")
+        return self.execute(f"whitelist remove {player}", player_change_parser("whitelist remove", player))
 
-    def whitelist_list(self) -> str:
+    def whitelist_list(self) -> Awaitable[WhitelistEntries]:
         """List all whitelisted players."""
-        return self.execute("whitelist list")
+        return self.execute("whitelist list", parse_whitelist)
 
-    def whitelist_on(self) -> str:
+    def whitelist_on(self) -> Awaitable[str]:
         """Enable the whitelist."""
         return self.execute("whitelist on")
 
-    def whitelist_off(self) -> str:
+    def whitelist_off(self) -> Awaitable[str]:
         """Disable the whitelist."""
         return self.execute("whitelist off")
 
-    def whitelist_reload(self) -> str:
+    def whitelist_reload(self) -> Awaitable[str]:
         """Reload the whitelist from file."""
         return self.execute("whitelist reload")
 
-    def list_players(self, show_uuids: bool = False) -> str:
+    def list_players(self, show_uuids: bool = False) -> Awaitable[PlayerList]:
         """List all online players.
         
         Args:
@@ -113,9 +114,9 @@ class PlayerCommands(BaseCommand):
         command = "list"
         if show_uuids:
             command += " uuids"
-        return self.execute(command)
+        return self.execute(command, parse_player_list)
 
-    def msg(self, target: str, message: str) -> str:
+    def msg(self, target: str, message: str) -> Awaitable[str]:
         """Send a private message to a player.
         
         Args:
@@ -124,11 +125,11 @@ class PlayerCommands(BaseCommand):
         """
         return self.execute(f"msg {target} {message}")
 
-    def tell(self, target: str, message: str) -> str:
+    def tell(self, target: str, message: str) -> Awaitable[str]:
         """Alias for msg command."""
         return self.msg(target, message)
 
-    def say(self, message: str) -> str:
+    def say(self, message: str) -> Awaitable[str]:
         """Broadcast a message to all players.
         
         Args:
@@ -136,7 +137,7 @@ class PlayerCommands(BaseCommand):
         """
         return self.execute(f"say {message}")
 
-    def me(self, action: str) -> str:
+    def me(self, action: str) -> Awaitable[str]:
         """Display an action in chat.
         
         Args:
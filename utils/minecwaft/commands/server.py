@@ -1,26 +1,27 @@
 """Server management commands for Minecraft RCON."""
 
-from typing import Optional
+from typing import Awaitable, Optional
 from .base import BaseCommand
+from ..parsers import BanList, parse_banlist
 
 class ServerCommands(BaseCommand):
-    def stop(self) -> str:
+    def stop(self) -> Awaitable[str]:
         """Stop the server."""
         return self.execute("stop")
 
-    def reload(self) -> str:
+    def reload(self) -> Awaitable[str]:
         """Reload server resources."""
         return self.execute("reload")
 
-    def debug_start(self) -> str:
+    def debug_start(self) -> Awaitable[str]:
         """Start debug profiling."""
         return self.execute("debug start")
 
-    def debug_stop(self) -> str:
+    def debug_stop(self) -> Awaitable[str]:
         """Stop debug profiling."""
         return self.execute("debug stop")
 
-    def debug_function(self, name: str) -> str:
+    def debug_function(self, name: str) -> Awaitable[str]:
         """Run debug function.
         
         Args:
@@ -28,7 +29,7 @@ class ServerCommands(BaseCommand):
         """
         return self.execute(f"debug function {name}")
 
-    def function(self, name: str, *args: str) -> str:
+    def function(self, name: str, *args: str) -> Awaitable[str]:
         """Run a function.
         
         Args:
@@ -40,11 +41,11 @@ class ServerCommands(BaseCommand):
             command += f" {' '.join(args)}"
         return self.execute(command)
 
-    def datapack_list(self) -> str:
+    def datapack_list(self) -> Awaitable[str]:
         """List all datapacks."""
         return self.execute("datapack list")
 
-    def datapack_enable(self, name: str) -> str:
+    def datapack_enable(self, name: str) -> Awaitable[str]:
         """Enable a datapack.
         
         Args:
@@ -52,7 +53,7 @@ class ServerCommands(BaseCommand):
         """
         return self.execute(f"datapack enable {name}")
 
-    def datapack_disable(self, name: str) -> str:
+    def datapack_disable(self, name: str) -> Awaitable[str]:
         """Disable a datapack.
         
         Args:
@@ -60,7 +61,7 @@ class ServerCommands(BaseCommand):
         """
         return self.execute(f"datapack disable {name}")
 
-    def banlist(self, type: Optional[str] = None) -> str:
+    def banlist(self, type: Optional[str] = None) -> Awaitable[BanList]:
         """Show banlist.
         
         Args:
@@ -69,9 +70,9 @@ class ServerCommands(BaseCommand):
         command = "banlist"
         if type:
             command += f" {type}"
-        return self.execute(command)
+        return self.execute(command, parse_banlist)
 
-    def setidletimeout(self, minutes: int) -> str:
+    def setidletimeout(self, minutes: int) -> Awaitable[str]:
         """Set player idle timeout.
         
         Args:
@@ -79,34 +80,34 @@ class ServerCommands(BaseCommand):
         """
         return self.execute(f"setidletimeout {minutes}")
 
-    def perf_start(self) -> str:
+    def perf_start(self) -> Awaitable[str]:
         """Start performance profiling."""
         return self.execute("perf start")
 
-    def perf_stop(self) -> str:
+    def perf_stop(self) -> Awaitable[str]:
         """Stop performance profiling."""
         return self.execute("perf stop")
 
-    def jfr_start(self) -> str:
+    def jfr_start(self) -> Awaitable[str]:
         """Start Java Flight Recorder."""
         return self.execute("jfr start")
 
-    def jfr_stop(self) -> str:
+    def jfr_stop(self) -> Awaitable[str]:
         """Stop Java Flight Recorder."""
         return self.execute("jfr stop")
 
-    def list_mods(self) -> str:
+    def list_mods(self) -> Awaitable[str]:
         """List all installed mods."""
         return self.execute("modlist")
 
-    def statistics_entities(self) -> str:
+    def statistics_entities(self) -> Awaitable[str]:
         """Show entity statistics."""
         return self.execute("statistics entities")
 
-    def statistics_block_entities(self) -> str:
+    def statistics_block_entities(self) -> Awaitable[str]:
         """Show block entity statistics."""
         return self.execute("statistics block-entities")
 
-    def mobcaps(self) -> str:
+    def mobcaps(self) -> Awaitable[str]:
         """Show mob spawn caps."""
         return self.execute("mobcaps")
\ No newline at end of file
@@ -1,10 +1,10 @@
 """World management commands for Minecraft RCON."""
 
-from typing import Optional, Union, Literal
+from typing import Awaitable, Optional, Union, Literal
 from .base import BaseCommand
 
 class WorldCommands(BaseCommand):
-    def weather(self, type: Literal['clear', 'rain', 'thunder']) -> str:
+    def weather(self, type: Literal['clear', 'rain', 'thunder']) -> Awaitable[str]:
         """Change the weather.
         
         Args:
@@ -12,7 +12,7 @@ class WorldCommands(BaseCommand):
         """
         return self.execute(f"weather {type}")
 
-    def time_set(self, time: Union[int, Literal['day', 'night', 'noon', 'midnight']]) -> str:
+    def time_set(self, time: Union[int, Literal['day', 'night', 'noon', 'midnight']]) -> Awaitable[str]:
         """Set the world time.
         
         Args:
@@ -20,7 +20,7 @@ class WorldCommands(BaseCommand):
         """
         return self.execute(f"time set {time}")
 
-    def time_add(self, amount: int) -> str:
+    def time_add(self, amount: int) -> Awaitable[str]:
         """Add to the world time.
         
         Args:
@@ -28,7 +28,7 @@ class WorldCommands(BaseCommand):
         """
         return self.execute(f"time add {amount}")
 
-    def worldborder_set(self, diameter: float, time: Optional[int] = None) -> str:
+    def worldborder_set(self, diameter: float, time: Optional[int] = None) -> Awaitable[str]:
         """Set the world border diameter.
         
         Args:
@@ -40,7 +40,7 @@ class WorldCommands(BaseCommand):
             command += f" {time}"
         return self.execute(command)
 
-    def worldborder_center(self, x: float, z: float) -> str:
+    def worldborder_center(self, x: float, z: float) -> Awaitable[str]:
         """Set the world border center.
         
         Args:
@@ -49,7 +49,7 @@ class WorldCommands(BaseCommand):
         """
         return self.execute(f"worldborder center {x} {z}")
 
-    def worldborder_damage_amount(self, damage: float) -> str:
+    def worldborder_damage_amount(self, damage: float) -> Awaitable[str]:
         """Set damage per block beyond border.
         
         Args:
@@ -57,7 +57,7 @@ class WorldCommands(BaseCommand):
         """
         return self.execute(f"worldborder damage amount {damage}")
 
-    def worldborder_damage_buffer(self, distance: float) -> str:
+    def worldborder_damage_buffer(self, distance: float) -> Awaitable[str]:
         """Set the border damage buffer.
         
         Args:
@@ -65,7 +65,7 @@ class WorldCommands(BaseCommand):
         """
         return self.execute(f"worldborder damage buffer {distance}")
 
-    def worldborder_warning_distance(self, distance: int) -> str:
+    def worldborder_warning_distance(self, distance: int) -> Awaitable[str]:
         """Set the warning distance.
         
         Args:
@@ -73,7 +73,7 @@ class WorldCommands(BaseCommand):
         """
         return self.execute(f"worldborder warning distance {distance}")
 
-    def worldborder_warning_time(self, time: int) -> str:
+    def worldborder_warning_time(self, time: int) -> Awaitable[str]:
         """Set the warning time.
         
         Args:
@@ -81,11 +81,11 @@ class WorldCommands(BaseCommand):
         """
         return self.execute(f"worldborder warning time {time}")
 
-    def seed(self) -> str:
+    def seed(self) -> Awaitable[str]:
         """Get the world seed."""
         return self.execute("seed")
 
-    def difficulty(self, level: Literal['peaceful', 'easy', 'normal', 'hard']) -> str:
+    def difficulty(self, level: Literal['peaceful', 'easy', 'normal', 'hard']) -> Awaitable[str]:
         """Set the game difficulty.
         
         Args:
@@ -93,7 +93,7 @@ class WorldCommands(BaseCommand):
         """
         return self.execute(f"difficulty {level}")
 
-    def save_all(self, flush: bool = False) -> str:
+    def save_all(self, flush: bool = False) -> Awaitable[str]:
         """Save the world to disk.
         
         Args:
@@ -104,15 +104,15 @@ class WorldCommands(BaseCommand):
             command += " flush"
         return self.execute(command)
 
-    def save_on(self) -> str:
+    def save_on(self) -> Awaitable[str]:
         """Enable automatic saving."""
         return self.execute("save-on")
 
-    def save_off(self) -> str:
+    def save_off(self) -> Awaitable[str]:
         """Disable automatic saving."""
         return self.execute("save-off")
 
-    def setworldspawn(self, x: Optional[float] = None, y: Optional[float] = None, z: Optional[float] = None) -> str:
+    def setworldspawn(self, x: Optional[float] = None, y: Optional[float] = None, z: Optional[float] = None) -> Awaitable[str]:
         """Set the world spawn point.
         
         Args:
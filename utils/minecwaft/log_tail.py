@@ -0,0 +1,178 @@
+"""Incremental tailing and parsing of a Minecraft server's ``latest.log``.
+
+The tailer remembers its byte offset and the file's inode, so each poll only
+reads what was appended since the last one. A new inode or a file that shrank
+means the server rotated the log, and reading starts over from the top of the
+new file. Reads run in a worker thread so a slow network share can't block the
+event loop.
+
+Example:
+    ```python
+    tailer = LogTailer("/srv/minecraft/logs/latest.log")
+    for event in await tailer.poll():
+        print(event.kind, event.player, event.message)
+    ```
+"""
+
+import asyncio
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+# "[12:34:56] [Server thread/INFO]: ..." as well as "[19Oct2026 12:34:56.789] [Server thread/INFO] [minecraft/...]: ..."
+_LINE = re.compile(r'^\[[^\]]+\] \[[^\]]*/INFO\](?: \[[^\]]+\])?: (.*)$')
+_JOIN = re.compile(r'^(\w{3,16}) joined the game$')
+_LEAVE = re.compile(r'^(\w{3,16}) left the game$')
+_CHAT = re.compile(r'^(?:\[Not Secure\] )?<(\w{3,16})> (.*)$')
+_DEATH = re.compile(
+    r'^(\w{3,16}) (?:'
+    r'was (?:slain|shot|killed|blown up|fireballed|pummeled|squashed|squished|impaled|pricked|stung|skewered|poked|'
+    r'struck by lightning|obliterated|doomed to fall|frozen to death|roasted|burnt to a crisp|stabbed|smashed)'
+    r'|drowned|died|starved to death|suffocated in a wall|burned to death|blew up|hit the ground too hard'
+    r'|fell (?:from|off|out of|while|into)|tried to swim in lava|went up in flames|walked into'
+    r'|withered away|froze to death|experienced kinetic energy|discovered the floor was lava'
+    r'|left the confines of this world|went off with a bang|didn\'t want to live|was too soft for this world'
+    r')\b.*$'
+)
+
+
+@dataclass(frozen=True)
+class LogEvent:
+    """A parsed log line.
+
+    Attributes:
+        kind: "join", "leave", "chat" or "death"
+        player: Player the event is about
+        message: Chat text for chat events, the full death message for deaths
+        timestamp: Unix timestamp of when the line was read
+    """
+    kind: str
+    player: str
+    message: str
+    timestamp: float
+
+
+def parse_line(line: str, now: Optional[float] = None) -> Optional[LogEvent]:
+    """Turn one log line into an event, or None if it isn't one we track.
+
+    Args:
+        line: Raw log line without the trailing newline
+        now: Timestamp to record, defaults to the current time
+
+    Returns:
+        Optional[LogEvent]: The parsed event
+    """
+    match = _LINE.match(line)
+    if not match:
+        return None
+    text = match.group(1)
+    now = time.time() if now is None else now
+    if m := _CHAT.match(text):
+        return LogEvent("chat", m.group(1), m.group(2), now)
+    if m := _JOIN.match(text):
+        return LogEvent("join", m.group(1), text, now)
+    if m := _LEAVE.match(text):
+        return LogEvent("leave", m.group(1), text, now)
+    if m := _DEATH.match(text):
+        return LogEvent("death", m.group(1), text, now)
+    return None
+
+
+class LogTailer:
+    """Follows a log file across rotations and yields parsed events."""
+
+    def __init__(self, path: str, from_start: bool = False, max_read: int = 1 << 20):
+        """Initialize the tailer.
+
+        Args:
+            path: Path of latest.log (local or on a mounted share)
+            from_start: Replay the current file instead of starting at its end
+            max_read: Maximum bytes to read per poll, so a huge backlog is spread out
+        """
+        self.path = path
+        self.max_read = max_read
+        self._inode: Optional[int] = None
+        self._offset: Optional[int] = 0 if from_start else None
+        self._partial = b''
+
+    def _read_new(self) -> List[str]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if self._offset is None:
+            # First poll: skip whatever was logged before the bot started.
+            self._inode, self._offset = stat.st_ino, stat.st_size
+            return []
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._inode, self._offset, self._partial = stat.st_ino, 0, b''
+        if stat.st_size == self._offset:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read(self.max_read)
+        self._offset += len(data)
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()
+        return [line.decode('utf-8', errors='replace').rstrip('\r') for line in lines]
+
+    async def poll(self) -> List[LogEvent]:
+        """Read everything appended since the last poll.
+
+        Returns:
+            List[LogEvent]: Events found in the new lines, in log order
+        """
+        lines = await asyncio.to_thread(self._read_new)
+        now = time.time()
+        return [event for event in (parse_line(line, now) for line in lines) if event is not None]
+
+
+_EVENT_FORMATS = {
+    "join": "📥 **{player}** joined the game",
+    "leave": "📤 **{player}** left the game",
+    "chat": "💬 **{player}**: {message}",
+    "death": "💀 {message}",
+}
+
+
+def format_events(events: List[LogEvent], limit: int = 2000) -> List[str]:
+    """Render events as Discord messages of at most ``limit`` characters.
+
+    Args:
+        events: Events to render, in order
+        limit: Maximum message length
+
+    Returns:
+        List[str]: Messages to send, in order
+    """
+    messages: List[str] = []
+    current = ""
+    for event in events:
+        line = _EVENT_FORMATS[event.kind].format(
+            player=event.player,
+            message=event.message.replace('@', '@\u200b'),  # no pings from in-game chat
+        )[:limit]
+        if current and len(current) + 1 + len(line) > limit:
+            messages.append(current)
+            current = ""
+        current = f"{current}\n{line}" if current else line
+    if current:
+        messages.append(current)
+    return messages
+
+
+def summarize_events(events: List[LogEvent]) -> str:
+    """One-line count of events by kind, e.g. "12 chat, 3 join, 1 death".
+
+    Args:
+        events: Events to count
+
+    Returns:
+        str: The summary
+    """
+    counts = {}
+    for event in events:
+        counts[event.kind] = counts.get(event.kind, 0) + 1
+    return ", ".join(f"{count} {kind}" for kind, count in counts.items())
@@ -1,211 +1,179 @@
-from mcrcon import MCRcon
-from mcstatus import JavaServer
-import json
-from typing import List, Optional, Dict, Any, Tuple
-import time
-import socket
-import os
-
-class MinecraftRCON:
-    def __init__(self, ip: str, port: int, password: str, max_retries: int = 3):
-        """
-        Initialize MinecraftRCON with server details.
-        
-        Args:
-            ip (str): Server IP address
-            port (int): RCON port
-            password (str): RCON password
-            max_retries (int): Maximum number of connection retries
-        """
-        self.ip = ip
-        self.port = port
-        self.password = password
-        self.max_retries = max_retries
-        self.client: Optional[MCRcon] = None
-
-    def connect(self) -> bool:
-        """
-        Establish connection to the server with retries.
-        
-        Returns:
-            bool: True if connection successful, False otherwise
-        """
-        for attempt in range(self.max_retries):
-            try:
-                if self.client:
-                    try:
-                        self.client.disconnect()
-                    except:
-                        pass
-                
-                # First check if port is open
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(5)
-                result = sock.connect_ex((self.ip, self.port))
-                sock.close()
-                
-                if result != 0:
-                    print(f"Port {self.port} is not open on {self.ip}")
-                    return False
-
-                self.client = MCRcon(self.ip, self.password, self.port, timeout=5)
-                self.client.connect()
-                return True
-            except ConnectionRefusedError:
-                print(f"Connection refused on attempt {attempt + 1}. Server might not be running or RCON is not enabled.")
-            except socket.timeout:
-                print(f"Connection timed out on attempt {attempt + 1}. Server might be too slow to respond.")
-            except Exception as e:
-                print(f"Connection attempt {attempt + 1} failed: {str(e)}")
-            
-            if self.client:
-                try:
-                    self.client.disconnect()
-                except:
-                    pass
-                self.client = None
-            
-            if attempt < self.max_retries - 1:
-                time.sleep(1)  # Wait before retrying
-        
-        return False
-
-    def disconnect(self):
-        """Close the RCON connection if it exists."""
-        if self.client:
-            try:
-                self.client.disconnect()
-            except:
-                pass
-            finally:
-                self.client = None
-
-    def send_command(self, command: str) -> str:
-        """
-        Send a command to the server with reconnection handling.
-        
-        Args:
-            command (str): Command to send
-            
-        Returns:
-            str: Server response
-        """
-        try:
-            if not self.client and not self.connect():
-                return "Error: Could not establish connection to server"
-            
-            try:
-                response = self.client.command(command)
-                return response if response else "Command executed successfully (no response)"
-            except Exception as e:
-                # If command fails, try reconnecting once
-                print(f"Command failed: {str(e)}, attempting reconnection...")
-                if self.connect():
-                    try:
-                        response = self.client.command(command)
-                        return response if response else "Command executed successfully (no response)"
-                    except Exception as e:
-                        return f"Error executing command after reconnection: {str(e)}"
-                return f"Error executing command: {str(e)}"
-        except Exception as e:
-            return f"Error: {str(e)}"
-        finally:
-            # Always disconnect after command to ensure clean state
-            self.disconnect()
-
-    def _read_json_file(self, filename: str) -> List[Dict[str, Any]]:
-        """
-        Read and parse a JSON file from the current working directory.
-        
-        Args:
-            filename (str): Name of the JSON file to read
-            
-        Returns:
-            List[Dict[str, Any]]: Parsed JSON content or empty list if file doesn't exist
-        """
-        try:
-            file_path = os.path.join(os.getcwd(), filename)
-            if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"Error reading {filename}: {str(e)}")
-        return []
-
-    def get_whitelist(self) -> List[Dict[str, Any]]:
-        """
-        Get the server's whitelist from whitelist.json.
-        
-        Returns:
-            List[Dict[str, Any]]: List of whitelisted players with their details
-        """
-        return self._read_json_file('whitelist.json')
-
-    def add_to_whitelist(self, player_name: str) -> Tuple[bool, str]:
-        """
-        Add a player to the whitelist using RCON command.
-        
-        Args:
-            player_name (str): Name of the player to whitelist
-            
-        Returns:
-            Tuple[bool, str]: (Success status, Message)
-        """
-        try:
-            response = self.send_command(f"whitelist add {player_name}")
-            if "Added" in response:
-                return True, f"Successfully added {player_name} to whitelist"
-            elif "already whitelisted" in response:
-                return False, f"Player {player_name} is already whitelisted"
-            else:
-                return False, f"Failed to add player: {response}"
-        except Exception as e:
-            return False, f"Error adding to whitelist: {str(e)}"
-
-    def get_ops(self) -> List[Dict[str, Any]]:
-        """
-        Get the server's operator list from ops.json.
-        
-        Returns:
-            List[Dict[str, Any]]: List of server operators with their details
-        """
-        return self._read_json_file('ops.json')
-
-    def get_server_status(self) -> Dict[str, Any]:
-        """
-        Get the server's status including player count, version, etc.
-        
-        Returns:
-            Dict[str, Any]: Server status information
-        """
-        try:
-            # First check if port is open
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            result = sock.connect_ex((self.ip, self.port))
-            sock.close()
-            
-            if result != 0:
-                return {
-                    "online": False,
-                    "error": f"Port {self.port} is not open on {self.ip}"
-                }
-
-            # Use mcstatus to query the server
-            server = JavaServer(self.ip)
-            status = server.status()
-            
-            return {
-                "online": True,
-                "version": status.version.name,
-                "protocol": status.version.protocol,
-                "players_online": status.players.online,
-                "players_max": status.players.max,
-                "latency": status.latency,
-                "description": status.description
-            }
-        except Exception as e:
-            return {
-                "online": False,
-                "error": str(e)
-            }
\ No newline at end of file
+from typing import List, Dict, Any, Tuple
+from .async_rcon import RconPool, RconAuthError
+from .parsers import parse_player_list, player_change_parser
+from .player_index import PlayerNameIndex
+from .player_state import PlayerStateMirror, StateDiff
+from .status_sampler import StatusSampler
+
+class MinecraftRCON:
+    def __init__(self, ip: str, port: int, password: str, max_retries: int = 3, pool_size: int = 2,
+                 status_port: int = 25565):
+        """
+        Initialize MinecraftRCON with server details.
+        
+        Args:
+            ip (str): Server IP address
+            port (int): RCON port
+            password (str): RCON password
+            max_retries (int): Maximum number of connection retries
+            pool_size (int): Number of persistent RCON connections to keep open
+            status_port (int): Game port used for Server List Ping status queries
+        """
+        self.ip = ip
+        self.port = port
+        self.password = password
+        self.max_retries = max_retries
+        self.pool = RconPool(ip, port, password, size=pool_size, max_retries=max_retries)
+        self.status_sampler = StatusSampler(ip, status_port)
+        self.player_state = PlayerStateMirror()
+        self.player_names = PlayerNameIndex()
+
+    async def connect(self) -> bool:
+        """
+        Make sure an authenticated connection to the server is open.
+        
+        Returns:
+            bool: True if connection successful, False otherwise
+        """
+        try:
+            await self.pool.warm()
+            return True
+        except RconAuthError as e:
+            print(f"Connection failed: {str(e)}")
+        except Exception as e:
+            print(f"Connection failed: {str(e)}. Server might not be running or RCON is not enabled.")
+        return False
+
+    async def disconnect(self):
+        """Close all pooled RCON connections."""
+        await self.pool.close()
+
+    async def send_command(self, command: str) -> str:
+        """
+        Send a command to the server over a pooled connection.
+
+        Dropped connections are re-established transparently.
+        
+        Args:
+            command (str): Command to send
+            
+        Returns:
+            str: Server response
+        """
+        try:
+            response = await self.pool.execute(command)
+            self._observe(command, response)
+            return response if response else "Command executed successfully (no response)"
+        except RconAuthError as e:
+            return f"Error: {str(e)}"
+        except ConnectionError as e:
+            return f"Error executing command: {str(e)}"
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    async def send_commands(self, commands: List[str]) -> List[str]:
+        """
+        Send several commands back to back over a single pooled connection.
+        
+        Args:
+            commands (List[str]): Commands to send, in order
+            
+        Returns:
+            List[str]: Server responses, in the same order as ``commands``
+        """
+        if not commands:
+            return []
+        try:
+            responses = await self.pool.execute_many(commands)
+            for command, response in zip(commands, responses):
+                self._observe(command, response)
+            return [response if response else "Command executed successfully (no response)" for response in responses]
+        except RconAuthError as e:
+            return [f"Error: {str(e)}"] * len(commands)
+        except ConnectionError as e:
+            return [f"Error executing command: {str(e)}"] * len(commands)
+        except Exception as e:
+            return [f"Error: {str(e)}"] * len(commands)
+
+    def _observe(self, command: str, response: str):
+        """Feed a command and its response to the player state mirror and name index."""
+        self.player_state.observe(command, response)
+        verb = command.strip().lstrip('/').split(' ', 1)[0]
+        if verb == "list":
+            players = parse_player_list(response)
+            if players.ok:
+                self.player_names.set_online(players.players)
+        elif verb in ("whitelist", "banlist", "ban", "pardon", "op", "deop"):
+            self.player_names.add_many(self.player_state.whitelist)
+            self.player_names.add_many(self.player_state.ops)
+            self.player_names.add_many(ban.player for ban in self.player_state.bans)
+
+    async def sync_player_state(self) -> StateDiff:
+        """
+        Reload the whitelist and ban list into the player state mirror.
+        
+        Returns:
+            StateDiff: Players added or removed outside the bot since the last sync
+        """
+        return await self.player_state.reconcile(self.send_commands)
+
+    def get_whitelist(self) -> List[Dict[str, Any]]:
+        """
+        Get the server's whitelist from the player state mirror.
+        
+        Returns:
+            List[Dict[str, Any]]: Whitelisted players, empty until the mirror has been synced
+        """
+        return [{"name": name} for name in self.player_state.whitelist]
+
+    async def add_to_whitelist(self, player_name: str) -> Tuple[bool, str]:
+        """
+        Add a player to the whitelist using RCON command.
+        
+        Args:
+            player_name (str): Name of the player to whitelist
+            
+        Returns:
+            Tuple[bool, str]: (Success status, Message)
+        """
+        try:
+            result = player_change_parser("whitelist add", player_name)(
+                await self.send_command(f"whitelist add {player_name}")
+            )
+            if result.changed:
+                return True, f"Successfully added {player_name} to whitelist"
+            elif result.ok:
+                return False, f"Player {player_name} is already whitelisted"
+            else:
+                return False, f"Failed to add player: {result.raw}"
+        except Exception as e:
+            return False, f"Error adding to whitelist: {str(e)}"
+
+    def get_ops(self) -> List[Dict[str, Any]]:
+        """
+        Get the operators known to the player state mirror.
+
+        The server can't list operators over RCON, so this only contains
+        players opped through the bot.
+        
+        Returns:
+            List[Dict[str, Any]]: Known server operators
+        """
+        return [{"name": name} for name in self.player_state.ops]
+
+    def get_server_status(self) -> Dict[str, Any]:
+        """
+        Get the server's status including player count, version, etc.
+
+        Answered from the status sampler's latest snapshot; no network I/O.
+        
+        Returns:
+            Dict[str, Any]: Server status information
+        """
+        snapshot = self.status_sampler.snapshot
+        if snapshot is None:
+            return {
+                "online": False,
+                "error": "Server status has not been sampled yet"
+            }
+        return snapshot.as_dict()
@@ -0,0 +1,283 @@
+"""Typed parsing of Minecraft RCON responses.
+
+Vanilla commands answer with human-readable text. The parsers below turn the
+responses of the list, whitelist, ban, op, data get and scoreboard command
+families into frozen dataclasses once, at the RCON edge, so callers can
+compare, cache and diff results instead of matching substrings.
+
+Every result keeps the raw response in ``raw``; ``ok`` is False when the
+response wasn't recognised (including the "Error: ..." strings produced by
+MinecraftRCON when the server can't be reached).
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+_LIST = re.compile(r'There are (\d+) (?:of a max of |/)(\d+) players online:\s*(.*)', re.DOTALL)
+_UUID_ENTRY = re.compile(r'([^,()\s]+) \(([0-9a-fA-F-]{36})\)')
+_WHITELIST = re.compile(r'There (?:are|is) \d+ whitelisted players?(?:\(s\))?:\s*(.*)', re.DOTALL)
+_WHITELIST_EMPTY = re.compile(r'There are no whitelisted players')
+_BANLIST = re.compile(r'There (?:are|is) \d+ bans?(?:\(s\))?:\s*(.*)', re.DOTALL)
+# A player name or an IP address. Over RCON the entries aren't newline separated (MC-7569), so
+# an entry's reason runs until the next "<name> was banned by <source>: ".
+_BAN_TARGET = r'(?:\d{1,3}(?:\.\d{1,3}){3}|\w{1,16})'
+_BAN_ENTRY = re.compile(
+    rf'({_BAN_TARGET}) was banned by (.+?): (.*?)\s*(?={_BAN_TARGET} was banned by .+?: |$)', re.DOTALL
+)
+_BANLIST_EMPTY = re.compile(r'There are no bans')
+_DATA = re.compile(r'^(.+?) has the following (entity|block) data: (.*)$', re.DOTALL)
+_STORAGE = re.compile(r'^Storage (\S+) has the following contents: (.*)$', re.DOTALL)
+_NUMBER = re.compile(r'^(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)[bBsSlLfFdD]?$')
+_SCORE = re.compile(r'^(\S+) has (-?\d+) \[(.+)\]$')
+_SCORE_LIST = re.compile(r'^(\S+) has \d+ scores?(?:\(s\))?:\s*(.*)$', re.DOTALL)
+_SCORE_ENTRY = re.compile(r'\[(.+?)\]: (-?\d+)')
+_SCORE_LIST_EMPTY = re.compile(r'^(\S+) has no scores')
+_TRACKED = re.compile(r'There (?:are|is) \d+ tracked entit(?:y|ies)(?:/entities)?:\s*(.*)', re.DOTALL)
+_OBJECTIVES = re.compile(r'There (?:are|is) \d+ objectives?(?:\(s\))?:\s*(.*)', re.DOTALL)
+_BRACKETED = re.compile(r'\[(.+?)\]')
+_NO_ENTRIES = re.compile(r'There are no (?:tracked entities|objectives)')
+
+# (pattern, changed) per player-change command; the player name is group 1 when present.
+_PLAYER_CHANGES: Dict[str, Tuple[Tuple[re.Pattern, bool], ...]] = {
+    'whitelist add': (
+        (re.compile(r'^Added (\S+) to the whitelist'), True),
+        (re.compile(r'^Player is already whitelisted'), False),
+    ),
+    'whitelist remove': (
+        (re.compile(r'^Removed (\S+) from the whitelist'), True),
+        (re.compile(r'^Player is not whitelisted'), False),
+    ),
+    'op': (
+        (re.compile(r'^Made (\S+) a server operator'), True),
+        (re.compile(r'^Nothing changed\. The player already is an operator'), False),
+    ),
+    'deop': (
+        (re.compile(r'^Made (\S+) no longer a server operator'), True),
+        (re.compile(r'^Nothing changed\. The player is not an operator'), False),
+    ),
+    'ban': (
+        (re.compile(r'^Banned (\S+?):'), True),
+        (re.compile(r'^Nothing changed\. The player is already banned'), False),
+    ),
+    'pardon': (
+        (re.compile(r'^Unbanned (\S+)'), True),
+        (re.compile(r"^Nothing changed\. The player isn't banned"), False),
+    ),
+    'kick': (
+        (re.compile(r'^Kicked (\S+?):'), True),
+    ),
+}
+
+
+def _split_names(text: str) -> Tuple[str, ...]:
+    return tuple(name.strip() for name in text.split(',') if name.strip())
+
+
+@dataclass(frozen=True)
+class PlayerList:
+    """Result of ``list`` / ``list uuids``."""
+    raw: str
+    ok: bool
+    online: int = 0
+    max: int = 0
+    players: Tuple[str, ...] = ()
+    uuids: Dict[str, str] = field(default_factory=dict, hash=False, compare=False)
+
+
+@dataclass(frozen=True)
+class WhitelistEntries:
+    """Result of ``whitelist list``."""
+    raw: str
+    ok: bool
+    players: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class BanEntry:
+    player: str
+    source: str
+    reason: str
+
+
+@dataclass(frozen=True)
+class BanList:
+    """Result of ``banlist`` / ``banlist players``."""
+    raw: str
+    ok: bool
+    bans: Tuple[BanEntry, ...] = ()
+
+    @property
+    def players(self) -> Tuple[str, ...]:
+        return tuple(ban.player for ban in self.bans)
+
+
+@dataclass(frozen=True)
+class PlayerChange:
+    """Result of a whitelist add/remove, op/deop, ban/pardon or kick.
+
+    ``ok`` means the server understood the request; ``changed`` whether it
+    actually changed anything (e.g. False for an already whitelisted player).
+    """
+    raw: str
+    ok: bool
+    changed: bool = False
+    player: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class DataResult:
+    """Result of ``data get``.
+
+    ``value`` is the SNBT text; ``number`` is set when it is a single numeric tag.
+    """
+    raw: str
+    ok: bool
+    target: Optional[str] = None
+    kind: Optional[str] = None
+    value: Optional[str] = None
+
+    @property
+    def number(self) -> Optional[float]:
+        if self.value is None:
+            return None
+        match = _NUMBER.match(self.value.strip())
+        return float(match.group(1)) if match else None
+
+
+@dataclass(frozen=True)
+class Score:
+    """Result of ``scoreboard players get``."""
+    raw: str
+    ok: bool
+    target: Optional[str] = None
+    objective: Optional[str] = None
+    value: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ScoreList:
+    """Result of ``scoreboard players list [target]``.
+
+    For a single target ``scores`` maps objectives to values; without a
+    target ``entities`` lists every tracked entity.
+    """
+    raw: str
+    ok: bool
+    target: Optional[str] = None
+    scores: Dict[str, int] = field(default_factory=dict, hash=False)
+    entities: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ObjectiveList:
+    """Result of ``scoreboard objectives list``."""
+    raw: str
+    ok: bool
+    objectives: Tuple[str, ...] = ()
+
+
+def parse_player_list(response: str) -> PlayerList:
+    match = _LIST.search(response)
+    if not match:
+        return PlayerList(response, False)
+    names_text = match.group(3).strip()
+    uuids = {name: uuid for name, uuid in _UUID_ENTRY.findall(names_text)}
+    players = tuple(uuids) if uuids else _split_names(names_text)
+    return PlayerList(response, True, int(match.group(1)), int(match.group(2)), players, uuids)
+
+
+def parse_whitelist(response: str) -> WhitelistEntries:
+    if _WHITELIST_EMPTY.search(response):
+        return WhitelistEntries(response, True)
+    match = _WHITELIST.search(response)
+    if not match:
+        return WhitelistEntries(response, False)
+    return WhitelistEntries(response, True, _split_names(match.group(1)))
+
+
+def parse_banlist(response: str) -> BanList:
+    """Parse ``banlist``, with or without newlines between the entries.
+
+    Example:
+        ```python
+        parse_banlist("There are 2 bans:\nSteve was banned by Server: Banned by an operator.\n"
+                      "Alex was banned by Admin: griefing").players  # ('Steve', 'Alex')
+        # Over RCON the newlines are dropped; this parses to the same two entries
+        parse_banlist("There are 2 bans:Steve was banned by Server: Banned by an operator."
+                      "Alex was banned by Admin: griefing").players  # ('Steve', 'Alex')
+        ```
+    """
+    if _BANLIST_EMPTY.search(response):
+        return BanList(response, True)
+    match = _BANLIST.search(response)
+    if not match:
+        return BanList(response, False)
+    bans = tuple(BanEntry(*entry) for entry in _BAN_ENTRY.findall(match.group(1)))
+    return BanList(response, True, bans)
+
+
+def player_change_parser(command: str, player: Optional[str] = None):
+    """Build a parser for the response to a player-change command.
+
+    Args:
+        command: Command family, e.g. "whitelist add", "op" or "ban"
+        player: Player the command was issued for, used when the response doesn't name them
+
+    Returns:
+        Callable turning the raw response into a PlayerChange
+    """
+    patterns = _PLAYER_CHANGES[command]
+
+    def parse(response: str) -> PlayerChange:
+        for pattern, changed in patterns:
+            match = pattern.search(response)
+            if match:
+                name = match.group(1) if match.groups() else player
+                return PlayerChange(response, True, changed, name)
+        return PlayerChange(response, False, False, player)
+
+    return parse
+
+
+def parse_data_get(response: str) -> DataResult:
+    match = _DATA.search(response)
+    if match:
+        return DataResult(response, True, match.group(1), match.group(2), match.group(3))
+    match = _STORAGE.search(response)
+    if match:
+        return DataResult(response, True, match.group(1), 'storage', match.group(2))
+    return DataResult(response, False)
+
+
+def parse_score(response: str) -> Score:
+    match = _SCORE.search(response.strip())
+    if not match:
+        return Score(response, False)
+    return Score(response, True, match.group(1), match.group(3), int(match.group(2)))
+
+
+def parse_score_list(response: str) -> ScoreList:
+    text = response.strip()
+    match = _SCORE_LIST_EMPTY.search(text)
+    if match:
+        return ScoreList(response, True, match.group(1))
+    match = _SCORE_LIST.search(text)
+    if match:
+        scores = {objective: int(value) for objective, value in _SCORE_ENTRY.findall(match.group(2))}
+        return ScoreList(response, True, match.group(1), scores)
+    if _NO_ENTRIES.search(text):
+        return ScoreList(response, True)
+    match = _TRACKED.search(text)
+    if match:
+        return ScoreList(response, True, entities=_split_names(match.group(1)))
+    return ScoreList(response, False)
+
+
+def parse_objectives(response: str) -> ObjectiveList:
+    if _NO_ENTRIES.search(response):
+        return ObjectiveList(response, True)
+    match = _OBJECTIVES.search(response)
+    if not match:
+        return ObjectiveList(response, False)
+    return ObjectiveList(response, True, tuple(_BRACKETED.findall(match.group(1))))
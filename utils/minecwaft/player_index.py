@@ -0,0 +1,81 @@
+"""In-memory prefix index of known player names, for slash command autocomplete.
+
+Names are kept in a list sorted by their lower-cased form, so a prefix lookup
+is two binary searches plus a slice and never touches RCON. The index is fed
+from everything the bot already sees: status samples, ``list`` responses,
+the whitelist/ban mirror and the server log.
+"""
+
+import bisect
+from typing import Dict, Iterable, List, Set
+
+
+class PlayerNameIndex:
+    """Case-insensitive, sorted set of player names with prefix search.
+
+    Attributes:
+        online (Set[str]): Lower-cased names of the players currently online
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._names: Dict[str, str] = {}
+        self.online: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._names
+
+    def add(self, name: str):
+        """Add a name, or update its capitalization if it is already known."""
+        key = name.lower()
+        if key not in self._names:
+            bisect.insort(self._keys, key)
+        self._names[key] = name
+
+    def add_many(self, names: Iterable[str]):
+        for name in names:
+            self.add(name)
+
+    def mark_online(self, name: str, online: bool = True):
+        """Record a single player joining (and remember the name) or leaving.
+
+        Args:
+            name: The player's name
+            online: True for a join, False for a leave
+        """
+        if online:
+            self.add(name)
+            self.online.add(name.lower())
+        else:
+            self.online.discard(name.lower())
+
+    def set_online(self, names: Iterable[str]):
+        """Replace the online set (and remember the names).
+
+        Args:
+            names: Everyone currently online
+        """
+        names = list(names)
+        self.add_many(names)
+        self.online = {name.lower() for name in names}
+
+    def search(self, prefix: str, limit: int = 25) -> List[str]:
+        """Names starting with ``prefix``, online players first, then alphabetically.
+
+        Args:
+            prefix: What the user has typed so far
+            limit: Maximum number of results (Discord shows at most 25)
+
+        Returns:
+            List[str]: Matching names in their original capitalization
+        """
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + '\uffff', lo=start)
+        keys = self._keys[start:end]
+        if self.online:
+            keys.sort(key=lambda key: key not in self.online)
+        return [self._names[key] for key in keys[:limit]]
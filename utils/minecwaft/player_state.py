@@ -0,0 +1,142 @@
+"""In-memory mirror of a server's whitelist, operators and ban list.
+
+The mirror is hydrated over RCON (``whitelist list`` / ``banlist players``),
+then kept current by observing every command MinecraftRCON sends: a
+successful ``whitelist add``, ``op``, ``ban`` etc. updates the matching set
+without another round-trip. Changes made in-game or in the server console are
+picked up by calling reconcile() periodically.
+
+Vanilla has no command that lists operators, so the ops mirror only knows
+about players opped or deopped through the bot; ``ops_complete`` stays False.
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from .parsers import BanEntry, parse_banlist, parse_whitelist, player_change_parser
+
+_PLAYER_COMMAND = re.compile(r'^/?(whitelist add|whitelist remove|op|deop|ban|pardon) (\S+)(?: (.*))?$', re.DOTALL)
+_WHITELIST_LIST = re.compile(r'^/?whitelist list$')
+_BANLIST_PLAYERS = re.compile(r'^/?banlist players$')
+
+
+@dataclass
+class StateDiff:
+    """Players that appeared in or disappeared from the mirror during a reconcile."""
+    whitelist_added: Set[str] = field(default_factory=set)
+    whitelist_removed: Set[str] = field(default_factory=set)
+    bans_added: Set[str] = field(default_factory=set)
+    bans_removed: Set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.whitelist_added or self.whitelist_removed or self.bans_added or self.bans_removed)
+
+
+class PlayerStateMirror:
+    """Whitelist, ops and bans of one server, keyed by lower-cased player name."""
+
+    def __init__(self):
+        self._whitelist: Dict[str, str] = {}
+        self._ops: Dict[str, str] = {}
+        self._bans: Dict[str, BanEntry] = {}
+        self.whitelist_synced_at: Optional[float] = None
+        self.bans_synced_at: Optional[float] = None
+
+    @property
+    def hydrated(self) -> bool:
+        """True once both the whitelist and the ban list have been loaded."""
+        return self.whitelist_synced_at is not None and self.bans_synced_at is not None
+
+    @property
+    def ops_complete(self) -> bool:
+        """Always False: the server offers no way to list operators over RCON."""
+        return False
+
+    @property
+    def whitelist(self) -> List[str]:
+        return sorted(self._whitelist.values(), key=str.lower)
+
+    @property
+    def ops(self) -> List[str]:
+        return sorted(self._ops.values(), key=str.lower)
+
+    @property
+    def bans(self) -> List[BanEntry]:
+        return sorted(self._bans.values(), key=lambda ban: ban.player.lower())
+
+    def is_whitelisted(self, player: str) -> bool:
+        return player.lower() in self._whitelist
+
+    def is_op(self, player: str) -> bool:
+        return player.lower() in self._ops
+
+    def is_banned(self, player: str) -> bool:
+        return player.lower() in self._bans
+
+    def observe(self, command: str, response: str):
+        """Apply the effect of a command the server has answered.
+
+        Args:
+            command: Command as sent, without a leading slash
+            response: The server's response
+        """
+        command = command.strip()
+        if _WHITELIST_LIST.match(command):
+            entries = parse_whitelist(response)
+            if entries.ok:
+                self._whitelist = {name.lower(): name for name in entries.players}
+                self.whitelist_synced_at = time.time()
+            return
+        if _BANLIST_PLAYERS.match(command):
+            banlist = parse_banlist(response)
+            if banlist.ok:
+                self._bans = {ban.player.lower(): ban for ban in banlist.bans}
+                self.bans_synced_at = time.time()
+            return
+
+        match = _PLAYER_COMMAND.match(command)
+        if not match:
+            return
+        action, player, reason = match.groups()
+        result = player_change_parser(action, player)(response)
+        if not result.ok:
+            return
+        # "Nothing changed" answers still tell us the current state.
+        name = result.player or player
+        key = name.lower()
+        if action == 'whitelist add':
+            self._whitelist[key] = name
+        elif action == 'whitelist remove':
+            self._whitelist.pop(key, None)
+        elif action == 'op':
+            self._ops[key] = name
+        elif action == 'deop':
+            self._ops.pop(key, None)
+        elif action == 'ban':
+            if result.changed or key not in self._bans:
+                self._bans[key] = BanEntry(name, 'Rcon', reason or 'Banned by an operator.')
+        elif action == 'pardon':
+            self._bans.pop(key, None)
+
+    async def reconcile(self, send_commands: Callable[[List[str]], Awaitable[List[str]]]) -> StateDiff:
+        """Reload the whitelist and ban list from the server.
+
+        The responses reach observe() through the RCON edge, so this only
+        needs to send the commands and compare the before/after state.
+
+        Args:
+            send_commands: MinecraftRCON.send_commands (or anything alike)
+
+        Returns:
+            StateDiff of what changed outside the bot since the last sync
+        """
+        whitelist_before = set(self._whitelist)
+        bans_before = set(self._bans)
+        await send_commands(["whitelist list", "banlist players"])
+        return StateDiff(
+            whitelist_added=set(self._whitelist) - whitelist_before,
+            whitelist_removed=whitelist_before - set(self._whitelist),
+            bans_added=set(self._bans) - bans_before,
+            bans_removed=bans_before - set(self._bans),
+        )
@@ -0,0 +1,255 @@
+"""Registry of Minecraft servers, each with its own connection pool and command queue.
+
+Servers and guild bindings live in ``minecraft_servers.sqlite``. When the table
+is empty it is seeded with one server from the environment (``MC_HOST``,
+``MC_RCON_PORT``, ``MC_STATUS_PORT``, ``MC_SERVER_NAME``). Its password is not
+stored: a server with an empty password uses ``MC_RCON_PASSWORD``, which must
+then be set.
+
+Example:
+    ```python
+    registry = ServerRegistry()
+    async with registry.for_guild(guild_id) as mc:
+        await mc.player.list_players()
+    ```
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from .minecraft import Minecraft
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    """Connection settings of one server."""
+    name: str
+    host: str
+    rcon_port: int
+    password: str
+    status_port: int = 25565
+
+
+class ServerHandle:
+    """One registered server: an isolated Minecraft instance, its health and its command queue.
+
+    Entering the handle waits for a slot in the server's queue, so no more than
+    ``max_concurrent`` commands run against one server at a time, and a slow
+    server can't hold up commands for the others.
+
+    Attributes:
+        config (ServerConfig): Connection settings
+        minecraft (Minecraft): Command interface with its own RCON pool, status sampler and player state
+        healthy (Optional[bool]): Result of the last connection attempt, None before the first
+        last_error (Optional[str]): Why the last connection attempt failed
+        checked_at (Optional[float]): Unix timestamp of the last connection attempt
+    """
+
+    def __init__(self, config: ServerConfig, max_concurrent: int = 4):
+        """Initialize the handle.
+
+        Args:
+            config: Connection settings
+            max_concurrent: Commands allowed to run against this server at once
+        """
+        self.config = config
+        self.minecraft = Minecraft(config.host, config.rcon_port, config.password, status_port=config.status_port)
+        self.queue = asyncio.Semaphore(max_concurrent)
+        self.healthy: Optional[bool] = None
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    async def check_health(self) -> bool:
+        """Try to open (or reuse) an authenticated connection and record the result.
+
+        Returns:
+            bool: Whether the server is reachable over RCON
+        """
+        self.healthy = await self.minecraft.connect()
+        self.last_error = None if self.healthy else "RCON connection failed"
+        self.checked_at = time.time()
+        return self.healthy
+
+    async def __aenter__(self) -> Minecraft:
+        await self.queue.acquire()
+        try:
+            return await self.minecraft.__aenter__()
+        except BaseException:
+            self.queue.release()
+            raise
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self.minecraft.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            self.queue.release()
+
+    async def close(self):
+        await self.minecraft.close()
+
+
+class ServerRegistry:
+    """Servers loaded from sqlite, plus which guild uses which server."""
+
+    def __init__(self, db_path: str = 'minecraft_servers.sqlite', max_concurrent: int = 4):
+        """Initialize the registry and load every configured server.
+
+        Args:
+            db_path: Path of the sqlite database
+            max_concurrent: Per-server limit of commands running at once
+        """
+        self.max_concurrent = max_concurrent
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS minecraft_servers (
+                name TEXT PRIMARY KEY,
+                host TEXT NOT NULL,
+                rcon_port INTEGER NOT NULL,
+                password TEXT NOT NULL,
+                status_port INTEGER NOT NULL DEFAULT 25565,
+                is_default INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS minecraft_guild_servers (
+                guild_id INTEGER PRIMARY KEY,
+                server_name TEXT NOT NULL REFERENCES minecraft_servers(name) ON DELETE CASCADE
+            )
+        ''')
+        self.conn.commit()
+        self._seed_from_env()
+        env_password = os.getenv("MC_RCON_PASSWORD")
+        if env_password:
+            # Servers using the environment's password don't need a stored copy (e.g. seeded by older versions).
+            self.cursor.execute("UPDATE minecraft_servers SET password = '' WHERE password = ?", (env_password,))
+            self.conn.commit()
+
+        self.servers: Dict[str, ServerHandle] = {}
+        self.default_name: Optional[str] = None
+        self.cursor.execute('SELECT name, host, rcon_port, password, status_port, is_default FROM minecraft_servers')
+        for name, host, rcon_port, password, status_port, is_default in self.cursor.fetchall():
+            password = password or self._env_password()
+            self.servers[name] = ServerHandle(ServerConfig(name, host, rcon_port, password, status_port), max_concurrent)
+            if is_default or self.default_name is None:
+                self.default_name = name
+
+        self.cursor.execute('SELECT guild_id, server_name FROM minecraft_guild_servers')
+        self.guild_servers: Dict[int, str] = dict(self.cursor.fetchall())
+
+    @staticmethod
+    def _env_password() -> str:
+        password = os.getenv("MC_RCON_PASSWORD")
+        if not password:
+            raise RuntimeError("MC_RCON_PASSWORD environment variable is not set.")
+        return password
+
+    def _seed_from_env(self):
+        self.cursor.execute('SELECT COUNT(*) FROM minecraft_servers')
+        if self.cursor.fetchone()[0]:
+            return
+        self._env_password()
+        self.cursor.execute(
+            'INSERT INTO minecraft_servers (name, host, rcon_port, password, status_port, is_default) VALUES (?, ?, ?, ?, ?, 1)',
+            (
+                os.getenv("MC_SERVER_NAME", "kaeseecke"),
+                os.getenv("MC_HOST", "116.202.215.54"),
+                int(os.getenv("MC_RCON_PORT", "25575")),
+                '',
+                int(os.getenv("MC_STATUS_PORT", "25565")),
+            ),
+        )
+        self.conn.commit()
+
+    @property
+    def default(self) -> ServerHandle:
+        return self.servers[self.default_name]
+
+    def get(self, name: str) -> Optional[ServerHandle]:
+        return self.servers.get(name)
+
+    def for_guild(self, guild_id: Optional[int]) -> ServerHandle:
+        """The server a guild is bound to, or the default server.
+
+        Args:
+            guild_id: Guild ID, None for DMs and user installs
+
+        Returns:
+            ServerHandle: The server to run the guild's commands against
+        """
+        name = self.guild_servers.get(guild_id) if guild_id is not None else None
+        return self.servers.get(name) or self.default
+
+    def bind_guild(self, guild_id: int, name: str):
+        """Make a guild use a registered server.
+
+        Args:
+            guild_id: Guild ID
+            name: Name of a registered server
+
+        Raises:
+            KeyError: If no server with that name is registered
+        """
+        if name not in self.servers:
+            raise KeyError(name)
+        self.cursor.execute(
+            'INSERT OR REPLACE INTO minecraft_guild_servers (guild_id, server_name) VALUES (?, ?)',
+            (guild_id, name),
+        )
+        self.conn.commit()
+        self.guild_servers[guild_id] = name
+
+    def unbind_guild(self, guild_id: int):
+        """Return a guild to the default server."""
+        self.cursor.execute('DELETE FROM minecraft_guild_servers WHERE guild_id = ?', (guild_id,))
+        self.conn.commit()
+        self.guild_servers.pop(guild_id, None)
+
+    def add_server(self, config: ServerConfig) -> ServerHandle:
+        """Register a server, replacing any existing one with the same name.
+
+        Args:
+            config: Connection settings
+
+        Returns:
+            ServerHandle: The new server's handle
+        """
+        self.cursor.execute(
+            'INSERT OR REPLACE INTO minecraft_servers (name, host, rcon_port, password, status_port, is_default) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (config.name, config.host, config.rcon_port, config.password, config.status_port,
+             int(config.name == self.default_name)),
+        )
+        self.conn.commit()
+        old = self.servers.get(config.name)
+        if old is not None:
+            asyncio.get_running_loop().create_task(old.close())
+        handle = self.servers[config.name] = ServerHandle(config, self.max_concurrent)
+        if self.default_name is None:
+            self.default_name = config.name
+        return handle
+
+    def list(self) -> List[ServerHandle]:
+        return list(self.servers.values())
+
+    async def check_health(self) -> Dict[str, bool]:
+        """Check every server concurrently.
+
+        Returns:
+            Dict[str, bool]: Server name to reachability
+        """
+        handles = self.list()
+        results = await asyncio.gather(*(handle.check_health() for handle in handles))
+        return {handle.name: healthy for handle, healthy in zip(handles, results)}
+
+    async def close(self):
+        """Close every server's connections and the database."""
+        await asyncio.gather(*(handle.close() for handle in self.servers.values()), return_exceptions=True)
+        self.conn.close()
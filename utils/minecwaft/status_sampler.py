@@ -0,0 +1,181 @@
+"""Background Server List Ping sampling with an in-memory history.
+
+The sampler queries the server's status over the async mcstatus API and keeps
+the latest snapshot plus a fixed-size ring buffer of player counts and
+latencies, so status and player-list lookups are answered from memory.
+"""
+
+import math
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from mcstatus import JavaServer
+
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    """Result of one status query.
+
+    Attributes:
+        online: Whether the server answered
+        sampled_at: Unix timestamp of the query
+        version: Server version name
+        protocol: Protocol version number
+        players_online: Number of players online
+        players_max: Player slots
+        latency: Round-trip latency in milliseconds
+        description: Server MOTD
+        player_sample: Player names the server chose to include (at most ~12)
+        error: Why the query failed, if it did
+    """
+    online: bool
+    sampled_at: float
+    version: Optional[str] = None
+    protocol: Optional[int] = None
+    players_online: int = 0
+    players_max: int = 0
+    latency: float = math.nan
+    description: str = ""
+    player_sample: Tuple[str, ...] = ()
+    error: Optional[str] = None
+
+    @property
+    def has_full_player_list(self) -> bool:
+        """True when player_sample names every online player."""
+        return self.online and len(self.player_sample) == self.players_online
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Same shape as MinecraftRCON.get_server_status used to return."""
+        if not self.online:
+            return {"online": False, "error": self.error}
+        return {
+            "online": True,
+            "version": self.version,
+            "protocol": self.protocol,
+            "players_online": self.players_online,
+            "players_max": self.players_max,
+            "latency": self.latency,
+            "description": self.description,
+        }
+
+
+class StatusHistory:
+    """Fixed-capacity ring buffer of (timestamp, players online, latency).
+
+    Backed by typed arrays, so a day of 30-second samples costs ~40 KB.
+    Offline samples are stored with a NaN latency.
+    """
+
+    def __init__(self, capacity: int = 2880):
+        """Initialize the buffer.
+
+        Args:
+            capacity: Number of samples to keep
+        """
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.players = array('H', bytes(2 * capacity))
+        self.latency = array('f', bytes(4 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, players: int, latency: float):
+        i = self._next
+        self.timestamps[i] = timestamp
+        self.players[i] = min(players, 0xFFFF)
+        self.latency[i] = latency
+        self._next = (i + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _indices(self):
+        start = (self._next - self._count) % self.capacity
+        return ((start + k) % self.capacity for k in range(self._count))
+
+    def series(self, since: float = 0.0) -> List[Tuple[float, int, float]]:
+        """Samples taken at or after ``since``, oldest first.
+
+        Args:
+            since: Unix timestamp to start from
+
+        Returns:
+            List of (timestamp, players online, latency in ms)
+        """
+        return [
+            (self.timestamps[i], self.players[i], self.latency[i])
+            for i in self._indices()
+            if self.timestamps[i] >= since
+        ]
+
+    def summary(self, since: float = 0.0) -> Dict[str, Any]:
+        """Player count and latency statistics for samples since ``since``.
+
+        Args:
+            since: Unix timestamp to start from
+
+        Returns:
+            Dict with sample count, peak/average players, average latency and uptime ratio
+        """
+        samples = self.series(since)
+        if not samples:
+            return {"samples": 0}
+        latencies = [lat for _, _, lat in samples if not math.isnan(lat)]
+        players = [count for _, count, _ in samples]
+        return {
+            "samples": len(samples),
+            "players_peak": max(players),
+            "players_avg": sum(players) / len(players),
+            "latency_avg": sum(latencies) / len(latencies) if latencies else math.nan,
+            "uptime": len(latencies) / len(samples),
+        }
+
+
+class StatusSampler:
+    """Polls a server's status and keeps the latest snapshot and its history.
+
+    The sampler doesn't schedule itself; call sample() from a background
+    loop (e.g. a ``tasks.loop`` in the cog) at the desired interval.
+    """
+
+    def __init__(self, host: str, port: int = 25565, timeout: float = 3.0, history_size: int = 2880):
+        """Initialize the sampler.
+
+        Args:
+            host: Server host name or IP address
+            port: Server (query/game) port
+            timeout: Seconds to wait for the status response
+            history_size: Number of samples to keep in the history
+        """
+        self.server = JavaServer(host, port, timeout=timeout)
+        self.snapshot: Optional[StatusSnapshot] = None
+        self.history = StatusHistory(history_size)
+
+    async def sample(self) -> StatusSnapshot:
+        """Query the server once and record the result.
+
+        Returns:
+            The new snapshot
+        """
+        now = time.time()
+        try:
+            status = await self.server.async_status()
+            description = status.description
+            snapshot = StatusSnapshot(
+                online=True,
+                sampled_at=now,
+                version=status.version.name,
+                protocol=status.version.protocol,
+                players_online=status.players.online,
+                players_max=status.players.max,
+                latency=status.latency,
+                description=description if isinstance(description, str) else str(description),
+                player_sample=tuple(player.name for player in (status.players.sample or ())),
+            )
+        except Exception as e:
+            snapshot = StatusSnapshot(online=False, sampled_at=now, error=str(e) or type(e).__name__)
+        self.snapshot = snapshot
+        self.history.append(now, snapshot.players_online, snapshot.latency)
+        return snapshot
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+import aiohttp
+import discord
+
+
+@dataclass
+class Delivery:
+    channel_id: int
+    content: str
+    key: Any = None  # caller-defined identifier, handed back in the result
+
+
+@dataclass
+class DeliveryResult:
+    delivery: Delivery
+    ok: bool
+    attempts: int
+    error: Optional[str] = None
+    transient: bool = False  # failed on 429/5xx/network errors only, so a later retry may succeed
+
+
+class NotificationFanout:
+    """Send one notification to many Discord channels concurrently.
+
+    All sends share one semaphore, so a large fan-out can't flood the REST
+    client. A 429 or 5xx response backs off only the affected channel and the
+    send is retried; permanent errors (missing access, deleted channel) fail
+    right away.
+    """
+
+    def __init__(self, bot, max_concurrency: int = 10, max_attempts: int = 3, base_backoff: float = 1.0):
+        self.bot = bot
+        self.logger = logging.getLogger('bot.py')
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self._blocked_until: Dict[int, float] = {}
+
+    async def dispatch(self, deliveries: Iterable[Delivery]) -> List[DeliveryResult]:
+        """Deliver everything at once and return the results in input order."""
+        return await asyncio.gather(*(self._deliver(delivery) for delivery in deliveries))
+
+    def _backoff(self, channel_id: int, attempt: int, retry_after: Optional[float] = None):
+        delay = retry_after if retry_after else self.base_backoff * 2 ** (attempt - 1)
+        delay += random.uniform(0, self.base_backoff / 2)
+        loop = asyncio.get_running_loop()
+        self._blocked_until[channel_id] = max(self._blocked_until.get(channel_id, 0), loop.time() + delay)
+
+    async def _deliver(self, delivery: Delivery) -> DeliveryResult:
+        channel = self.bot.get_channel(delivery.channel_id)
+        if channel is None:
+            return DeliveryResult(delivery, False, 0, "channel not found")
+
+        loop = asyncio.get_running_loop()
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            wait = self._blocked_until.get(delivery.channel_id, 0) - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                async with self.semaphore:
+                    await channel.send(content=delivery.content)
+                return DeliveryResult(delivery, True, attempt)
+            except (discord.Forbidden, discord.NotFound) as e:
+                return DeliveryResult(delivery, False, attempt, str(e))
+            except discord.HTTPException as e:
+                if e.status != 429 and e.status < 500:
+                    return DeliveryResult(delivery, False, attempt, str(e))
+                error = str(e)
+                retry_after = None
+                if e.status == 429 and e.response is not None:
+                    try:
+                        retry_after = float(e.response.headers.get('Retry-After', 0))
+                    except (TypeError, ValueError):
+                        retry_after = None
+                self._backoff(delivery.channel_id, attempt, retry_after)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                error = str(e)
+                self._backoff(delivery.channel_id, attempt)
+
+        self.logger.warning(f"Giving up on notification to channel {delivery.channel_id}: {error}")
+        return DeliveryResult(delivery, False, self.max_attempts, error, transient=True)
@@ -0,0 +1,112 @@
+"""Preloaded system prompt templates with hot reloading.
+
+All templates in a directory are read and compiled once: the text is split at
+its ``{{placeholders}}`` so rendering is a single join instead of a file read
+plus one ``str.replace`` per variable. ``reload_changed()`` only stats the
+files and re-reads the ones whose modification time changed, so it is cheap
+enough to call every few seconds.
+
+Example:
+    ```python
+    prompts = PromptStore("cogs/google_ai_sys_prompts")
+    system_prompt = prompts.get("gemini_2_0_flash").render(userid=ctx.author.id)
+    ```
+"""
+
+import logging
+import os
+import re
+from typing import Dict, List, Set, Tuple
+
+_PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+
+class PromptTemplate:
+    """A compiled prompt template.
+
+    Attributes:
+        name: File name without the extension
+        text: The raw template
+        mtime: Modification time of the file when it was read
+        variables: Names of the placeholders in the template
+    """
+
+    def __init__(self, name: str, text: str, mtime: float = 0.0):
+        self.name = name
+        self.text = text
+        self.mtime = mtime
+        # Even indexes are literal text, odd indexes are variable names.
+        self._parts: List[str] = _PLACEHOLDER.split(text)
+        self.variables: Set[str] = set(self._parts[1::2])
+
+    def render(self, **values) -> str:
+        """Fill in the placeholders.
+
+        Args:
+            **values: A value for every placeholder, converted with str()
+
+        Returns:
+            str: The rendered prompt
+
+        Raises:
+            KeyError: If a placeholder has no value
+        """
+        parts = self._parts[:]
+        for i in range(1, len(parts), 2):
+            parts[i] = str(values[parts[i]])
+        return "".join(parts)
+
+
+class PromptStore:
+    """All templates of one directory, kept in memory."""
+
+    def __init__(self, directory: str, extension: str = ".md"):
+        """Load every template in ``directory``.
+
+        Args:
+            directory: Directory with one file per template
+            extension: File extension of the templates
+        """
+        self.directory = directory
+        self.extension = extension
+        self.logger = logging.getLogger('bot.py')
+        self.templates: Dict[str, PromptTemplate] = {}
+        self.reload_changed()
+
+    def get(self, name: str) -> PromptTemplate:
+        """Get a template by file name without the extension.
+
+        Raises:
+            KeyError: If there is no such template
+        """
+        return self.templates[name]
+
+    def _scan(self) -> Dict[str, Tuple[str, float]]:
+        files = {}
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.extension):
+                files[entry.name[:-len(self.extension)]] = (entry.path, entry.stat().st_mtime)
+        return files
+
+    def reload_changed(self) -> List[str]:
+        """Re-read templates that were added or modified, and forget deleted ones. Blocking.
+
+        Returns:
+            List[str]: Names of the templates that were (re)loaded or removed
+        """
+        changed = []
+        files = self._scan()
+        for name, (path, mtime) in files.items():
+            current = self.templates.get(name)
+            if current is not None and current.mtime == mtime:
+                continue
+            try:
+                with open(path, "r", encoding='utf-8') as file:
+                    self.templates[name] = PromptTemplate(name, file.read(), mtime)
+                changed.append(name)
+            except OSError as e:
+                self.logger.error(f"Failed to load prompt template {path}: {e}")
+        for name in set(self.templates) - set(files):
+            del self.templates[name]
+            changed.append(name)
+        return changed
@@ -0,0 +1,211 @@
+"""Request coalescing and concurrency caps for the AI commands.
+
+``SingleFlight`` merges identical requests that are in flight at the same
+time: the first caller (the leader) runs the generation, everyone who asks
+the same thing before it finishes waits for that result instead of starting
+another generation. Combined with the response cache this means a question is
+generated at most once, whether the repeats arrive during or after the first
+generation. Errors that only concern the leader, such as its own slot being
+refused, are not passed on: the others then run the request themselves.
+
+``ConcurrencyLimiter`` caps how many generations a single user, and each
+expensive model, may have running at once. Callers over the cap wait in a FIFO
+queue until a slot frees up, their deadline passes, or (if the queue is
+already full) are turned away with ``QueueFull``. Slots are always taken in the
+same order (user, then model), so two callers can never wait on each other.
+
+The bot owns one of each (``bot.single_flight`` and ``bot.ai_limiter``), so the
+caps hold across cogs.
+
+Example:
+    ```python
+    async def generate():
+        async with bot.ai_limiter.slot(ctx.author.id, model, deadline):
+            return await bot.llm.run(...)
+
+    answer, shared = await bot.single_flight.do(
+        (scope, normalize(question)), generate, caller_errors=(QueueFull, DeadlineExceeded)
+    )
+    ```
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Type, TypeVar
+
+from utils.llm_gateway import DeadlineExceeded
+
+T = TypeVar("T")
+
+# Models that are slow and expensive enough to be capped by default.
+DEFAULT_MODEL_LIMITS = "sonar-deep-research=1,gemini-2.5-pro=2"
+
+
+class QueueFull(Exception):
+    """Raised when too many requests are already waiting for the same slot."""
+
+
+def parse_limits(value: str) -> Dict[str, int]:
+    """Parse ``"model=limit,model=limit"`` into a dict, ignoring empty entries.
+
+    Raises:
+        ValueError: If an entry isn't ``name=number``
+    """
+    limits = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        name, _, limit = entry.partition("=")
+        limits[name.strip()] = int(limit)
+    return limits
+
+
+class SingleFlight:
+    """Runs identical concurrent calls only once and shares the result."""
+
+    def __init__(self):
+        self.logger = logging.getLogger('bot.py')
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.merged = 0
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved even if every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]],
+                 caller_errors: Tuple[Type[BaseException], ...] = ()) -> Tuple[T, bool]:
+        """Run ``call``, or wait for the identical call that is already running.
+
+        The call runs in its own task, so a caller being cancelled doesn't cancel it
+        for the others. Exceptions are raised to every caller, except ``caller_errors``:
+        those only concern the caller that ran the call (e.g. its concurrency slot or its
+        deadline), so the others run their own ``call`` instead, merged with each other again.
+
+        Args:
+            key: Identifies identical calls, e.g. the cache scope and the normalized question
+            call: Makes the request; only invoked by the leader
+            caller_errors: Exception types that aren't passed on to merged callers
+
+        Returns:
+            Tuple[T, bool]: The result, and whether it came from another caller's call
+        """
+        while True:
+            task = self._calls.get(key)
+            if task is None:
+                break
+            self.merged += 1
+            self.logger.debug(f"Merged a request into one already in flight ({self.merged} merged so far)")
+            try:
+                return await asyncio.shield(task), True
+            except caller_errors:
+                # The leader has been forgotten by now, so the next round starts a new call.
+                continue
+        task = asyncio.ensure_future(call())
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task), False
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+class _Slot:
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0  # holders plus waiters; the slot is dropped when this reaches 0
+        self.waiting = 0
+
+
+class ConcurrencyLimiter:
+    """Per-user and per-model concurrency caps with a bounded FIFO queue."""
+
+    def __init__(self, per_user: int = 2, model_limits: Optional[Dict[str, int]] = None, max_queue: int = 10):
+        """Initialize the limiter.
+
+        Args:
+            per_user: Generations one user may have running at once, 0 for no limit
+            model_limits: Generations that may run at once per model name; unlisted models are unlimited
+            max_queue: Requests that may wait for one user's or one model's slot before new ones are turned away
+        """
+        self.per_user = per_user
+        self.model_limits = model_limits or {}
+        self.max_queue = max_queue
+        self._slots: Dict[Tuple[str, Any], _Slot] = {}
+
+    @classmethod
+    def from_env(cls) -> 'ConcurrencyLimiter':
+        return cls(
+            per_user=int(os.getenv("AI_USER_CONCURRENCY", "2")),
+            model_limits=parse_limits(os.getenv("AI_MODEL_CONCURRENCY", DEFAULT_MODEL_LIMITS)),
+            max_queue=int(os.getenv("AI_MAX_QUEUE", "10")),
+        )
+
+    def waiting(self, kind: str, name) -> int:
+        """Requests currently queued for a slot, e.g. ``waiting("model", "gemini-2.5-pro")``."""
+        slot = self._slots.get((kind, name))
+        return slot.waiting if slot else 0
+
+    async def _acquire(self, kind: str, name, limit: int, deadline: Optional[float]) -> _Slot:
+        key = (kind, name)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = _Slot(limit)
+        elif slot.semaphore.locked() and slot.waiting >= self.max_queue:
+            raise QueueFull(
+                "You already have too many requests waiting, please wait for them to finish."
+                if kind == "user" else
+                f"Too many requests are waiting for {name} right now, please try again later."
+            )
+        slot.users += 1
+        slot.waiting += 1
+        try:
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                raise asyncio.TimeoutError
+            await asyncio.wait_for(slot.semaphore.acquire(), timeout)
+        except BaseException as e:
+            self._release(key, slot, acquired=False)
+            if isinstance(e, asyncio.TimeoutError):
+                raise DeadlineExceeded(f"Timed out waiting for a free {kind} slot.") from None
+            raise
+        finally:
+            slot.waiting -= 1
+        return slot
+
+    def _release(self, key, slot: _Slot, acquired: bool = True):
+        if acquired:
+            slot.semaphore.release()
+        slot.users -= 1
+        if slot.users == 0 and self._slots.get(key) is slot:
+            del self._slots[key]
+
+    @asynccontextmanager
+    async def slot(self, user_id, model: str, deadline: Optional[float] = None):
+        """Hold a slot for one generation.
+
+        Args:
+            user_id: The requesting user
+            model: Model name the generation goes to
+            deadline: time.monotonic() deadline for getting the slot, e.g. interaction_deadline(ctx)
+
+        Raises:
+            QueueFull: If the user's or the model's queue is full
+            DeadlineExceeded: If no slot freed up before the deadline
+        """
+        held = []
+        try:
+            if self.per_user > 0:
+                held.append((("user", user_id), await self._acquire("user", user_id, self.per_user, deadline)))
+            model_limit = self.model_limits.get(model, 0)
+            if model_limit > 0:
+                held.append((("model", model), await self._acquire("model", model, model_limit, deadline)))
+            yield
+        finally:
+            for key, slot in reversed(held):
+                self._release(key, slot)
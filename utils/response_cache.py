@@ -0,0 +1,235 @@
+"""Cache for AI answers, so repeated questions don't cost another generation.
+
+Entries are keyed by the model, a hash of the system prompt template, whether
+tools (web search) were enabled and the normalized question (case, Unicode
+form, whitespace and trailing punctuation don't matter). They live in sqlite
+and expire after a TTL.
+
+The optional near-duplicate tier matches questions that are worded slightly
+differently. Every question gets a 64-bit SimHash over its words and word
+pairs, stored as four 16-bit bands; a lookup only compares entries that share
+at least one band (locality-sensitive hashing). A candidate counts as a hit
+only if its SimHash is within ``max_distance`` bits, the word sets are at
+least ``min_similarity`` similar (Jaccard) and both questions contain exactly
+the same numbers, so "what is 2+2" never returns the answer to "what is 2+3".
+
+Example:
+    ```python
+    cache = ResponseCache()
+    scope = ResponseCache.scope("gemini-2.5-flash", template, tools=False)
+    if (hit := cache.get(scope, question)) is None:
+        cache.put(scope, question, answer)
+    ```
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+_WORD = re.compile(r"\w+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_BANDS = 4
+_BAND_BITS = 64 // _BANDS
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A cache hit.
+
+    Attributes:
+        response: The stored answer
+        created: Unix timestamp of when it was generated
+        near: True if it was found through the near-duplicate tier
+    """
+    response: str
+    created: float
+    near: bool = False
+
+
+def normalize(question: str) -> str:
+    """Canonical form of a question for exact matching."""
+    text = unicodedata.normalize("NFKC", question).casefold()
+    text = " ".join(text.split())
+    return text.rstrip(" ?!.")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text)
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over the words and word pairs of an (already normalized) text."""
+    words = _words(text)
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    weights = [0] * 64
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def _bands(value: int) -> List[int]:
+    mask = (1 << _BAND_BITS) - 1
+    return [value >> (i * _BAND_BITS) & mask for i in range(_BANDS)]
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class ResponseCache:
+    """SQLite-backed answer cache with a TTL and an optional near-duplicate tier."""
+
+    def __init__(self, db_path: str = 'ai_response_cache.sqlite', ttl: Optional[float] = None,
+                 max_distance: Optional[int] = None, min_similarity: float = 0.85):
+        """Initialize the cache.
+
+        Args:
+            db_path: SQLite database file
+            ttl: Default seconds an answer stays valid (AI_CACHE_TTL, default one day)
+            max_distance: Maximum SimHash distance for near-duplicates, 0 disables the
+                tier (AI_CACHE_MAX_DISTANCE, default 3)
+            min_similarity: Minimum Jaccard similarity of the word sets for near-duplicates
+        """
+        self.ttl = ttl if ttl is not None else float(os.getenv("AI_CACHE_TTL", "86400"))
+        self.max_distance = max_distance if max_distance is not None else int(os.getenv("AI_CACHE_MAX_DISTANCE", "3"))
+        self.min_similarity = min_similarity
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._puts = 0
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_tables()
+        self.purge_expired()
+
+    def _create_tables(self):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                scope TEXT NOT NULL,
+                question TEXT NOT NULL,
+                response TEXT NOT NULL,
+                band0 INTEGER NOT NULL,
+                band1 INTEGER NOT NULL,
+                band2 INTEGER NOT NULL,
+                band3 INTEGER NOT NULL,
+                created REAL NOT NULL,
+                expires REAL NOT NULL
+            )
+        ''')
+        for band in range(_BANDS):
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_response_cache_band{band} ON response_cache (scope, band{band})')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_response_cache_expires ON response_cache (expires)')
+        self.conn.commit()
+
+    @staticmethod
+    def scope(model: str, system_prompt: str, tools: bool) -> str:
+        """Everything besides the question that determines the answer.
+
+        Args:
+            model: Model name
+            system_prompt: The system prompt template, before per-user substitutions
+            tools: Whether tools such as web search were enabled
+
+        Returns:
+            str: Opaque scope string for get()/put()
+        """
+        prompt_hash = hashlib.sha256(system_prompt.encode()).hexdigest()[:16]
+        return f"{model}:{prompt_hash}:{int(bool(tools))}"
+
+    @staticmethod
+    def _key(scope: str, normalized: str) -> str:
+        return hashlib.sha256(f"{scope}\n{normalized}".encode()).hexdigest()
+
+    def get(self, scope: str, question: str) -> Optional[CachedResponse]:
+        """Look up an answer.
+
+        Args:
+            scope: Result of scope()
+            question: The question as the user asked it
+
+        Returns:
+            Optional[CachedResponse]: The cached answer, or None
+        """
+        normalized = normalize(question)
+        now = time.time()
+        row = self.conn.execute(
+            'SELECT response, created FROM response_cache WHERE key = ? AND expires > ?',
+            (self._key(scope, normalized), now),
+        ).fetchone()
+        if row:
+            self.hits += 1
+            return CachedResponse(row[0], row[1])
+        if self.max_distance > 0:
+            hit = self._near(scope, normalized, now)
+            if hit:
+                self.near_hits += 1
+                return hit
+        self.misses += 1
+        return None
+
+    def _near(self, scope: str, normalized: str, now: float) -> Optional[CachedResponse]:
+        fingerprint = simhash(normalized)
+        bands = _bands(fingerprint)
+        words = set(_words(normalized))
+        numbers = _NUMBER.findall(normalized)
+        rows = self.conn.execute(
+            'SELECT question, response, created, band0, band1, band2, band3 FROM response_cache '
+            'WHERE scope = ? AND expires > ? AND (band0 = ? OR band1 = ? OR band2 = ? OR band3 = ?)',
+            (scope, now, *bands),
+        ).fetchall()
+        best = None
+        for question, response, created, *stored in rows:
+            other = sum(band << (i * _BAND_BITS) for i, band in enumerate(stored))
+            distance = bin(fingerprint ^ other).count("1")
+            if distance > self.max_distance or _NUMBER.findall(question) != numbers:
+                continue
+            similarity = _jaccard(words, set(_words(question)))
+            if similarity >= self.min_similarity and (best is None or (distance, -similarity) < best[0]):
+                best = ((distance, -similarity), response, created)
+        if best is None:
+            return None
+        return CachedResponse(best[1], best[2], near=True)
+
+    def put(self, scope: str, question: str, response: str, ttl: Optional[float] = None):
+        """Store an answer.
+
+        Args:
+            scope: Result of scope()
+            question: The question as the user asked it
+            response: The answer, with anything user-specific replaced by placeholders
+            ttl: Seconds the answer stays valid, defaults to the cache's TTL
+        """
+        normalized = normalize(question)
+        now = time.time()
+        self.conn.execute(
+            'INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (self._key(scope, normalized), scope, normalized, response,
+             *_bands(simhash(normalized)), now, now + (self.ttl if ttl is None else ttl)),
+        )
+        self.conn.commit()
+        self._puts += 1
+        if self._puts % 100 == 0:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Delete expired answers.
+
+        Returns:
+            int: Number of answers deleted
+        """
+        cursor = self.conn.execute('DELETE FROM response_cache WHERE expires <= ?', (time.time(),))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        self.conn.close()
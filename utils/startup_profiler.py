@@ -0,0 +1,180 @@
+"""Startup timing for the bot: extension imports, cog setup and command sync.
+
+``Bot`` records every extension it loads through ``StartupProfiler``. Each
+load is split into the module import and the cog setup (the cog's
+constructor plus ``add_cog``); command syncs and the time until the bot is
+ready are recorded as well. The report goes to the log and to the owner-only
+``/startup`` command.
+
+Run as a module to check the startup against a budget, e.g. in CI:
+
+    python -m utils.startup_profiler --budget 5 --extension-budget 1
+
+It loads every extension without connecting to Discord, prints the report
+and exits with status 1 if a budget is exceeded. The budgets default to the
+``STARTUP_BUDGET_SECONDS`` and ``STARTUP_EXTENSION_BUDGET_SECONDS`` env vars.
+"""
+
+import argparse
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass
+class ExtensionTiming:
+    name: str
+    import_seconds: float = 0.0
+    setup_seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def total(self) -> float:
+        return self.import_seconds + self.setup_seconds
+
+
+class StartupProfiler:
+    """Collects startup timings; all times are in seconds."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.extensions: Dict[str, ExtensionTiming] = {}
+        self.syncs: List[float] = []
+        self.milestones: Dict[str, float] = {}
+        self._current: Optional[ExtensionTiming] = None
+        self._setup_started: Optional[float] = None
+
+    @contextmanager
+    def extension(self, name: str):
+        """Time loading one extension.
+
+        Everything until mark_setup() is counted as import time, the rest as setup.
+        """
+        timing = self.extensions[name] = ExtensionTiming(name)
+        self._current, self._setup_started = timing, None
+        start = time.perf_counter()
+        try:
+            yield timing
+        except Exception as e:
+            timing.error = str(e)
+            raise
+        finally:
+            end = time.perf_counter()
+            split = self._setup_started or end
+            timing.import_seconds = split - start
+            timing.setup_seconds = end - split
+            self._current = None
+
+    def mark_setup(self):
+        """Called when the extension's setup starts constructing its cog."""
+        if self._current is not None and self._setup_started is None:
+            self._setup_started = time.perf_counter()
+
+    @contextmanager
+    def track_construction(self, base_class: type):
+        """Call mark_setup() whenever an instance of ``base_class`` (or a subclass) is created.
+
+        Args:
+            base_class: Class whose __new__ is instrumented, e.g. commands.Cog
+        """
+        original = base_class.__dict__.get('__new__')
+        parent_new = original.__func__ if isinstance(original, staticmethod) else (original or super(base_class, base_class).__new__)
+        profiler = self
+
+        def tracked_new(cls, *args, **kwargs):
+            profiler.mark_setup()
+            if parent_new is object.__new__:
+                return parent_new(cls)
+            return parent_new(cls, *args, **kwargs)
+
+        base_class.__new__ = staticmethod(tracked_new)
+        try:
+            yield
+        finally:
+            if original is None:
+                del base_class.__new__
+            else:
+                base_class.__new__ = original
+
+    @contextmanager
+    def sync(self):
+        """Time one application command sync."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.syncs.append(time.perf_counter() - start)
+
+    def mark(self, milestone: str):
+        """Record how long after startup a milestone (e.g. "ready") was reached."""
+        self.milestones.setdefault(milestone, time.perf_counter() - self.started)
+
+    @property
+    def extensions_total(self) -> float:
+        return sum(timing.total for timing in self.extensions.values())
+
+    def report(self) -> str:
+        """Human-readable summary, slowest extension first."""
+        lines = [f"{'extension':<32} {'import':>8} {'setup':>8} {'total':>8}"]
+        for timing in sorted(self.extensions.values(), key=lambda t: t.total, reverse=True):
+            suffix = " (failed)" if timing.error else ""
+            lines.append(
+                f"{timing.name:<32} {timing.import_seconds:>7.3f}s {timing.setup_seconds:>7.3f}s {timing.total:>7.3f}s{suffix}"
+            )
+        lines.append(f"{'all extensions':<32} {'':>8} {'':>8} {self.extensions_total:>7.3f}s")
+        for i, seconds in enumerate(self.syncs, 1):
+            lines.append(f"{f'command sync #{i}':<32} {'':>8} {'':>8} {seconds:>7.3f}s")
+        for milestone, seconds in self.milestones.items():
+            lines.append(f"{f'{milestone} after':<32} {'':>8} {'':>8} {seconds:>7.3f}s")
+        return "\n".join(lines)
+
+    def over_budget(self, budget: Optional[float] = None, extension_budget: Optional[float] = None) -> List[str]:
+        """Describe every budget that was exceeded.
+
+        Args:
+            budget: Maximum seconds for loading all extensions together
+            extension_budget: Maximum seconds for any single extension
+
+        Returns:
+            List[str]: One message per violation, empty if within budget
+        """
+        violations = []
+        if budget is not None and self.extensions_total > budget:
+            violations.append(f"loading all extensions took {self.extensions_total:.3f}s (budget {budget:.3f}s)")
+        if extension_budget is not None:
+            for timing in self.extensions.values():
+                if timing.total > extension_budget:
+                    violations.append(f"{timing.name} took {timing.total:.3f}s (budget {extension_budget:.3f}s)")
+        for timing in self.extensions.values():
+            if timing.error:
+                violations.append(f"{timing.name} failed to load: {timing.error}")
+        return violations
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load every extension and check the startup time budget.")
+    parser.add_argument("--budget", type=float, default=_env_float("STARTUP_BUDGET_SECONDS"),
+                        help="maximum seconds for loading all extensions")
+    parser.add_argument("--extension-budget", type=float, default=_env_float("STARTUP_EXTENSION_BUDGET_SECONDS"),
+                        help="maximum seconds for a single extension")
+    args = parser.parse_args(argv)
+
+    from bot import Bot
+    bot = Bot()
+    print(bot.startup_profiler.report())
+    violations = bot.startup_profiler.over_budget(args.budget, args.extension_budget)
+    for violation in violations:
+        print(f"OVER BUDGET: {violation}", file=sys.stderr)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""Splitting of long markdown answers into Discord-sized messages.
+
+The text is split into lines once and the lines are walked a single time.
+For the message being built the chunker remembers the last place it could be
+split at, per kind of boundary, so choosing where to cut is a dictionary
+lookup instead of a regex scan over the remaining text. Boundaries are
+preferred in the order the AI cogs always used: before a ``#`` heading, a
+``##`` heading, a ``###`` heading, a line starting with a digit, after a blank
+line, at any line break. A boundary only counts if it leaves the message at
+least half full. Lines longer than a message are cut at a space.
+
+Code blocks are tracked while walking. A message that has to end inside a
+code block gets a closing fence, and the next message reopens it with the
+backticks and the language tag of the original fence line (the tag truncated
+to a tenth of a message, so the reopened fence never crowds out the code), so
+both render as code.
+
+Run as a module for a property check on random answers; it exits non-zero if
+a check fails:
+
+    python -m utils.text_chunker
+"""
+
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+FENCE = "```"
+_CLOSE = "\n" + FENCE
+_LANGUAGE = re.compile(r"[^\s`]*")
+
+
+def _reopen_line(fence_line: str, max_length: int) -> str:
+    """The line that reopens a code block in the next message: the backticks plus the language tag, shortened to fit."""
+    stripped = fence_line.strip()
+    language = _LANGUAGE.match(stripped, len(FENCE)).group() if stripped.startswith(FENCE) else ""
+    return FENCE + language[:max(0, max_length // 10 - len(FENCE))]
+
+
+class _Chunker:
+    def __init__(self, max_length: int):
+        self.max_length = max_length
+        self.min_length = max_length // 2
+        self.fence: Optional[str] = None  # line that reopens the code block we're in
+        self.previous_blank = False
+        self.ready: List[Tuple[str, int, Optional[str]]] = []
+        self._reset()
+
+    def _reset(self):
+        # (line, source offset or -1 for a reopened fence, fence open before the line, boundary priority)
+        self.lines: List[Tuple[str, int, Optional[str], int]] = []
+        self.length = -1  # length of the lines joined with newlines
+        self.best: Dict[int, int] = {}  # boundary priority -> index of the line it is before
+
+    def _append(self, line: str, offset: int, fence: Optional[str], priority: int):
+        if self.lines and self.length >= self.min_length:
+            self.best[priority] = len(self.lines)
+        self.lines.append((line, offset, fence, priority))
+        self.length += len(line) + 1
+
+    def _emit(self, index: int, next_offset: int, next_fence: Optional[str]):
+        head, tail = self.lines[:index], self.lines[index:]
+        if tail:
+            next_offset, next_fence = tail[0][1], tail[0][2]
+        text = "\n".join(entry[0] for entry in head).rstrip()
+        if next_fence:
+            text += _CLOSE
+        self.ready.append((text, next_offset, next_fence))
+        self._reset()
+        if next_fence:
+            self._append(next_fence, -1, None, 6)
+        else:
+            while tail and not tail[0][0].strip():
+                tail.pop(0)
+        for entry in tail:
+            self._append(*entry)
+
+    def _priority(self, line: str, in_fence: bool) -> int:
+        if in_fence:
+            return 7
+        if line.startswith("# "):
+            return 1
+        if line.startswith("## "):
+            return 2
+        if line.startswith("### "):
+            return 3
+        if line[:1].isdigit():
+            return 4
+        if self.previous_blank:
+            return 5
+        return 6
+
+    def feed(self, line: str, offset: int):
+        fence_before = self.fence
+        if line.count(FENCE) % 2:
+            self.fence = None if self.fence else _reopen_line(line, self.max_length)
+        priority = self._priority(line, fence_before is not None)
+        self.previous_blank = not line.strip()
+        # If the message ends after this line while a code block is open, it needs a closing fence.
+        reserve = len(_CLOSE) if self.fence else 0
+        while self.length + 1 + len(line) + reserve > self.max_length:
+            candidates = dict(self.best)
+            if self.lines and self.length >= self.min_length:
+                candidates[priority] = len(self.lines)
+            reopened = 1 if self.lines and self.lines[0][1] == -1 else 0
+            if candidates:
+                self._emit(candidates[min(candidates)], offset, fence_before)
+            elif len(self.lines) > reopened:
+                self._emit(len(self.lines), offset, fence_before)
+            else:
+                # A single line longer than a message: cut it, preferably at a space, never inside a fence.
+                room = self.max_length - (self.length + 1) - (len(_CLOSE) if fence_before or FENCE in line else 0)
+                cut = line.rfind(" ", room // 2, room)
+                if cut <= 0:
+                    cut = room
+                fence_at = line.find(FENCE, max(0, cut - len(FENCE) + 1))
+                if 0 <= fence_at < cut:
+                    cut = fence_at if fence_at > 0 else len(FENCE)
+                head = line[:cut]
+                # The head may open or close the code block the line toggles.
+                head_fence = (self.fence or FENCE if fence_before is None else None) if head.count(FENCE) % 2 else fence_before
+                self._append(head, offset, fence_before, priority)
+                line, offset = line[cut:], offset + cut
+                self._emit(len(self.lines), offset, head_fence)
+                if head_fence is not fence_before:
+                    fence_before = head_fence
+                    priority = self._priority(line, fence_before is not None)
+        self._append(line, offset, fence_before, priority)
+
+    def finish(self, end: int):
+        text = "\n".join(entry[0] for entry in self.lines).rstrip()
+        # Nothing but a reopened fence (e.g. trailing blank lines of an unclosed block) isn't worth a message.
+        if any(entry[0].strip() for entry in self.lines if entry[1] != -1):
+            self.ready.append((text, end, None))
+        self._reset()
+
+
+def iter_chunks(text: str, max_length: int = 1900) -> Iterator[Tuple[str, int, Optional[str]]]:
+    """Split text into messages, lazily.
+
+    Args:
+        text: The text to split
+        max_length: Maximum length of a message
+
+    Yields:
+        Tuple[str, int, Optional[str]]: The message, the offset in ``text`` where the next message's
+        content starts, and the fence line the next message has to reopen (None outside code blocks)
+    """
+    if len(text) <= max_length:
+        if text:
+            yield text, len(text), None
+        return
+    chunker = _Chunker(max_length)
+    offset = 0
+    for line in text.split("\n"):
+        chunker.feed(line, offset)
+        offset += len(line) + 1
+        if chunker.ready:
+            yield from chunker.ready
+            chunker.ready.clear()
+    chunker.finish(len(text))
+    yield from chunker.ready
+
+
+def split_message(text: str, max_length: int = 1900) -> List[str]:
+    """Split text into messages of at most ``max_length`` characters.
+
+    Args:
+        text: The text to split
+        max_length: Maximum length of a message. Defaults to 1900.
+
+    Returns:
+        List[str]: The messages, in order
+    """
+    return [chunk for chunk, _, _ in iter_chunks(text, max_length)]
+
+
+class _CheckFailed(Exception):
+    pass
+
+
+def _check(text: str, max_length: int):
+    """Raise _CheckFailed if splitting ``text`` breaks one of the chunker's guarantees."""
+    chunks = list(iter_chunks(text, max_length))
+    if any(len(chunk) > max_length for chunk, _, _ in chunks):
+        raise _CheckFailed("message too long")
+    if text.count(FENCE) % 2 == 0 and any(chunk.count(FENCE) % 2 for chunk, _, _ in chunks):
+        raise _CheckFailed("unbalanced code block")
+    # Without the added fences, nothing but whitespace may differ from the input.
+    parts, reopened = [], False
+    for chunk, _, fence in chunks:
+        if reopened:
+            chunk = chunk.split("\n", 1)[1]
+        if fence:
+            chunk = chunk[:-len(_CLOSE)]
+        parts.append(chunk)
+        reopened = fence is not None
+    if "".join("".join(parts).split()) != "".join(text.split()):
+        raise _CheckFailed("text changed")
+
+
+def _random_answer(rng, size: int) -> str:
+    parts = []
+    while sum(map(len, parts)) < size:
+        kind = rng.random()
+        if kind < 0.1:
+            parts.append(f"{'#' * rng.randint(1, 3)} Heading {rng.randint(0, 99)}")
+        elif kind < 0.25:
+            body = "\n".join("    x = " + "y" * rng.randint(0, 120) for _ in range(rng.randint(1, 80)))
+            parts.append(f"```{rng.choice(['py', 'js', ''])}\n{body}\n```")
+        elif kind < 0.35:
+            parts.append("\n".join(f"{i}. item " + "z " * rng.randint(0, 40) for i in range(1, rng.randint(2, 9))))
+        elif kind < 0.4:
+            parts.append("w" * rng.randint(1, 5000))
+        else:
+            parts.append(" ".join("word" for _ in range(rng.randint(1, 300))))
+    return "\n\n".join(parts)
+
+
+def _main() -> int:
+    import random
+    import sys
+
+    rng = random.Random(0)
+    cases = [(_random_answer(rng, rng.randint(0, 20000)), rng.choice([200, 500, 1900, 2000])) for _ in range(300)]
+    # A fence line close to a message long, in a block spanning several messages
+    cases.append(("```" + "x" * 1890 + "\n" + "\n".join(f"line {i}" for i in range(400)) + "\n```", 1900))
+    for _ in range(300):
+        text = _random_answer(rng, rng.randint(0, 5000)).replace("```py", "```" + "q" * rng.randint(0, 400) + " py")
+        cases.append((text, rng.choice([40, 100, 200])))
+    for i, (text, max_length) in enumerate(cases):
+        try:
+            _check(text, max_length)
+        except _CheckFailed as e:
+            print(f"property check failed on case {i} (max_length={max_length}): {e}", file=sys.stderr)
+            return 1
+    print(f"property check: ok ({len(cases)} cases)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
@@ -0,0 +1,181 @@
+"""Token counting and per-user usage accounting for the AI features.
+
+Encoders are loaded once per model and cached; loading one may read or
+download the BPE ranks, so the first load and any encode of a large text run
+in a worker thread. When the API reports usage (e.g. a completed Assistants
+run), those numbers are used instead of local counts. Every exchange is added
+to per-user, per-model counters in sqlite, together with its estimated cost.
+
+Example:
+    ```python
+    accounting = TokenAccounting()
+    usage = await accounting.usage_for(prompt, answer, "gpt-4o-mini", api_usage=run.usage)
+    accounting.record(user_id, "gpt-4o-mini", usage)
+    ```
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from utils.lazy_import import lazy_import
+
+tiktoken = lazy_import("tiktoken")
+
+# USD per million (input, output) tokens; dated model names match by prefix.
+PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "o4-mini": (1.10, 4.40),
+    "o3-mini": (1.10, 4.40),
+}
+
+# Texts shorter than this are encoded on the event loop; anything longer goes to a thread.
+INLINE_ENCODE_CHARS = 4000
+
+
+@dataclass(frozen=True)
+class Usage:
+    """Tokens of one exchange.
+
+    Attributes:
+        prompt_tokens: Input tokens
+        completion_tokens: Output tokens
+        reported: True if the numbers come from the API, False if they were counted locally
+    """
+    prompt_tokens: int
+    completion_tokens: int
+    reported: bool = False
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+def price(model: str) -> Optional[Tuple[float, float]]:
+    """USD per million (input, output) tokens for a model, or None if unknown."""
+    for name in sorted(PRICES, key=len, reverse=True):
+        if model.startswith(name):
+            return PRICES[name]
+    return None
+
+
+def cost(model: str, usage: Usage) -> float:
+    """Estimated cost of an exchange in USD (0 for models without a known price)."""
+    prices = price(model)
+    if prices is None:
+        return 0.0
+    return (usage.prompt_tokens * prices[0] + usage.completion_tokens * prices[1]) / 1_000_000
+
+
+class TokenAccounting:
+    """Cached encoders plus per-user token and cost counters."""
+
+    def __init__(self, db_path: str = 'token_usage.sqlite'):
+        self._encoders = {}
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS token_usage (
+                user_id TEXT NOT NULL,
+                model TEXT NOT NULL,
+                requests INTEGER NOT NULL DEFAULT 0,
+                prompt_tokens INTEGER NOT NULL DEFAULT 0,
+                completion_tokens INTEGER NOT NULL DEFAULT 0,
+                cost REAL NOT NULL DEFAULT 0,
+                updated REAL NOT NULL,
+                PRIMARY KEY (user_id, model)
+            )
+        ''')
+        self.conn.commit()
+
+    def encoder(self, model: str):
+        """The tiktoken encoding for a model (o200k_base for unknown models), loaded once. Blocking on first use."""
+        encoder = self._encoders.get(model)
+        if encoder is not None:
+            return encoder
+        with self._lock:
+            encoder = self._encoders.get(model)
+            if encoder is None:
+                try:
+                    encoder = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    encoder = tiktoken.get_encoding("o200k_base")
+                self._encoders[model] = encoder
+        return encoder
+
+    async def count(self, text: str, model: str) -> int:
+        """Count the tokens of a text without blocking the event loop on loads or large texts.
+
+        Args:
+            text: The text
+            model: Model whose tokenizer to use
+
+        Returns:
+            int: Number of tokens
+        """
+        if model in self._encoders and len(text) < INLINE_ENCODE_CHARS:
+            return len(self._encoders[model].encode(text))
+        return await asyncio.to_thread(lambda: len(self.encoder(model).encode(text)))
+
+    async def usage_for(self, prompt: str, completion: str, model: str, api_usage=None) -> Usage:
+        """Usage of an exchange: the API's numbers if it reported any, otherwise local counts.
+
+        Args:
+            prompt: The text that was sent
+            completion: The answer
+            model: Model used
+            api_usage: ``usage`` object from the API response (with prompt_tokens/completion_tokens), if any
+
+        Returns:
+            Usage: The exchange's usage
+        """
+        if api_usage is not None and getattr(api_usage, "prompt_tokens", None) is not None:
+            return Usage(api_usage.prompt_tokens, api_usage.completion_tokens or 0, reported=True)
+        prompt_tokens, completion_tokens = await asyncio.gather(self.count(prompt, model), self.count(completion, model))
+        return Usage(prompt_tokens, completion_tokens)
+
+    def record(self, user_id, model: str, usage: Usage) -> float:
+        """Add an exchange to the user's counters.
+
+        Returns:
+            float: Estimated cost of the exchange in USD
+        """
+        exchange_cost = cost(model, usage)
+        self.conn.execute('''
+            INSERT INTO token_usage (user_id, model, requests, prompt_tokens, completion_tokens, cost, updated)
+            VALUES (?, ?, 1, ?, ?, ?, ?)
+            ON CONFLICT (user_id, model) DO UPDATE SET
+                requests = requests + 1,
+                prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                completion_tokens = completion_tokens + excluded.completion_tokens,
+                cost = cost + excluded.cost,
+                updated = excluded.updated
+        ''', (str(user_id), model, usage.prompt_tokens, usage.completion_tokens, exchange_cost, time.time()))
+        self.conn.commit()
+        return exchange_cost
+
+    def report(self, user_id=None) -> List[Tuple[str, str, int, int, int, float]]:
+        """Cumulative counters, most expensive first.
+
+        Args:
+            user_id: Only this user's counters, defaults to everyone
+
+        Returns:
+            List of (user id, model, requests, prompt tokens, completion tokens, cost in USD)
+        """
+        query = 'SELECT user_id, model, requests, prompt_tokens, completion_tokens, cost FROM token_usage'
+        params = ()
+        if user_id is not None:
+            query += ' WHERE user_id = ?'
+            params = (str(user_id),)
+        return self.conn.execute(query + ' ORDER BY cost DESC, prompt_tokens + completion_tokens DESC', params).fetchall()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class BoundedTTLCache:
+    """LRU cache with a size bound, optional TTL and optional stale-while-revalidate.
+
+    - ``maxsize`` caps the number of entries; the least recently used entry is
+      evicted first.
+    - ``ttl`` is the freshness window in seconds (``None`` = never expires).
+    - ``stale_ttl`` is how long past expiry an entry may still be served by
+      ``get_or_load`` while it is refreshed in the background.
+
+    Expired entries are also swept periodically on writes, so keys that are
+    never read again don't linger until LRU pressure pushes them out.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 3600,
+                 stale_ttl: float = 0, sweep_interval: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.sweep_interval = sweep_interval
+        self._data: OrderedDict = OrderedDict()  # key -> (value, stored_at)
+        self._next_sweep = time.monotonic() + sweep_interval
+        self._refreshing: dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _is_fresh(self, stored_at: float, now: float) -> bool:
+        return self.ttl is None or (now - stored_at) < self.ttl
+
+    def _is_servable(self, stored_at: float, now: float) -> bool:
+        return self.ttl is None or (now - stored_at) < self.ttl + self.stale_ttl
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and self._is_fresh(entry[1], time.monotonic())
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the fresh value for ``key`` or ``default``."""
+        entry = self._data.get(key)
+        now = time.monotonic()
+        if entry is not None and self._is_fresh(entry[1], now):
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        if entry is not None and not self._is_servable(entry[1], now):
+            del self._data[key]
+            self.expirations += 1
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        self._data[key] = (value, now)
+        self._data.move_to_end(key)
+        if now >= self._next_sweep:
+            self.purge_expired()
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def purge_expired(self) -> int:
+        """Drop every entry that can no longer be served, even stale."""
+        now = time.monotonic()
+        self._next_sweep = now + self.sweep_interval
+        if self.ttl is None:
+            return 0
+        expired = [key for key, (_, stored_at) in self._data.items()
+                   if not self._is_servable(stored_at, now)]
+        for key in expired:
+            del self._data[key]
+        self.expirations += len(expired)
+        return len(expired)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a cached value, loading it with ``loader`` on a miss.
+
+        A value that has expired but is still within ``stale_ttl`` is returned
+        immediately while a single background refresh replaces it.
+        """
+        entry = self._data.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            value, stored_at = entry
+            if self._is_fresh(stored_at, now):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            if self._is_servable(stored_at, now):
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing[key] = asyncio.create_task(self._refresh(key, loader))
+                return value
+        self.misses += 1
+        value = await loader()
+        self.set(key, value)
+        return value
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        try:
+            self.set(key, await loader())
+        except Exception:
+            # Keep serving the stale value; the next read past stale_ttl reloads.
+            pass
+        finally:
+            self._refreshing.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.stale_hits
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+        }
@@ -1,63 +1,256 @@
 from collections import defaultdict
 import time
 import asyncio
-from googleapiclient.errors import HttpError
+import sqlite3
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from utils.ttl_cache import BoundedTTLCache
+from utils.lazy_import import lazy_import
+
+errors = lazy_import("googleapiclient.errors")
+
+# The YouTube Data API quota resets at midnight Pacific time.
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+# Quota units charged per call, keyed by "<resource>.<method>".
+# Everything not listed here (channels.list, videos.list, ...) costs 1 unit.
+ENDPOINT_COSTS = {
+    'search.list': 100,
+}
+DEFAULT_ENDPOINT_COST = 1
+
+
+class YouTubeQuotaExceeded(Exception):
+    """Raised when a call would overrun the daily quota (or the API says it did)."""
+
+
+class TokenBucket:
+    """Continuously refilling token bucket; every operation is O(1)."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self.updated_at = now
+
+    def try_take(self, amount: float = 1) -> float:
+        """Take ``amount`` tokens if available.
+
+        Returns 0 on success, otherwise the number of seconds until enough
+        tokens will have refilled.
+        """
+        self._refill(time.monotonic())
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    async def take(self, amount: float = 1):
+        while True:
+            wait = self.try_take(amount)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class QuotaLedger:
+    """Daily quota usage persisted in sqlite so a restart doesn't reset the count."""
+
+    def __init__(self, db_path: str, quota_per_day: int):
+        self.quota_per_day = quota_per_day
+        self.db = sqlite3.connect(db_path)
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS youtube_quota_ledger (
+                day TEXT PRIMARY KEY,
+                units_used INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        self.db.commit()
+        self.day = self._today()
+        row = self.db.execute(
+            'SELECT units_used FROM youtube_quota_ledger WHERE day = ?', (self.day,)
+        ).fetchone()
+        self.units_used = row[0] if row else 0
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+    def _roll_over(self):
+        today = self._today()
+        if today != self.day:
+            self.day = today
+            self.units_used = 0
+
+    def _persist(self):
+        self.db.execute('''
+            INSERT INTO youtube_quota_ledger (day, units_used) VALUES (?, ?)
+            ON CONFLICT(day) DO UPDATE SET units_used = excluded.units_used
+        ''', (self.day, self.units_used))
+        self.db.commit()
+
+    @property
+    def used(self) -> int:
+        self._roll_over()
+        return self.units_used
+
+    @property
+    def remaining(self) -> int:
+        self._roll_over()
+        return max(0, self.quota_per_day - self.units_used)
+
+    def charge(self, units: int):
+        self._roll_over()
+        self.units_used += units
+        self._persist()
+
+    def refund(self, units: int):
+        self._roll_over()
+        self.units_used = max(0, self.units_used - units)
+        self._persist()
+
+    def mark_exhausted(self):
+        """Sync the ledger with the API after it reported the quota as spent."""
+        self._roll_over()
+        self.units_used = max(self.units_used, self.quota_per_day)
+        self._persist()
+
+    def seconds_until_reset(self) -> float:
+        now = datetime.now(QUOTA_TIMEZONE)
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), QUOTA_TIMEZONE)
+        return (midnight - now).total_seconds()
+
+    def close(self):
+        self.db.close()
+
+
+class QuotaReservation:
+    """Quota units set aside up front, spent call by call; leftovers are refunded."""
+
+    def __init__(self, limiter: 'YouTubeRateLimiter', units: int):
+        self.limiter = limiter
+        self.remaining = units
+
+    async def acquire(self, endpoint: str = 'list'):
+        cost = self.limiter.cost_of(endpoint)
+        if cost > self.remaining:
+            # Reservation ran dry; fall back to charging the ledger directly.
+            await self.limiter.acquire(endpoint)
+            return
+        self.remaining -= cost
+        await self.limiter.bucket.take()
+
+    def mark_exhausted(self):
+        """The API reported the quota as spent: nothing of this reservation is left to refund."""
+        self.remaining = 0
+        self.limiter.mark_exhausted()
+
+    def release(self):
+        if self.remaining:
+            self.limiter.ledger.refund(self.remaining)
+            self.remaining = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
 
 class YouTubeRateLimiter:
-    def __init__(self):
-        self.requests = []
-        self.QUOTA_PER_DAY = 10000
-        self.REQUESTS_PER_MINUTE = 50
-        self.current_quota = 0
-        
+    def __init__(self, db_path='youtube_notifications.sqlite', quota_per_day=10000,
+                 requests_per_minute=50, low_priority_floor=1000):
+        self.QUOTA_PER_DAY = quota_per_day
+        self.REQUESTS_PER_MINUTE = requests_per_minute
+        # Units low-priority work may not touch, kept back for interactive commands.
+        self.LOW_PRIORITY_FLOOR = low_priority_floor
+        self.bucket = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.ledger = QuotaLedger(db_path, quota_per_day)
+
+    @property
+    def current_quota(self) -> int:
+        """Units spent so far in the current quota day."""
+        return self.ledger.used
+
+    @staticmethod
+    def cost_of(endpoint: str) -> int:
+        return ENDPOINT_COSTS.get(endpoint, DEFAULT_ENDPOINT_COST)
+
+    async def acquire(self, endpoint: str = 'list'):
+        """Charge one call against the daily quota and pace it through the bucket.
+
+        Raises YouTubeQuotaExceeded instead of letting the API answer with a 403.
+        """
+        cost = self.cost_of(endpoint)
+        if self.ledger.remaining < cost:
+            raise YouTubeQuotaExceeded("YouTube API quota exceeded")
+        self.ledger.charge(cost)
+        await self.bucket.take()
+
     async def wait_if_needed(self):
-        current_time = time.time()
-        # Remove requests older than 1 minute
-        self.requests = [req_time for req_time in self.requests 
-                        if current_time - req_time < 60]
-        
-        if len(self.requests) >= self.REQUESTS_PER_MINUTE:
-            sleep_time = 60 - (current_time - self.requests[0])
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
-                
-        self.requests.append(current_time)
-
-class YouTubeCache:
-    def __init__(self, cache_duration=3600):  # Cache for 1 hour
-        self.cache = {}
+        await self.acquire()
+
+    async def reserve(self, units: int, low_priority: bool = False, wait: bool = True) -> QuotaReservation:
+        """Set aside ``units`` of today's quota.
+
+        Low-priority callers may only use the budget above LOW_PRIORITY_FLOOR.
+        If the budget is short, either wait for the daily reset (``wait=True``)
+        or raise YouTubeQuotaExceeded so the caller can defer the work.
+        """
+        floor = self.LOW_PRIORITY_FLOOR if low_priority else 0
+        while self.ledger.remaining - floor < units:
+            if not wait:
+                raise YouTubeQuotaExceeded(
+                    f"Not enough YouTube quota left ({self.ledger.remaining} units) for {units} units"
+                )
+            await asyncio.sleep(self.ledger.seconds_until_reset() + 1)
+        self.ledger.charge(units)
+        return QuotaReservation(self, units)
+
+    def mark_exhausted(self):
+        self.ledger.mark_exhausted()
+
+    def close(self):
+        self.ledger.close()
+
+class YouTubeCache(BoundedTTLCache):
+    def __init__(self, cache_duration=3600, maxsize=2048, stale_duration=0):  # Cache for 1 hour
+        super().__init__(maxsize=maxsize, ttl=cache_duration, stale_ttl=stale_duration)
         self.cache_duration = cache_duration
         self.channel_subscribers = defaultdict(set)  # Track guilds subscribed to each channel
-        
+
+    def load_subscribers(self, db):
+        """Rebuild the subscriber index from the youtube_subscriptions table."""
+        self.channel_subscribers.clear()
+        for channel_id, guild_id in db.execute(
+            'SELECT youtube_channel_id, guild_id FROM youtube_subscriptions'
+        ):
+            self.channel_subscribers[channel_id].add(guild_id)
+
     def add_channel_subscriber(self, channel_id, guild_id):
         self.channel_subscribers[channel_id].add(guild_id)
-        
+
     def remove_channel_subscriber(self, channel_id, guild_id):
-        if guild_id in self.channel_subscribers[channel_id]:
+        if guild_id in self.channel_subscribers.get(channel_id, ()):
             self.channel_subscribers[channel_id].remove(guild_id)
             if not self.channel_subscribers[channel_id]:
                 del self.channel_subscribers[channel_id]
-                
-    def get_subscriber_guilds(self, channel_id):
-        return self.channel_subscribers[channel_id]
-
-    def get(self, key):
-        if key in self.cache:
-            data, timestamp = self.cache[key]
-            if time.time() - timestamp < self.cache_duration:
-                return data
-            del self.cache[key]
-        return None
 
-    def set(self, key, value):
-        self.cache[key] = (value, time.time())
+    def get_subscriber_guilds(self, channel_id):
+        return self.channel_subscribers.get(channel_id, set())
 
 def safe_api_call(method, **kwargs):
     try:
         return method.execute()
-    except HttpError as e:
+    except errors.HttpError as e:
         if e.resp.status == 403:
-            raise Exception("YouTube API quota exceeded")
+            raise YouTubeQuotaExceeded("YouTube API quota exceeded")
         elif e.resp.status == 404:
             raise Exception("YouTube channel not found")
         else: